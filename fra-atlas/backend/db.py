@@ -1,14 +1,18 @@
 # backend/db.py
 from typing import Any, Dict, List, Optional, Generator
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy import text
+from sqlalchemy import text, event
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 import os
+import json
 import datetime
 from pathlib import Path
 import logging
 from typing import Any, Dict, List, Optional, AsyncGenerator
 
+from backend import gazetteer, village_index, sqlite_pool
+
 # ----------------------------
 # DATABASE URL resolution (deterministic)
 # ----------------------------
@@ -17,8 +21,8 @@ ENV_DATABASE_URL = os.getenv("DATABASE_URL")
 if ENV_DATABASE_URL:
     DATABASE_URL = ENV_DATABASE_URL
 else:
-    BASE_DIR = Path(__file__).resolve().parent  # backend/
-    DB_FILE = BASE_DIR / "fra_atlas.db"
+    # same file the sqlite3 modules use (backend/sqlite_pool.py)
+    DB_FILE = Path(sqlite_pool.DB_PATH)
     DATABASE_URL = f"sqlite+aiosqlite:///{DB_FILE.as_posix()}"
 
 logging.getLogger().info(f"DEBUG: backend.db using DATABASE_URL = {DATABASE_URL}")
@@ -35,6 +39,12 @@ except Exception:
 # Async engine + session factory
 # ----------------------------
 engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        # WAL + the pool's pragmas for the async engine's connections as well
+        sqlite_pool.apply_pragmas(dbapi_conn)
 SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 # ----------------------------
@@ -69,7 +79,7 @@ def _row_to_dict(row) -> Dict[str, Any]:
 async def init_claims_table() -> None:
     """
     Create the claims table if it does not exist.
-    Ensure new fields (source, raw_ocr) exist.
+    Ensure new fields (source, raw_ocr, version) exist.
     """
     sql = """
     CREATE TABLE IF NOT EXISTS claims (
@@ -87,6 +97,7 @@ async def init_claims_table() -> None:
         lon REAL,
         source TEXT DEFAULT 'manual',
         raw_ocr TEXT,
+        version INTEGER NOT NULL DEFAULT 1,
         created_at TEXT DEFAULT (datetime('now'))
     );
     """
@@ -101,16 +112,15 @@ async def init_claims_table() -> None:
             await conn.execute(text("ALTER TABLE claims ADD COLUMN raw_ocr TEXT"))
         except Exception:
             pass
+        # optimistic concurrency: bumped by every UPDATE (see routes/claims.update_claim)
+        try:
+            await conn.execute(text("ALTER TABLE claims ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+        except Exception:
+            pass
 
 
-async def insert_claim(payload: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Insert a claim and return the created row as a dict.
-    Payload may omit optional fields; created_at defaults to now when not provided.
-    """
-    insert_sql = text(
-        """
-        INSERT INTO claims (
+_CLAIM_INSERT_SQL = """
+INSERT INTO claims (
    state, district, block, village,
    patta_holder, address, land_area, status, date,
    lat, lon, source, raw_ocr,
@@ -126,64 +136,157 @@ VALUES (
    :closed_date,
    datetime('now')
 )
-        """
-    )
-    params = {
-    "state": payload.get("state"),
-    "district": payload.get("district"),
-    "block": payload.get("block"),
-    "village": payload.get("village"),
-    "patta_holder": payload.get("patta_holder"),
-    "address": payload.get("address"),
-    "land_area": payload.get("land_area"),
-    "status": payload.get("status"),
-    "date": payload.get("date"),
-    "lat": payload.get("lat"),
-    "lon": payload.get("lon"),
-    "source": payload.get("source", "manual"),
-    "raw_ocr": payload.get("raw_ocr"),
-
-    # ✅ OFFICER TRACKING (CRITICAL)
-    "assigned_officer_id": payload.get("assigned_officer_id"),
-    "assigned_date": payload.get("assigned_date"),
-    "last_status_update": payload.get("last_status_update"),
-    "closed_date": payload.get("closed_date"),
-
-    "created_at": payload.get("created_at", datetime.datetime.utcnow().isoformat()),
-}
+"""
 
 
-    async with engine.begin() as conn:
-        # Perform insert
-        await conn.execute(insert_sql, params)
-
-        # Obtain last insert id in sqlite via last_insert_rowid()
-        last_id_res = await conn.execute(text("SELECT last_insert_rowid() AS id"))
-        # fetchone may return different shapes; handle robustly
-        last_row = last_id_res.fetchone()
-        last_id = None
-        if last_row is None:
-            last_id = None
-        else:
-            try:
-                # try tuple-like access
-                last_id = last_row[0]
-            except Exception:
-                try:
-                    last_id = last_row._mapping.get("id")
-                except Exception:
-                    last_id = None
-
-        if not last_id:
-            # fallback: try to query by unique combination (best-effort) - but return empty if we can't determine id
-            # For simplicity return empty dict if we cannot find last id
-            return {}
+def _claim_params(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "state": payload.get("state"),
+        "district": payload.get("district"),
+        "block": payload.get("block"),
+        "village": payload.get("village"),
+        "patta_holder": payload.get("patta_holder"),
+        "address": payload.get("address"),
+        "land_area": payload.get("land_area"),
+        "status": payload.get("status"),
+        "date": payload.get("date"),
+        "lat": payload.get("lat"),
+        "lon": payload.get("lon"),
+        "source": payload.get("source", "manual"),
+        "raw_ocr": payload.get("raw_ocr"),
+
+        # ✅ OFFICER TRACKING (CRITICAL)
+        "assigned_officer_id": payload.get("assigned_officer_id"),
+        "assigned_date": payload.get("assigned_date"),
+        "last_status_update": payload.get("last_status_update"),
+        "closed_date": payload.get("closed_date"),
+    }
 
-        row_res = await conn.execute(text("SELECT * FROM claims WHERE id = :id"), {"id": last_id})
+
+async def insert_claim(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Insert a claim and return the created row as a dict (one INSERT ... RETURNING).
+    Payload may omit optional fields; created_at is set by the database.
+    """
+    async with engine.begin() as conn:
+        row_res = await conn.execute(text(_CLAIM_INSERT_SQL + "RETURNING *"), _claim_params(payload))
         fetched = row_res.fetchone()
         return _row_to_dict(fetched) if fetched else {}
 
 
+def insert_claim_sync(conn, payload: Dict[str, Any]) -> int:
+    """
+    insert_claim on a sqlite3 connection, inside the caller's transaction
+    (backend.jobs.complete_job records the job's claim_id in the same one).
+    Returns the new claim id.
+    """
+    return int(conn.execute(_CLAIM_INSERT_SQL + "RETURNING id", _claim_params(payload)).fetchone()[0])
+
+
+# ----------------------------
+# Bulk insert (spreadsheet / JSON imports)
+# ----------------------------
+_TEXT_FIELDS = (
+    "state", "district", "block", "village", "patta_holder", "address", "land_area",
+    "status", "date", "source", "raw_ocr", "assigned_date", "last_status_update", "closed_date",
+)
+
+
+def validate_claim(payload: Any) -> Dict[str, Any]:
+    """
+    Bind parameters for one claim row, or ValueError saying why the row can't be
+    inserted. Every value comes out as str/float/int/None, so one odd cell
+    (a Timestamp, a NaN, a nested dict) can't fail a whole executemany batch.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError(f"row must be an object, got {type(payload).__name__}")
+    params = _claim_params(payload)
+
+    for key in _TEXT_FIELDS:
+        val = params[key]
+        if isinstance(val, float) and val != val:  # NaN from pandas
+            val = None
+        elif val is not None and not isinstance(val, str):
+            val = json.dumps(val, default=str) if isinstance(val, (dict, list)) else str(val)
+        if isinstance(val, str) and key != "raw_ocr":
+            val = val.strip() or None
+        params[key] = val
+
+    for key, limit in (("lat", 90.0), ("lon", 180.0)):
+        val = params[key]
+        if val is None or (isinstance(val, str) and not val.strip()):
+            params[key] = None
+            continue
+        try:
+            val = float(val)
+        except (TypeError, ValueError):
+            raise ValueError(f"{key} is not a number: {val!r}")
+        if val != val:
+            val = None
+        elif not -limit <= val <= limit:
+            raise ValueError(f"{key} out of range: {val}")
+        params[key] = val
+
+    officer = params["assigned_officer_id"]
+    if officer is not None:
+        try:
+            params["assigned_officer_id"] = int(officer)
+        except (TypeError, ValueError):
+            raise ValueError(f"assigned_officer_id is not an integer: {officer!r}")
+    return params
+
+
+async def insert_claims_bulk(rows: List[Dict[str, Any]], conn=None) -> Dict[str, Any]:
+    """
+    Validate `rows` and insert the valid ones with a single executemany in one
+    transaction (one commit for the batch instead of one per row).
+
+    Returns {"ids": [...], "errors": [{"index": i, "error": "..."}]}: ids of the
+    inserted claims in input order, and the position in `rows` of every row that
+    failed validation. A database error rolls back the whole batch and is raised.
+    Pass `conn` (from engine.begin()) to insert inside the caller's transaction,
+    e.g. together with an import journal checkpoint (backend/import_journal.py).
+    """
+    params: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    for i, row in enumerate(rows):
+        try:
+            params.append(validate_claim(row))
+        except ValueError as e:
+            errors.append({"index": i, "error": str(e)})
+    if not params:
+        return {"ids": [], "errors": errors}
+
+    if conn is None:
+        async with engine.begin() as conn:
+            ids = await _executemany_claims(conn, params)
+    else:
+        ids = await _executemany_claims(conn, params)
+    return {"ids": ids, "errors": errors}
+
+
+async def _executemany_claims(conn, params: List[Dict[str, Any]]) -> List[int]:
+    await conn.execute(text(_CLAIM_INSERT_SQL), params)
+    last_id = int((await conn.execute(text("SELECT last_insert_rowid()"))).scalar())
+    # the transaction holds SQLite's write lock from the first row to the commit,
+    # so the AUTOINCREMENT ids of one executemany are consecutive
+    return list(range(last_id - len(params) + 1, last_id + 1))
+
+
+async def get_claims_by_ids(ids: List[int]) -> List[Dict[str, Any]]:
+    """Claims with the given ids, in id order (one range scan for a bulk insert's ids)."""
+    if not ids:
+        return []
+    wanted = set(ids)
+    async with engine.begin() as conn:
+        res = await conn.execute(
+            text("SELECT * FROM claims WHERE id BETWEEN :lo AND :hi ORDER BY id"),
+            {"lo": min(wanted), "hi": max(wanted)},
+        )
+        rows = [_row_to_dict(r) for r in res.fetchall()]
+    return [r for r in rows if r.get("id") in wanted]
+
+
 async def query_claims(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     Query claims with optional filters.
@@ -258,6 +361,15 @@ async def init_villages_table() -> None:
     """
     async with engine.begin() as conn:
         await conn.execute(text(sql))
+    # one row per (state, district, village): lets concurrent inserts of the same
+    # village use ON CONFLICT / INSERT OR IGNORE instead of creating a duplicate
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_villages_key ON villages(state, district, village)"
+            ))
+    except IntegrityError as e:
+        print(f"[DB] villages has duplicate (state, district, village) rows; unique index not created: {e}")
 
 
 async def insert_village(payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -265,6 +377,7 @@ async def insert_village(payload: Dict[str, Any]) -> Dict[str, Any]:
         """
         INSERT INTO villages (state,district,block,village,lat,lon,created_at)
         VALUES (:state,:district,:block,:village,:lat,:lon,:created_at)
+        RETURNING *
         """
     )
     params = {
@@ -278,23 +391,11 @@ async def insert_village(payload: Dict[str, Any]) -> Dict[str, Any]:
     }
 
     async with engine.begin() as conn:
-        await conn.execute(insert_sql, params)
-        last_row = await conn.execute(text("SELECT last_insert_rowid() AS id"))
-        last = last_row.fetchone()
-        last_id = None
-        if last:
-            try:
-                last_id = last[0]
-            except Exception:
-                try:
-                    last_id = last._mapping.get("id")
-                except Exception:
-                    last_id = None
-        if not last_id:
-            return {}
-        row_res = await conn.execute(text("SELECT * FROM villages WHERE id = :id"), {"id": last_id})
+        row_res = await conn.execute(insert_sql, params)
         r = row_res.fetchone()
-        return _row_to_dict(r) if r else {}
+    gazetteer.add_village(params["state"], params["district"], params["village"])
+    village_index.add_village(params["state"], params["district"], params["village"])
+    return _row_to_dict(r) if r else {}
 
 # ----------------------------
 # FastAPI dependency
@@ -306,18 +407,12 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 # ----------------------------
 # Sync DB path helper (for sqlite3-based modules)
 # ----------------------------
-from urllib.parse import urlparse
-
 def get_db_path() -> str:
     """
-    Return absolute filesystem path to the SQLite database file.
-    Used by legacy sqlite3-based services (officer_metrics, credibility_engine).
+    Return absolute filesystem path to the SQLite database file
+    (resolved once in backend/sqlite_pool.py).
     """
-    url = urlparse(DATABASE_URL)
-
-    # sqlite+aiosqlite:///C:/path/to/db.sqlite
-    if url.scheme.startswith("sqlite"):
-        return str(Path(url.path.lstrip("/")).resolve())
-
-    raise RuntimeError("get_db_path() called for non-sqlite database")
+    if sqlite_pool.DB_PATH is None:
+        raise RuntimeError("get_db_path() called for non-sqlite database")
+    return sqlite_pool.DB_PATH
 
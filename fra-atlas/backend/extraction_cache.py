@@ -0,0 +1,184 @@
+# backend/extraction_cache.py
+"""
+Content-addressed cache for OCR + NER results.
+
+Entries are keyed by SHA-256 of the file bytes plus the extraction settings
+(Tesseract language, DPI, spaCy model version, ...), so the same scan going
+through /api/upload-fra, /claims/parse-fra and /claims/commit-parsed is only
+processed once. Stored in its own SQLite file so it can be wiped at any time.
+
+Eviction: entries older than EXTRACTION_CACHE_MAX_AGE_DAYS are dropped, then
+least-recently-used entries until both the entry and byte limits hold.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# ---- Config ----------------------------------------------------------------
+
+CACHE_ENABLED = os.getenv("EXTRACTION_CACHE", "1") != "0"
+CACHE_DB_PATH = os.getenv(
+    "EXTRACTION_CACHE_DB",
+    str(Path(__file__).resolve().parent / "extraction_cache.db"),
+)
+CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "5000"))
+CACHE_MAX_BYTES = int(float(os.getenv("EXTRACTION_CACHE_MAX_MB", "256")) * 1024 * 1024)
+CACHE_MAX_AGE_DAYS = float(os.getenv("EXTRACTION_CACHE_MAX_AGE_DAYS", "30"))
+
+_lock = threading.Lock()
+_initialized = False
+_counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+
+# ---- Keys ------------------------------------------------------------------
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def make_key(file_hash: str, settings: Dict[str, Any]) -> str:
+    """Combine the content hash with every setting that changes the output."""
+    blob = file_hash + "|" + json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# ---- Storage ---------------------------------------------------------------
+
+def _conn() -> sqlite3.Connection:
+    global _initialized
+    conn = sqlite3.connect(CACHE_DB_PATH, timeout=10, check_same_thread=False)
+    if not _initialized:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS extraction_cache (
+                key TEXT PRIMARY KEY,
+                file_sha256 TEXT NOT NULL,
+                text TEXT,
+                entities TEXT,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_extraction_cache_access ON extraction_cache(last_access)")
+        conn.commit()
+        _initialized = True
+    return conn
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """Return {"text", "entities"} for key, or None on a miss."""
+    if not CACHE_ENABLED:
+        return None
+    now = time.time()
+    min_created = now - CACHE_MAX_AGE_DAYS * 86400
+    with _lock:
+        conn = _conn()
+        try:
+            row = conn.execute(
+                "SELECT text, entities FROM extraction_cache WHERE key = ? AND created_at >= ?",
+                (key, min_created),
+            ).fetchone()
+            if row is None:
+                _counters["misses"] += 1
+                return None
+            conn.execute(
+                "UPDATE extraction_cache SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                (now, key),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        _counters["hits"] += 1
+    return {"text": row[0], "entities": json.loads(row[1]) if row[1] else {}}
+
+
+def put(key: str, file_hash: str, text: str, entities: Dict[str, Any]) -> None:
+    if not CACHE_ENABLED:
+        return
+    entities_json = json.dumps(entities, default=str)
+    size = len((text or "").encode("utf-8")) + len(entities_json.encode("utf-8"))
+    now = time.time()
+    with _lock:
+        conn = _conn()
+        try:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO extraction_cache
+                    (key, file_sha256, text, entities, size_bytes, created_at, last_access, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+                """,
+                (key, file_hash, text, entities_json, size, now, now),
+            )
+            _evict(conn, now)
+            conn.commit()
+        finally:
+            conn.close()
+        _counters["stores"] += 1
+
+
+def _evict(conn: sqlite3.Connection, now: float) -> None:
+    """Drop expired rows, then LRU rows until size and count limits hold."""
+    cur = conn.execute(
+        "DELETE FROM extraction_cache WHERE created_at < ?",
+        (now - CACHE_MAX_AGE_DAYS * 86400,),
+    )
+    evicted = cur.rowcount or 0
+
+    count, total = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM extraction_cache"
+    ).fetchone()
+    if count > CACHE_MAX_ENTRIES or total > CACHE_MAX_BYTES:
+        victims = []
+        for key, size in conn.execute(
+            "SELECT key, size_bytes FROM extraction_cache ORDER BY last_access ASC"
+        ):
+            if count <= CACHE_MAX_ENTRIES and total <= CACHE_MAX_BYTES:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM extraction_cache WHERE key = ?", victims)
+        evicted += len(victims)
+
+    _counters["evictions"] += evicted
+
+
+def clear() -> None:
+    with _lock:
+        conn = _conn()
+        try:
+            conn.execute("DELETE FROM extraction_cache")
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def stats() -> Dict[str, Any]:
+    """Counters since process start plus current table size."""
+    out: Dict[str, Any] = {"enabled": CACHE_ENABLED, **_counters}
+    lookups = out["hits"] + out["misses"]
+    out["hit_rate"] = round(out["hits"] / lookups, 3) if lookups else None
+    if CACHE_ENABLED:
+        with _lock:
+            conn = _conn()
+            try:
+                count, total = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM extraction_cache"
+                ).fetchone()
+            finally:
+                conn.close()
+        out["entries"] = count
+        out["size_bytes"] = total
+    return out
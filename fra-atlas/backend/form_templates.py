@@ -0,0 +1,169 @@
+# backend/form_templates.py
+"""
+Registry of known FRA claim-form layouts for zonal OCR (OCR_TEMPLATES=1 in backend/ocr.py).
+
+A template describes one fixed page layout in PDF points (origin top-left):
+    "page_size"  [width, height]
+    "lines"      vertical centers of the printed text lines (the layout fingerprint)
+    "fields"     {field: {"box": [x0, top, x1, bottom], "psm": N, "label": regex}}
+    "min_fields" zones whose OCR text must show their label for the result to be trusted
+
+A scanned page is fingerprinted by its horizontal ink profile: the text-line
+bands found on a downscaled copy are compared with each template's "lines"
+(allowing a vertical shift). Only the field zones of the matching template are
+then OCR'd; each zone covers the whole "Label: value" line, so the zone texts
+joined together read like the original form to backend/ner.py.
+
+More layouts can be registered with register_template() or listed in a JSON
+file (FORM_TEMPLATES_FILE, a list of template objects).
+"""
+import os
+import json
+import hashlib
+
+import numpy as np
+from PIL import Image
+
+# ---- Config ----------------------------------------------------------------
+
+FORM_TEMPLATES_FILE = os.getenv("FORM_TEMPLATES_FILE", "")
+
+# How well a page's text bands must line up with a template (0-1, see _score)
+TEMPLATE_MIN_SCORE = float(os.getenv("OCR_TEMPLATE_MIN_SCORE", "0.8"))
+
+# Max distance (points) between a template line and a detected band center
+TEMPLATE_LINE_TOLERANCE = float(os.getenv("OCR_TEMPLATE_LINE_TOLERANCE", "6"))
+
+# Resolution the ink profile is computed at (cheap; independent of the OCR DPI)
+_PROFILE_DPI = 50
+
+
+# ---- Built-in templates ----------------------------------------------------
+
+def _line_zone(center: float, psm: int, label: str) -> dict:
+    # one 12pt text line between the 72pt margins, with room for skew
+    return {"box": [60, center - 11, 560, center + 11], "psm": psm, "label": label}
+
+
+# Claim document exported from the state portals (Madhya Pradesh, Odisha,
+# Telangana, Tripura share it): US Letter, 12pt "Label: value" lines.
+FRA_CLAIM_V1 = {
+    "name": "fra_claim_v1",
+    "page_size": [612, 792],
+    "lines": [79.4, 129.3, 154.3, 179.3, 229.2, 254.2, 279.3, 304.2, 354.2, 379.1, 429.0],
+    "fields": {
+        "village": _line_zone(129.3, 7, r"vill"),
+        "district": _line_zone(154.3, 7, r"district"),
+        "state": _line_zone(179.3, 7, r"state"),
+        "patta_holder": _line_zone(229.2, 7, r"patta|holder"),
+        "ifr_number": _line_zone(254.2, 7, r"ifr|number"),
+        "land_area": _line_zone(279.3, 7, r"area"),
+        "status": _line_zone(304.2, 7, r"status"),
+    },
+    "min_fields": 5,
+}
+
+TEMPLATES: dict[str, dict] = {}
+
+
+def register_template(template: dict) -> None:
+    """Add (or replace) a layout in the registry."""
+    for key in ("name", "page_size", "lines", "fields"):
+        if key not in template:
+            raise ValueError(f"form template is missing {key!r}")
+    template.setdefault("min_fields", max(1, len(template["fields"]) * 2 // 3))
+    TEMPLATES[template["name"]] = template
+
+
+register_template(FRA_CLAIM_V1)
+
+if FORM_TEMPLATES_FILE:
+    try:
+        with open(FORM_TEMPLATES_FILE, encoding="utf-8") as f:
+            for tpl in json.load(f):
+                register_template(tpl)
+    except Exception as e:
+        print(f"[OCR] could not load form templates from {FORM_TEMPLATES_FILE}: {e}")
+
+
+def settings() -> dict:
+    """Identifies the registered layouts (used in cache keys)."""
+    blob = json.dumps(TEMPLATES, sort_keys=True)
+    return {
+        "templates": sorted(TEMPLATES),
+        "digest": hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16],
+        "min_score": TEMPLATE_MIN_SCORE,
+    }
+
+
+# ---- Fingerprinting --------------------------------------------------------
+
+def line_bands(img: Image.Image, page_height_pts: float) -> list[float]:
+    """Vertical centers (points from the top) of the text-line bands on a page image."""
+    scale = max(1, round(img.height / page_height_pts * 72 / _PROFILE_DPI))
+    small = img.convert("L").reduce(scale)
+    gray = np.asarray(small)
+    ink_rows = (gray < 128).mean(axis=1) > 0.002
+
+    pts_per_row = page_height_pts / small.height
+    centers, start = [], None
+    for y, ink in enumerate(ink_rows.tolist() + [False]):
+        if ink and start is None:
+            start = y
+        elif not ink and start is not None:
+            centers.append((start + y - 1) / 2 * pts_per_row)
+            start = None
+    return centers
+
+
+def _score(lines: list[float], bands: np.ndarray, shift: float) -> float:
+    """
+    min(recall, precision): template lines that have a band, and bands within
+    the template's vertical span that sit on a template line. Precision keeps
+    dense pages (a band every few points) from matching every layout.
+    """
+    expected = np.array(lines) + shift
+    tol = TEMPLATE_LINE_TOLERANCE
+    recall = np.mean([np.abs(bands - c).min() <= tol for c in expected])
+    inside = bands[(bands >= expected[0] - tol) & (bands <= expected[-1] + tol)]
+    if not inside.size:
+        return 0.0
+    precision = np.mean([np.abs(expected - b).min() <= tol for b in inside])
+    return float(min(recall, precision))
+
+
+def match_template(img: Image.Image) -> tuple[dict, float, float] | None:
+    """
+    Best matching template for a page image as (template, shift_pts, score),
+    or None when no layout scores TEMPLATE_MIN_SCORE.
+    """
+    aspect = img.width / img.height
+    best = None
+    for tpl in TEMPLATES.values():
+        w, h = tpl["page_size"]
+        if abs(aspect - w / h) > 0.02:
+            continue
+        bands = np.array(line_bands(img, h))
+        if not bands.size:
+            continue
+        # the scan may sit a little higher/lower on the page: try aligning the
+        # first template line with each of the first few bands
+        shifts = [0.0] + [b - tpl["lines"][0] for b in bands[:3]]
+        shift, score = max(((s, _score(tpl["lines"], bands, s)) for s in shifts), key=lambda x: x[1])
+        if score >= TEMPLATE_MIN_SCORE and (best is None or score > best[2]):
+            best = (tpl, shift, score)
+    return best
+
+
+def zone_boxes(tpl: dict, img: Image.Image, shift: float = 0.0) -> dict[str, tuple[int, int, int, int]]:
+    """Field zones of `tpl` in pixel coordinates of `img` (clamped to the page)."""
+    w, h = tpl["page_size"]
+    sx, sy = img.width / w, img.height / h
+    boxes = {}
+    for field, zone in tpl["fields"].items():
+        x0, top, x1, bottom = zone["box"]
+        boxes[field] = (
+            max(0, int(x0 * sx)), max(0, int((top + shift) * sy)),
+            min(img.width, int(x1 * sx)), min(img.height, int((bottom + shift) * sy)),
+        )
+    return boxes
@@ -0,0 +1,315 @@
+# backend/gazetteer.py
+"""
+Gazetteer matcher: an Aho-Corasick automaton over every known state, district
+and village name (the `villages` table plus frontend/public/geojson), used by
+backend.ner instead of treating each spaCy GPE as a village candidate.
+
+Names and OCR text are normalized the same way (lowercase, punctuation and
+whitespace runs -> one space) and matched on word boundaries, so one scan is
+linear in the text length however many names are known.
+
+Villages inserted at runtime (add_village) go into a small delta automaton
+that is rebuilt on its own; it is merged into the main one once it holds
+GAZETTEER_DELTA_MAX names, so inserts never pay for a full rebuild.
+
+version() fingerprints the known names (order-independent, kept up to date on
+every add), so extraction cache keys change whenever matching could.
+"""
+import os
+import re
+import glob
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from backend import sqlite_pool
+
+# ---- Config ----------------------------------------------------------------
+
+GAZETTEER_GEOJSON_DIR = os.getenv(
+    "GAZETTEER_GEOJSON_DIR",
+    str(Path(__file__).resolve().parent.parent / "frontend" / "public" / "geojson"),
+)
+GAZETTEER_DELTA_MAX = max(1, int(os.getenv("GAZETTEER_DELTA_MAX", "256")))
+# names shorter than this (normalized) are too ambiguous to match in free text
+GAZETTEER_MIN_CHARS = int(os.getenv("GAZETTEER_MIN_CHARS", "3"))
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+# entry: (kind, state, district, name); kind is "state" | "district" | "village"
+Entry = Tuple[str, str, str, str]
+
+
+def normalize(s: Optional[str]) -> str:
+    return _NON_WORD.sub(" ", (s or "").lower()).strip()
+
+
+def _title(s: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", (s or "").strip()).title()
+
+
+def _entry_hash(key: str, entry: Entry) -> int:
+    digest = hashlib.blake2b("\x1f".join((key,) + entry).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+# ---- Automaton -------------------------------------------------------------
+
+class _Automaton:
+    """Immutable Aho-Corasick automaton over padded keys (" name ")."""
+
+    def __init__(self, keywords: Dict[str, List[Entry]]):
+        goto: List[dict] = [{}]
+        out: list = [None]
+        for key, entries in keywords.items():
+            node = 0
+            for ch in key:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append(None)
+                node = nxt
+            out[node] = (len(key), tuple(entries))
+
+        fail = [0] * len(goto)
+        link = [0] * len(goto)  # nearest proper suffix node with output (0 = none)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[child] = target if target != child else 0
+                link[child] = fail[child] if out[fail[child]] else link[fail[child]]
+                queue.append(child)
+
+        self.goto, self.fail, self.out, self.link = goto, fail, out, link
+
+    def __len__(self) -> int:
+        return len(self.goto)
+
+    def scan(self, padded: str):
+        """Yield (start, end, entries) for every key occurring in `padded`."""
+        goto, fail, out, link = self.goto, self.fail, self.out, self.link
+        node = 0
+        for i, ch in enumerate(padded):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            m = node if out[node] else link[node]
+            while m:
+                length, entries = out[m]
+                yield i + 1 - length, i + 1, entries
+                m = link[m]
+
+
+# ---- Gazetteer -------------------------------------------------------------
+
+class Gazetteer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # one build at a time, however many first requests race
+        self._keywords: Dict[str, List[Entry]] = {}  # every key in main + delta
+        self._delta: Dict[str, List[Entry]] = {}
+        self._main = _Automaton({})
+        self._delta_automaton: Optional[_Automaton] = None
+        self._names = 0
+        self._fingerprint = 0  # sum of _entry_hash over every known entry, mod 2**64
+        self._loaded = False
+        self._stats = {"rebuilds": 0, "rebuild_seconds": 0.0, "delta_builds": 0,
+                       "scans": 0, "scan_seconds": 0.0}
+
+    # -- building --
+
+    def _add_entry(self, kind: str, state: str, district: str, name: str) -> bool:
+        key = normalize(name)
+        if len(key) < GAZETTEER_MIN_CHARS:
+            return False
+        key = f" {key} "
+        entry = (kind, state, district, name)
+        entries = self._keywords.setdefault(key, [])
+        if entry in entries:
+            return False
+        entries.append(entry)
+        self._names += 1
+        self._fingerprint = (self._fingerprint + _entry_hash(key, entry)) & 0xFFFFFFFFFFFFFFFF
+        if self._loaded:
+            self._delta.setdefault(key, []).append(entry)
+            self._delta_automaton = None
+        return True
+
+    def _add_record(self, state, district, village) -> int:
+        state, district, village = _title(state), _title(district), _title(village)
+        added = 0
+        if state:
+            added += self._add_entry("state", state, "", state)
+            if district:
+                added += self._add_entry("district", state, district, district)
+                if village:
+                    added += self._add_entry("village", state, district, village)
+        return added
+
+    def _rebuild_main(self) -> None:
+        started = time.perf_counter()
+        self._main = _Automaton(self._keywords)
+        self._delta, self._delta_automaton = {}, None
+        self._stats["rebuilds"] += 1
+        self._stats["rebuild_seconds"] += time.perf_counter() - started
+
+    def load(self) -> None:
+        """(Re)build from the villages table and the geojson files."""
+        with self._load_lock:
+            self._load()
+
+    def _load(self) -> None:
+        with self._lock:
+            self._keywords, self._delta, self._loaded = {}, {}, False
+            self._names, self._fingerprint = 0, 0
+            for rec in _geojson_records(GAZETTEER_GEOJSON_DIR):
+                self._add_record(*rec)
+            for rec in _db_records():
+                self._add_record(*rec)
+            self._rebuild_main()
+            self._loaded = True
+        print(f"[GAZ] {sum(len(e) for e in self._keywords.values())} names, {len(self._main)} automaton nodes")
+
+    def ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self._load()
+
+    def add_village(self, state, district, village) -> None:
+        """Make a newly inserted village matchable without a full rebuild."""
+        if not self._loaded:
+            return  # picked up by load()
+        with self._lock:
+            self._add_record(state, district, village)
+            if sum(len(e) for e in self._delta.values()) >= GAZETTEER_DELTA_MAX:
+                self._rebuild_main()
+
+    def version(self) -> str:
+        """Fingerprint of the known names; equal sets of names give equal versions in any process."""
+        self.ensure_loaded()
+        with self._lock:
+            return f"{self._names}-{self._fingerprint:016x}"
+
+    # -- matching --
+
+    def _automata(self) -> List[_Automaton]:
+        self.ensure_loaded()
+        with self._lock:
+            if self._delta and self._delta_automaton is None:
+                self._delta_automaton = _Automaton(self._delta)
+                self._stats["delta_builds"] += 1
+            return [a for a in (self._main, self._delta_automaton) if a is not None]
+
+    def find(self, text: str) -> List[Tuple[int, Entry]]:
+        """
+        Known names in `text` as (position, entry), in reading order. A match
+        inside a longer one ("Warangal" in "Warangal Cheruvu") is dropped; the
+        same span found by both automata (a name added at runtime that was
+        already known, e.g. a homonym village) yields the entries of both.
+        """
+        automata = self._automata()
+        started = time.perf_counter()
+        padded = f" {normalize(text)} "
+        spans = []
+        for automaton in automata:
+            spans.extend(automaton.scan(padded))
+        spans.sort(key=lambda s: (s[0], -s[1]))
+
+        out: List[Tuple[int, Entry]] = []
+        covered_to = -1
+        last_span, seen = None, set()
+        for start, end, entries in spans:
+            if (start, end) == last_span:
+                out.extend((start, entry) for entry in entries if entry not in seen)
+                seen.update(entries)
+                continue
+            # padded keys share their boundary spaces, hence the -1
+            if end - 1 <= covered_to:
+                continue
+            covered_to = max(covered_to, end - 1)
+            last_span, seen = (start, end), set(entries)
+            out.extend((start, entry) for entry in entries)
+        with self._lock:
+            self._stats["scans"] += 1
+            self._stats["scan_seconds"] += time.perf_counter() - started
+        return out
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats)
+            out["names"] = sum(len(e) for e in self._keywords.values())
+            out["nodes"] = len(self._main) + (len(self._delta_automaton) if self._delta_automaton else 0)
+            out["delta_names"] = sum(len(e) for e in self._delta.values())
+        out["loaded"] = self._loaded
+        out["rebuild_seconds"] = round(out["rebuild_seconds"], 3)
+        out["scan_seconds"] = round(out["scan_seconds"], 3)
+        return out
+
+
+# ---- Sources ---------------------------------------------------------------
+
+def _geojson_records(folder: str):
+    """(state, district, village) triples from the frontend geojson files."""
+    for path in sorted(glob.glob(os.path.join(folder, "**", "*.json"), recursive=True)):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[GAZ] skipping {path}: {e}")
+            continue
+        if isinstance(data, dict):
+            records = [feat.get("properties") or {} for feat in data.get("features", [])]
+        else:
+            records = data if isinstance(data, list) else []
+        for rec in records:
+            if not isinstance(rec, dict):
+                continue
+            state = rec.get("state") or rec.get("ST_NM")
+            district = rec.get("district") or rec.get("DISTRICT")
+            if not state and not district and rec.get("name"):
+                state = rec["name"]  # state outline files
+            yield state, district, rec.get("village")
+
+
+def _db_records():
+    try:
+        with sqlite_pool.connection() as conn:
+            return conn.execute("SELECT DISTINCT state, district, village FROM villages").fetchall()
+    except sqlite3.Error as e:
+        print(f"[GAZ] villages table not read ({sqlite_pool.DB_PATH}): {e}")
+        return []
+
+
+# ---- Module-level instance -------------------------------------------------
+
+_gazetteer = Gazetteer()
+
+
+def get_gazetteer() -> Gazetteer:
+    return _gazetteer
+
+
+def add_village(state, district, village) -> None:
+    _gazetteer.add_village(state, district, village)
+
+
+def gazetteer_version() -> str:
+    return _gazetteer.version()
+
+
+def gazetteer_stats() -> dict:
+    return _gazetteer.stats()
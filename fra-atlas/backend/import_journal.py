@@ -0,0 +1,269 @@
+# backend/import_journal.py
+"""
+Checkpoint journal for /claims/import-excel and /claims/import-json, so an
+import that dies halfway (worker restart, DB lock timeout) can be re-run
+without duplicating claims.
+
+A run is identified by (kind, sha256 of the uploaded content). Rows are
+committed in chunks, and each chunk's claims, its per-row outcomes
+(import_rows) and the run's new offset (import_runs.next_row) are written in
+the same transaction, so the journal never disagrees with the claims table.
+A chunk's villages (import_villages) are journaled in that transaction too and
+cleared once they are upserted, so villages a crash or a failed upsert left
+behind are replayed when the run resumes.
+Uploading the same content again resumes its latest unfinished (running or
+failed) run at next_row; rows before it are skipped without being normalized
+or inserted. Content whose latest run is done raises AlreadyImported unless
+the caller asks for a restart.
+
+    run = await start_run("excel", file_hash, filename, officer_id)
+    result = await commit_chunk(run["id"], start, end, payloads, row_numbers, errors)
+    await finish_run(run["id"])
+"""
+import json
+import time
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from backend import db
+
+# ---- Schema ----------------------------------------------------------------
+
+async def init_import_journal() -> None:
+    async with db.engine.begin() as conn:
+        await conn.execute(text(
+            """
+            CREATE TABLE IF NOT EXISTS import_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,                      -- excel | json
+                file_hash TEXT NOT NULL,
+                filename TEXT,
+                officer_id INTEGER,
+                status TEXT NOT NULL DEFAULT 'running',  -- running | done | failed
+                next_row INTEGER NOT NULL DEFAULT 0,     -- data rows [0, next_row) are committed
+                chunks INTEGER NOT NULL DEFAULT 0,
+                rows_inserted INTEGER NOT NULL DEFAULT 0,
+                rows_rejected INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        ))
+        await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_import_runs_hash ON import_runs(kind, file_hash)"))
+        await conn.execute(text(
+            """
+            CREATE TABLE IF NOT EXISTS import_rows (
+                run_id INTEGER NOT NULL,
+                row INTEGER NOT NULL,        -- 1-based data row, as in the endpoints' errors
+                outcome TEXT NOT NULL,       -- inserted | rejected
+                claim_id INTEGER,
+                error TEXT,
+                PRIMARY KEY (run_id, row)
+            ) WITHOUT ROWID
+            """
+        ))
+        await conn.execute(text(
+            """
+            CREATE TABLE IF NOT EXISTS import_villages (
+                run_id INTEGER NOT NULL,     -- villages of committed claims, pending upsert
+                state TEXT,
+                district TEXT,
+                village TEXT,
+                lat REAL,
+                lon REAL
+            )
+            """
+        ))
+        await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_import_villages_run ON import_villages(run_id)"))
+
+
+# ---- Content hashes --------------------------------------------------------
+
+def hash_rows(rows: List[Any]) -> str:
+    """Stable hash of an import-json body's rows (key order doesn't matter)."""
+    return hashlib.sha256(json.dumps(rows, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+# ---- Runs ------------------------------------------------------------------
+
+class ImportConflict(Exception):
+    """The run advanced past the expected offset (the same import running twice)."""
+
+
+class AlreadyImported(Exception):
+    """This content's latest run finished; start_run(restart=True) imports it again."""
+
+    def __init__(self, run: Dict[str, Any]):
+        super().__init__(f"already imported by import {run['id']}")
+        self.run = run
+
+
+async def start_run(kind: str, file_hash: str, filename: Optional[str], officer_id: Any,
+                    restart: bool = False) -> Dict[str, Any]:
+    """
+    The latest run for this content if it is unfinished (marked running again,
+    to resume at its next_row), or a new run when there is none or `restart`
+    is set. Raises AlreadyImported if the latest run is done.
+    """
+    now = time.time()
+    async with db.engine.begin() as conn:
+        if not restart:
+            row = (await conn.execute(
+                text("SELECT * FROM import_runs WHERE kind = :kind AND file_hash = :hash ORDER BY id DESC LIMIT 1"),
+                {"kind": kind, "hash": file_hash},
+            )).fetchone()
+            if row is not None:
+                run = db._row_to_dict(row)
+                if run["status"] == "done":
+                    raise AlreadyImported(run)
+                if run["status"] == "failed":
+                    await conn.execute(
+                        text("UPDATE import_runs SET status = 'running', error = NULL, updated_at = :now WHERE id = :id"),
+                        {"now": now, "id": run["id"]},
+                    )
+                    run["status"] = "running"
+                run["resumed"] = True
+                return run
+        row = (await conn.execute(
+            text(
+                """
+                INSERT INTO import_runs (kind, file_hash, filename, officer_id, status, created_at, updated_at)
+                VALUES (:kind, :hash, :filename, :officer_id, 'running', :now, :now)
+                RETURNING *
+                """
+            ),
+            {"kind": kind, "hash": file_hash, "filename": filename, "officer_id": officer_id, "now": now},
+        )).fetchone()
+    run = db._row_to_dict(row)
+    run["resumed"] = False
+    return run
+
+
+async def commit_chunk(run_id: int, start_row: int, next_row: int, payloads: List[Dict[str, Any]],
+                       row_numbers: List[int], errors: List[Dict[str, Any]],
+                       villages: bool = False) -> Dict[str, Any]:
+    """
+    Insert one chunk's claims and checkpoint the run to `next_row`, atomically.
+
+    `payloads`/`row_numbers` are the chunk's normalized rows, `errors` the rows
+    already rejected while normalizing ({"row", "error"}). Returns {"ids",
+    "errors"} with validation failures from db.insert_claims_bulk appended.
+    With `villages`, the inserted claims' (state, district, village, lat, lon)
+    are journaled as pending (see pending_villages).
+    Raises ImportConflict (nothing written) if the run is no longer at `start_row`.
+    """
+    now = time.time()
+    async with db.engine.begin() as conn:
+        result = await db.insert_claims_bulk(payloads, conn=conn)
+        rejected = {e["index"] for e in result["errors"]}
+        chunk_errors = list(errors) + [
+            {"row": row_numbers[e["index"]], "error": e["error"]} for e in result["errors"]
+        ]
+        inserted_rows = [n for i, n in enumerate(row_numbers) if i not in rejected]
+
+        outcomes = [
+            {"run_id": run_id, "row": n, "outcome": "inserted", "claim_id": claim_id, "error": None}
+            for n, claim_id in zip(inserted_rows, result["ids"])
+        ] + [
+            {"run_id": run_id, "row": e["row"], "outcome": "rejected", "claim_id": None, "error": e["error"]}
+            for e in chunk_errors
+        ]
+        if villages:
+            pending = {
+                (p.get("state"), p.get("district"), p.get("village"), p.get("lat"), p.get("lon"))
+                for i, p in enumerate(payloads) if i not in rejected
+            }
+            if pending:
+                await conn.execute(
+                    text(
+                        """
+                        INSERT INTO import_villages (run_id, state, district, village, lat, lon)
+                        VALUES (:run_id, :state, :district, :village, :lat, :lon)
+                        """
+                    ),
+                    [{"run_id": run_id, "state": st, "district": d, "village": v, "lat": lat, "lon": lon}
+                     for st, d, v, lat, lon in pending],
+                )
+        if outcomes:
+            await conn.execute(
+                text(
+                    """
+                    INSERT OR REPLACE INTO import_rows (run_id, row, outcome, claim_id, error)
+                    VALUES (:run_id, :row, :outcome, :claim_id, :error)
+                    """
+                ),
+                outcomes,
+            )
+        res = await conn.execute(
+            text(
+                """
+                UPDATE import_runs
+                SET next_row = :next_row, chunks = chunks + 1,
+                    rows_inserted = rows_inserted + :inserted, rows_rejected = rows_rejected + :rejected,
+                    updated_at = :now
+                WHERE id = :id AND next_row = :start_row
+                """
+            ),
+            {"next_row": next_row, "inserted": len(result["ids"]), "rejected": len(chunk_errors),
+             "now": now, "id": run_id, "start_row": start_row},
+        )
+        if res.rowcount != 1:
+            # rolls back this chunk's claims with it
+            raise ImportConflict(f"import {run_id} is no longer at row {start_row}; is it running elsewhere?")
+    return {"ids": result["ids"], "errors": chunk_errors}
+
+
+async def finish_run(run_id: int, error: Optional[str] = None) -> None:
+    async with db.engine.begin() as conn:
+        await conn.execute(
+            text("UPDATE import_runs SET status = :status, error = :error, updated_at = :now WHERE id = :id"),
+            {"status": "failed" if error else "done", "error": error[:2000] if error else None,
+             "now": time.time(), "id": run_id},
+        )
+
+
+async def pending_villages(run_id: int) -> List[Dict[str, Any]]:
+    """Journaled villages of the run's committed claims not upserted yet (with their rowid)."""
+    async with db.engine.begin() as conn:
+        rows = (await conn.execute(
+            text("SELECT rowid, state, district, village, lat, lon FROM import_villages WHERE run_id = :id"),
+            {"id": run_id},
+        )).fetchall()
+    return [db._row_to_dict(r) for r in rows]
+
+
+async def clear_villages(run_id: int, upto_rowid: int) -> None:
+    """Drop the run's journaled villages up to `upto_rowid` once they are upserted."""
+    async with db.engine.begin() as conn:
+        await conn.execute(
+            text("DELETE FROM import_villages WHERE run_id = :id AND rowid <= :upto"),
+            {"id": run_id, "upto": upto_rowid},
+        )
+
+
+async def get_run(run_id: int, error_limit: int = 1000) -> Optional[Dict[str, Any]]:
+    """The run with its rejected rows (up to `error_limit`)."""
+    async with db.engine.begin() as conn:
+        row = (await conn.execute(text("SELECT * FROM import_runs WHERE id = :id"), {"id": run_id})).fetchone()
+        if row is None:
+            return None
+        rejected = (await conn.execute(
+            text(
+                """
+                SELECT row, error FROM import_rows
+                WHERE run_id = :id AND outcome = 'rejected'
+                ORDER BY row LIMIT :limit
+                """
+            ),
+            {"id": run_id, "limit": error_limit},
+        )).fetchall()
+        villages_pending = (await conn.execute(
+            text("SELECT COUNT(*) FROM import_villages WHERE run_id = :id"), {"id": run_id}
+        )).scalar()
+    run = db._row_to_dict(row)
+    run["villages_pending"] = villages_pending
+    run["errors"] = [db._row_to_dict(r) for r in rejected]
+    return run
@@ -0,0 +1,271 @@
+# backend/jobs.py
+"""
+Durable document-ingestion job queue stored in the main SQLite database.
+
+API side:   enqueue_job() / get_job() / get_batch()
+Worker side (backend/worker.py): claim_job() / claim_jobs() -> heartbeat() -> complete_job() | fail_job()
+
+A claimed job carries a lease (lease_owner + lease_expires_at). A worker that
+dies mid-job stops renewing its lease, and the job becomes claimable again once
+the lease expires. Failures are retried with exponential backoff up to
+max_attempts, after which the job is marked 'failed'.
+
+complete_job() inserts the claim and records its id on the job in one
+transaction, and only while the caller still holds the lease, so a re-run job
+never creates a second claim. The spooled upload is deleted once the job is
+done or has failed for good.
+"""
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.db import insert_claim_sync
+from backend.sqlite_pool import connection
+
+# ---- Config ----------------------------------------------------------------
+
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", "10"))  # seconds, doubled per attempt
+
+
+def init_jobs_table() -> None:
+    with connection() as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingest_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                batch_id TEXT,
+                file_path TEXT NOT NULL,
+                filename TEXT,
+                officer_id INTEGER,
+                status TEXT NOT NULL DEFAULT 'queued',   -- queued | running | done | failed
+                stage TEXT,                              -- progress within a run
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                next_run_at REAL NOT NULL DEFAULT 0,
+                claim_id INTEGER,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_ingest_jobs_status ON ingest_jobs(status, next_run_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_ingest_jobs_batch ON ingest_jobs(batch_id)")
+
+
+def new_batch_id() -> str:
+    return uuid.uuid4().hex
+
+
+def enqueue_job(file_path: str, filename: Optional[str], officer_id: Any, batch_id: Optional[str] = None) -> int:
+    now = time.time()
+    with connection() as conn:
+        cur = conn.execute(
+            """
+            INSERT INTO ingest_jobs
+                (batch_id, file_path, filename, officer_id, status, stage, max_attempts,
+                 next_run_at, created_at, updated_at)
+            VALUES (?, ?, ?, ?, 'queued', 'queued', ?, ?, ?, ?)
+            """,
+            (batch_id, file_path, filename, officer_id, JOB_MAX_ATTEMPTS, now, now, now),
+        )
+        return int(cur.lastrowid)
+
+
+def _remove_upload(file_path: Optional[str]) -> None:
+    if not file_path:
+        return
+    try:
+        Path(file_path).unlink(missing_ok=True)
+    except OSError as e:
+        print(f"[jobs] could not delete {file_path}: {e}")
+
+
+def claim_job(worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+    """
+    Atomically take the oldest runnable job: a queued job whose backoff has
+    elapsed, or a running job whose lease expired and that has attempts left.
+    Returns the job or None.
+    """
+    claimed = claim_jobs(worker_id, 1, lease_seconds)
+    return claimed[0] if claimed else None
+
+
+def claim_jobs(worker_id: str, limit: int, lease_seconds: float = JOB_LEASE_SECONDS) -> List[Dict[str, Any]]:
+    """
+    Like claim_job, but takes up to `limit` runnable jobs in one transaction.
+    A job whose lease expired with no attempts left (its worker died on it,
+    e.g. killed by a document that crashes OCR) is marked failed instead of
+    being handed out again.
+    """
+    now = time.time()
+    with connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        dead = conn.execute(
+            """
+            SELECT id, file_path FROM ingest_jobs
+            WHERE status = 'running' AND lease_expires_at < ? AND attempts >= max_attempts
+              AND claim_id IS NULL
+            """,
+            (now,),
+        ).fetchall()
+        if dead:
+            conn.executemany(
+                """
+                UPDATE ingest_jobs
+                SET status = 'failed', stage = 'failed',
+                    error = 'worker stopped while processing this job (lease expired) on its last attempt',
+                    lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE id = ?
+                """,
+                [(now, r["id"]) for r in dead],
+            )
+        rows = conn.execute(
+            """
+            SELECT id FROM ingest_jobs
+            WHERE ((status = 'queued' AND next_run_at <= ?)
+                   OR (status = 'running' AND lease_expires_at < ? AND attempts < max_attempts))
+              AND claim_id IS NULL
+            ORDER BY id
+            LIMIT ?
+            """,
+            (now, now, max(1, limit)),
+        ).fetchall()
+        ids = [r["id"] for r in rows]
+        if not ids:
+            conn.execute("COMMIT")
+            for r in dead:
+                _remove_upload(r["file_path"])
+            return []
+        conn.executemany(
+            """
+            UPDATE ingest_jobs
+            SET status = 'running', stage = 'claimed', attempts = attempts + 1,
+                lease_owner = ?, lease_expires_at = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            [(worker_id, now + lease_seconds, now, job_id) for job_id in ids],
+        )
+        marks = ",".join("?" * len(ids))
+        jobs = conn.execute(f"SELECT * FROM ingest_jobs WHERE id IN ({marks}) ORDER BY id", ids).fetchall()
+        conn.execute("COMMIT")
+    for r in dead:
+        _remove_upload(r["file_path"])
+    return [dict(j) for j in jobs]
+
+
+def heartbeat(job_id: int, worker_id: str, stage: Optional[str] = None,
+              lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+    """Extend the lease (and optionally record progress). False if the lease was lost."""
+    now = time.time()
+    with connection() as conn:
+        cur = conn.execute(
+            """
+            UPDATE ingest_jobs
+            SET lease_expires_at = ?, stage = COALESCE(?, stage), updated_at = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'running'
+            """,
+            (now + lease_seconds, stage, now, job_id, worker_id),
+        )
+        return cur.rowcount == 1
+
+
+def complete_job(job_id: int, worker_id: str, payload: Dict[str, Any]) -> Optional[int]:
+    """
+    Insert the job's claim and mark the job done, atomically. Returns the claim
+    id, or None (nothing inserted) if the lease was lost to another worker. A
+    job that already has a claim_id is only marked done.
+    """
+    now = time.time()
+    with connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT status, lease_owner, claim_id, file_path FROM ingest_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None or row["lease_owner"] != worker_id or row["status"] != "running":
+            conn.execute("COMMIT")
+            return None
+        claim_id = row["claim_id"]
+        if claim_id is None:
+            claim_id = insert_claim_sync(conn, payload)
+        conn.execute(
+            """
+            UPDATE ingest_jobs
+            SET status = 'done', stage = 'done', claim_id = ?, error = NULL,
+                lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+            WHERE id = ?
+            """,
+            (claim_id, now, job_id),
+        )
+        conn.execute("COMMIT")
+    _remove_upload(row["file_path"])
+    return claim_id
+
+
+def fail_job(job_id: int, worker_id: str, error: str) -> str:
+    """Record a failure; requeue with backoff or mark failed. Returns the new status."""
+    now = time.time()
+    with connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT attempts, max_attempts, file_path FROM ingest_jobs WHERE id = ? AND lease_owner = ?",
+            (job_id, worker_id),
+        ).fetchone()
+        if row is None:  # lease lost to another worker; leave it alone
+            conn.execute("COMMIT")
+            return "lost"
+        if row["attempts"] < row["max_attempts"]:
+            status = "queued"
+            next_run = now + JOB_RETRY_BACKOFF * (2 ** (row["attempts"] - 1))
+        else:
+            status, next_run = "failed", now
+        conn.execute(
+            """
+            UPDATE ingest_jobs
+            SET status = ?, stage = ?, error = ?, next_run_at = ?,
+                lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+            WHERE id = ?
+            """,
+            (status, status, error[:2000], next_run, now, job_id),
+        )
+        conn.execute("COMMIT")
+    if status == "failed":
+        _remove_upload(row["file_path"])
+    return status
+
+
+def get_job(job_id: int) -> Optional[Dict[str, Any]]:
+    with connection() as conn:
+        row = conn.execute("SELECT * FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+
+def get_batch(batch_id: str) -> Dict[str, Any]:
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT * FROM ingest_jobs WHERE batch_id = ? ORDER BY id", (batch_id,)
+        ).fetchall()
+    jobs: List[Dict[str, Any]] = [dict(r) for r in rows]
+    counts: Dict[str, int] = {}
+    for j in jobs:
+        counts[j["status"]] = counts.get(j["status"], 0) + 1
+    finished = counts.get("done", 0) + counts.get("failed", 0)
+    return {
+        "batch_id": batch_id,
+        "total": len(jobs),
+        "counts": counts,
+        "progress": round(finished / len(jobs), 3) if jobs else None,
+        "jobs": jobs,
+    }
+
+
+def queue_stats() -> Dict[str, int]:
+    with connection() as conn:
+        rows = conn.execute("SELECT status, COUNT(*) AS n FROM ingest_jobs GROUP BY status").fetchall()
+    return {r["status"]: r["n"] for r in rows}
@@ -30,11 +30,12 @@ from sqlalchemy import text
 # standard libs
 import io
 import re
+import asyncio
 import json
-import sqlite3
 import datetime
 import pathlib
-from typing import Optional, Dict, Any
+import uuid
+from typing import Optional, Dict, Any, List
 
  # FastAPI OpenAPI customization
 from fastapi.openapi.utils import get_openapi
@@ -47,8 +48,22 @@ bearer_scheme = HTTPBearer()
 load_dotenv()
 
 # Project helpers / DB / models (adjust names/paths as your project uses)
-from backend.ocr import extract_text
-from backend.ner import extract_entities
+from backend.ocr import shutdown_ocr_pool, ocr_stats
+from backend.ner import get_nlp, batch_stats as ner_batch_stats, path_stats as ner_path_stats, NER_GAZETTEER
+from backend.gazetteer import get_gazetteer, gazetteer_stats
+from backend.village_index import get_village_index, correction_stats as village_correction_stats
+from backend.pipeline import (
+    run_document_pipeline,
+    build_upload_payload,
+    pipeline_stats,
+    shutdown_pipeline,
+    PipelineBusy,
+)
+from backend import extraction_cache
+from backend import jobs
+from backend import sqlite_pool
+from backend import import_journal
+from backend import villages
 
 from backend.db import (
     get_db,
@@ -69,6 +84,7 @@ from backend.routes.auth import router as auth_router
 from backend.routes.claims import router as claims_router
 from backend.routes import auth_tribal  # this module defines router = APIRouter(prefix="/auth/tribal", ...)
 from backend.routes import officers
+from backend.routes.jobs import router as jobs_router
 
 # ----------------------------------------------------------------------
 # Create single FastAPI app and configure
@@ -109,6 +125,7 @@ app.include_router(auth_tribal.router)
 app.include_router(diagnostics_router, prefix="/api")
 app.include_router(auth_router, prefix="/api")
 app.include_router(claims_router, prefix="/api")
+app.include_router(jobs_router, prefix="/api")
 app.include_router(officers.router)
 
 # -----------------------------------------------------------------------------
@@ -162,6 +179,16 @@ async def on_startup():
     # Ensure helper tables exist
     await init_claims_table()
     await init_villages_table()
+    await import_journal.init_import_journal()
+    jobs.init_jobs_table()
+    villages.init_geocode_queue()
+
+    # spaCy loads on first use; SPACY_PRELOAD=1 moves that cost to startup
+    if os.getenv("SPACY_PRELOAD", "0") == "1":
+        await asyncio.to_thread(get_nlp)
+    if NER_GAZETTEER:
+        await asyncio.to_thread(get_gazetteer().ensure_loaded)
+    await asyncio.to_thread(get_village_index().ensure_loaded)
 
     # Optional seeding controlled by env var
     try:
@@ -188,6 +215,14 @@ async def on_startup():
         # never fail startup because of seeding
         pass
 
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # stop document pipeline threads and OCR worker processes
+    shutdown_pipeline()
+    shutdown_ocr_pool()
+    sqlite_pool.close_pool()
+
 # -----------------------------------------------------------------------------
 # Health & Ping
 # -----------------------------------------------------------------------------
@@ -223,96 +258,55 @@ async def _debug_db_info():
     """
     env_url = os.environ.get("DATABASE_URL", None)
 
-    resolved = None
-    file_part = None
-    try:
-        if isinstance(DATABASE_URL, str) and DATABASE_URL.startswith("sqlite"):
-            file_part = DATABASE_URL.split(":///")[-1]
-            resolved = str(Path(file_part).resolve())
-        elif env_url and env_url.startswith("sqlite"):
-            file_part = env_url.split(":///")[-1]
-            resolved = str(Path(file_part).resolve())
-        else:
-            repo_root = Path(__file__).resolve().parent.parent
-            resolved = str((repo_root / "fra_atlas.db").resolve())
-    except Exception:
-        try:
-            resolved = str(Path(file_part).as_posix())
-        except Exception:
-            resolved = "unknown"
-
     villages = None
     claims = None
     try:
-        conn = sqlite3.connect(resolved)
-        cur = conn.cursor()
-        try:
-            villages = cur.execute(
-                "SELECT id,state,district,block,village,lat,lon FROM villages ORDER BY id"
-            ).fetchall()
-        except Exception as e:
-            villages = f"ERR:{e}"
-        try:
-            claims = cur.execute(
-                "SELECT id,state,district,village,lat,lon FROM claims ORDER BY id"
-            ).fetchall()
-        except Exception as e:
-            claims = f"ERR:{e}"
-        conn.close()
+        with sqlite_pool.connection() as conn:
+            try:
+                villages = [tuple(r) for r in conn.execute(
+                    "SELECT id,state,district,block,village,lat,lon FROM villages ORDER BY id"
+                ).fetchall()]
+            except Exception as e:
+                villages = f"ERR:{e}"
+            try:
+                claims = [tuple(r) for r in conn.execute(
+                    "SELECT id,state,district,village,lat,lon FROM claims ORDER BY id"
+                ).fetchall()]
+            except Exception as e:
+                claims = f"ERR:{e}"
     except Exception as e:
         villages = f"ERR_OPEN:{e}"
         claims = f"ERR_OPEN:{e}"
 
     return {
         "env_DATABASE_URL": env_url,
-        "resolved_db_file": resolved,
+        "resolved_db_file": sqlite_pool.DB_PATH,
+        "sqlite_pool": sqlite_pool.pool_stats(),
         "villages_rows": villages,
         "claims_rows": claims,
     }
 
 # -----------------------------------------------------------------------------
-# Small helpers for OCR→NER mapping
+# Document pipeline stats (extraction cache etc.)
 # -----------------------------------------------------------------------------
-def _first(x):
-    return (x or [None])[0] if isinstance(x, list) else x
-
-def _clean_line(s: str | None) -> str | None:
-    if not s:
-        return None
-    # keep only the first line and trim any leaked trailing labels
-    s = s.splitlines()[0].strip()
-    s = re.sub(r'\s*(?:state|district|village|patta\s*holder)\s*$', '', s, flags=re.I)
-    return ' '.join(s.split())
-
-def _title_if_name(s: str | None) -> str | None:
-    if not s:
-        return None
-    # avoid title-casing codes like IFR-123/2020
-    return s if re.search(r'[0-9\-\/]', s) else s.title()
-
-def _normalize_names(payload: dict) -> dict:
-    # expand these maps as you see more variants
-    state_map = {
-        "mp": "Madhya Pradesh",
-        "madhya pradesh": "Madhya Pradesh",
-    }
-    district_map = {
-        "sehore": "Sehore",
+@app.get("/api/_debug_pipeline")
+async def _debug_pipeline():
+    return {
+        "executor": pipeline_stats(),
+        "jobs": jobs.queue_stats(),
+        "extraction_cache": extraction_cache.stats(),
+        "ocr": ocr_stats(),
+        "ner_batch": ner_batch_stats(),
+        "ner_paths": ner_path_stats(),
+        "gazetteer": gazetteer_stats(),
+        "village_corrections": village_correction_stats(),
+        "village_geocode_queue": villages.geocode_queue_stats(),
+        "sqlite_pool": sqlite_pool.pool_stats(),
     }
-    st = (payload.get("state") or "").strip().lower()
-    di = (payload.get("district") or "").strip().lower()
-
-    payload["state"] = state_map.get(st, payload.get("state"))
-    payload["district"] = district_map.get(di, payload.get("district"))
-
-    if payload.get("village"):
-        payload["village"] = _title_if_name(payload["village"].strip())
-    if payload.get("patta_holder"):
-        payload["patta_holder"] = _title_if_name(payload["patta_holder"].strip())
-    if payload.get("status"):
-        payload["status"] = _title_if_name(payload["status"].strip())
-    return payload
 
+# -----------------------------------------------------------------------------
+# Small helpers
+# -----------------------------------------------------------------------------
 def _row_to_dict(row) -> Dict[str, Any]:
     if row is None:
         return {}
@@ -330,14 +324,23 @@ def _row_to_dict(row) -> Dict[str, Any]:
 @app.post("/api/upload-fra", dependencies=[Depends(bearer_scheme)])
 async def upload_fra(
     file: UploadFile = File(...),
+    async_mode: bool = Query(False, alias="async", description="Enqueue for a worker and return a job id"),
     current_user=Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Upload FRA document.
     Auto-assigns claim to logged-in officer.
+    With ?async=true the document is queued for `python -m backend.worker` and
+    the response is {job_id, status, status_url}; poll /api/jobs/{job_id}.
     """
 
+    if async_mode:
+        officer_id = current_user["id"]
+        file_path = await _save_for_job(file)
+        job_id = jobs.enqueue_job(str(file_path), file.filename, officer_id)
+        return {"job_id": job_id, "status": "queued", "status_url": f"/api/jobs/{job_id}"}
+
     try:
         file_path = UPLOAD_DIR / file.filename
         with open(file_path, "wb") as f:
@@ -346,41 +349,56 @@ async def upload_fra(
         # Considered officer
         officer_id = current_user["id"]
 
-        # OCR + NER
-        text = extract_text(str(file_path))
-        entities = extract_entities(text)
-
-        payload = {
-            "state": _clean_line(entities.get("state")) or "Unknown",
-            "district": _clean_line(entities.get("district")) or "Unknown",
-            "block": None,
-            "village": _clean_line(_first(entities.get("villages"))),
-            "patta_holder": _clean_line(_first(entities.get("patta_holders"))),
-            "address": None,
-            "land_area": _clean_line(entities.get("land_area")),
-            "status": "Pending",
-            "lat": entities.get("lat"),
-            "lon": entities.get("lon"),
-            "source": "ocr",
-            "raw_ocr": json.dumps(entities),
-
-            # 🔐 CRITICAL PART
-            "assigned_officer_id": officer_id,
-            "assigned_date": datetime.date.today().isoformat(),
-        }
+        # OCR + NER (cached by file content), off the event loop
+        extracted = await run_document_pipeline(str(file_path))
+        entities = extracted["entities"]
 
-        payload = _normalize_names(payload)
+        payload = build_upload_payload(entities, officer_id)
         created = await insert_claim(payload)
 
         return {
             "message": "Claim created and assigned to officer",
             "officer_id": officer_id,
             "claim": created,
+            "pages_skipped": extracted["pages_skipped"],
         }
 
+    except PipelineBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "10"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _save_for_job(file: UploadFile) -> Path:
+    # unique name: the file must survive until a worker picks it up
+    # (backend.jobs deletes it once the job is done or has failed for good)
+    file_path = (UPLOAD_DIR / f"{uuid.uuid4().hex}_{Path(file.filename or 'upload.pdf').name}").resolve()
+    with open(file_path, "wb") as f:
+        f.write(await file.read())
+    return file_path
+
+
+@app.post("/api/upload-fra/batch", dependencies=[Depends(bearer_scheme)])
+async def upload_fra_batch(
+    files: List[UploadFile] = File(...),
+    current_user=Depends(get_current_user),
+):
+    """
+    Queue several FRA documents at once. Returns a batch id plus one job id
+    per file; poll /api/jobs/batch/{batch_id} for progress.
+    """
+    officer_id = current_user["id"]
+    batch_id = jobs.new_batch_id()
+    job_ids = []
+    for f in files:
+        file_path = await _save_for_job(f)
+        job_ids.append(jobs.enqueue_job(str(file_path), f.filename, officer_id, batch_id=batch_id))
+    return {
+        "batch_id": batch_id,
+        "job_ids": job_ids,
+        "status": "queued",
+        "status_url": f"/api/jobs/batch/{batch_id}",
+    }
+
 # -----------------------------------------------------------------------------
 # Villages list (for dropdowns, seeding, etc.)
 # -----------------------------------------------------------------------------
@@ -42,6 +42,9 @@ class Claim(Base):
     source = Column(String, default="manual")   # e.g. "manual" or "uploaded"
     raw_ocr = Column(Text, nullable=True)       # JSON/text dump of OCR/NER results
 
+    # Optimistic concurrency: every UPDATE bumps it; writers may require a match
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     # Helpful composite index for common filters
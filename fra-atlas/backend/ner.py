@@ -1,9 +1,91 @@
 # backend/ner.py
+import os
 import re
-import spacy
+import json
+import time
+import threading
+from pathlib import Path
+from importlib import metadata
 
-# Load SpaCy model once (already in your requirements)
-nlp = spacy.load("en_core_web_sm")
+from backend.gazetteer import get_gazetteer, normalize as gaz_normalize
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+# Pipeline components to load. Only `doc.ents` is read below, and in the
+# en_core_web_* pipelines "ner" has its own tok2vec, so tagger / parser /
+# lemmatizer are excluded (not loaded at all) unless listed here.
+# Measured with backend/scripts/bench_ner_load.py (5 cold runs, on a locally
+# built stand-in with en_core_web_sm's pipeline layout): extract_entities
+# 22-28 ms/doc with all six components vs 10-13 ms/doc with "ner" only
+# (2.0-2.5x). Model load itself is not meaningfully faster (340-640 ms vs
+# 320-510 ms); `import spacy` (0.7-1.2 s) dominates either way.
+SPACY_COMPONENTS = [c.strip() for c in os.getenv("SPACY_COMPONENTS", "ner").split(",") if c.strip()]
+
+# The model is loaded on first use, not at import (importing backend.main must
+# stay cheap for processes that never parse a document): importing backend.ner
+# takes 30-50 ms, where it used to pay `import spacy` plus the full model load
+# (1.1-1.8 s in the same runs).
+_nlp = None
+_nlp_lock = threading.Lock()
+
+# extract_entities_batch: documents per nlp.pipe batch, and worker processes
+# (n_process > 1 forks spaCy workers; worth it only for large batches)
+NER_BATCH_SIZE = max(1, int(os.getenv("NER_BATCH_SIZE", "32")))
+NER_N_PROCESS = max(1, int(os.getenv("NER_N_PROCESS", "1")))
+
+# NER_GAZETTEER=1: village candidates come from known names (backend.gazetteer)
+# instead of spaCy GPE entities, and missing state / district labels are filled
+# from gazetteer matches.
+NER_GAZETTEER = os.getenv("NER_GAZETTEER", "0") == "1"
+
+_batch_lock = threading.Lock()
+_batch_stats = {"batches": 0, "docs": 0, "seconds": 0.0}
+
+# documents per NER path ("regex" = fast path, "spacy" = full) and time spent
+_path_lock = threading.Lock()
+_path_stats = {"regex": 0, "spacy": 0, "regex_seconds": 0.0, "spacy_seconds": 0.0}
+
+
+def _model_meta() -> dict:
+    """meta.json of SPACY_MODEL (package name or model directory), without loading it."""
+    path = Path(SPACY_MODEL)
+    if not path.is_dir():
+        import spacy.util
+        path = spacy.util.get_package_path(SPACY_MODEL)
+    with open(path / "meta.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_nlp():
+    """The shared spaCy pipeline, loaded once with only SPACY_COMPONENTS."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                try:
+                    pipes = _model_meta().get("pipeline", [])
+                except Exception as e:
+                    print(f"[NER] could not read {SPACY_MODEL} meta.json ({e}); loading all components")
+                    pipes = []
+                nlp = spacy.load(SPACY_MODEL, exclude=[p for p in pipes if p not in SPACY_COMPONENTS])
+                for name in nlp.pipe_names:
+                    if name not in SPACY_COMPONENTS:
+                        nlp.disable_pipe(name)
+                _nlp = nlp
+    return _nlp
+
+
+def model_version() -> str:
+    """Identifies the NER model (used in extraction cache keys); does not load the model."""
+    try:
+        version = metadata.version(SPACY_MODEL)
+    except metadata.PackageNotFoundError:
+        try:
+            version = _model_meta().get("version", "unknown")
+        except Exception:
+            version = "unknown"
+    return f"{SPACY_MODEL}-{version}"
 
 # -------- Line-anchored regexes (stop at end-of-line) --------
 P_STATE    = re.compile(r'(?im)^\s*state\s*[:\-]\s*([^\r\n]+)')
@@ -31,6 +113,32 @@ P_DATE_FREE = re.compile(
 # Optional: decimal coordinate pairs like "23.1984, 77.0951"
 P_COORDS = re.compile(r'(?i)\b(-?\d{1,2}\.\d{3,}),\s*(-?\d{1,3}\.\d{3,})\b')
 
+# Labeled claim fields, by the key the early-exit OCR mode tracks
+FIELD_PATTERNS = {
+    "state": P_STATE,
+    "district": P_DISTRICT,
+    "village": P_VILLAGE,
+    "patta_holder": P_PATTA,
+    "ifr_number": P_IFR,
+    "land_area": P_AREA,
+    "status": P_STATUS,
+}
+
+# Fields that must all be found before incremental OCR may stop early
+REQUIRED_FIELDS = [
+    f.strip() for f in os.getenv("NER_REQUIRED_FIELDS", ",".join(FIELD_PATTERNS)).split(",")
+    if f.strip() in FIELD_PATTERNS
+]
+
+# Regex-first fast path: when the labeled pass already found every one of
+# NER_FAST_PATH_FIELDS, spaCy is skipped for the document (its GPE / PERSON /
+# DATE candidates are then absent from villages / patta_holders / dates).
+NER_FAST_PATH = os.getenv("NER_FAST_PATH", "0") == "1"
+NER_FAST_PATH_FIELDS = [
+    f.strip() for f in os.getenv("NER_FAST_PATH_FIELDS", "state,district,village,patta_holder").split(",")
+    if f.strip() in FIELD_PATTERNS
+]
+
 # If labels leaked to next line, trim trailing label words
 TRAILING_LABELS = re.compile(r'\s*(?:state|district|village|patta\s*holder)\s*$', re.I)
 
@@ -67,18 +175,253 @@ def _title_or_keep(s: str | None) -> str | None:
     return s.title()
 
 
+# -------- Single-pass field scanner --------
+# Every labeled pattern except P_IFR needs a ":" or "-" right after its label,
+# and separators are rare in OCR text. So one pass over the separators finds
+# all labeled fields: for each separator, the label just before it (if any)
+# decides the field, and the value is read with that field's pattern anchored
+# at the label (.match, no rescanning). P_IFR's separator is optional, so the
+# IFR number keeps a single .search. Results are the same as running each P_*
+# pattern's .search / .finditer over the text. Village matches don't overlap,
+# as with P_VILLAGE.finditer: a label inside the previous village match (its
+# value can start on a later line, "Vill.:\n vill. - X") doesn't start another.
+_SEPARATORS = re.compile(r'[:\-]')
+
+# cheap prefilter: last word of every label
+_LABEL_LAST_WORDS = ("state", "district", "village", "vill.", "holder", "claimant", "name",
+                     "status", "area", "date", "on")
+
+# label (+ optional whitespace) ending where the separator starts, written
+# reversed so it can be .match()ed against the reversed text before the separator
+_LABEL_TAIL_REV = re.compile(
+    r'\s*(?:(?P<state>etats)|(?P<district>tcirtsid)|(?P<village>egalliv|\.lliv)'
+    r'|(?P<patta_holder>redloh\s*attap|tnamialc|eman)|(?P<status>sutats(?P<status_long>\s*mialc)?)'
+    r'|(?P<land_area>aera(?P<land_area_long>\s*dnal)?)|(?P<date_label>etad|no\s*dettimbus|no\s*deifirev))'
+)
+
+# the P_* patterns without their leading anchor / \b, applied at the label
+_VALUE_AT = {
+    "state": re.compile(r'(?i)state\s*[:\-]\s*([^\r\n]+)'),
+    "district": re.compile(r'(?i)district\s*[:\-]\s*([^\r\n]+)'),
+    "village": re.compile(r'(?i)(?:village|vill\.)\s*[:\-]\s*([^\r\n]+)'),
+    "patta_holder": re.compile(r'(?i)(?:patta\s*holder|claimant|name)\s*[:\-]\s*([^\r\n]+)'),
+    "land_area": re.compile(r'(?i)(?:area|land\s*area)\s*[:\-]\s*([^\r\n]+)'),
+    "status": re.compile(r'(?i)(?:claim\s*status|status)\s*[:\-]\s*([^\r\n]+)'),
+    "date_label": re.compile(r'(?i)(?:date|submitted\s*on|verified\s*on)\s*[:\-]\s*([^\r\n]+)'),
+}
+
+# P_STATE / P_DISTRICT / P_VILLAGE / P_PATTA only match at the start of a line
+_LINE_START_FIELDS = {"state", "district", "village", "patta_holder"}
+
+
+def _label_ok(lowered: str, field: str, start: int) -> bool:
+    if field in _LINE_START_FIELDS:
+        prefix = lowered[lowered.rfind("\n", 0, start) + 1:start]
+        return not prefix or prefix.isspace()
+    # \b before the label
+    return start == 0 or not (lowered[start - 1].isalnum() or lowered[start - 1] == "_")
+
+
+def _label_before(lowered: str, sep: int):
+    """(field, label start) for the label ending right before the separator at `sep`, or None."""
+    head = lowered[max(0, sep - 64):sep]
+    core = head.rstrip()
+    if len(core) < 16 and sep > 64:  # long whitespace run between label and separator
+        head = lowered[max(0, sep - 4096):sep]
+        core = head.rstrip()
+    if not core.endswith(_LABEL_LAST_WORDS):
+        return None
+    m = _LABEL_TAIL_REV.match(head[::-1])
+    if m is None:
+        return None
+    field = m.lastgroup
+    if _label_ok(lowered, field, sep - m.end()):
+        return field, sep - m.end()
+    # "claim status" / "land area" not on a word boundary: P_STATUS / P_AREA
+    # still match at the shorter label
+    if field in ("status", "land_area") and m.group(field + "_long"):
+        start = sep - m.start(field + "_long")
+        if _label_ok(lowered, field, start):
+            return field, start
+    return None
+
+
+def scan_fields(text: str) -> dict:
+    """
+    All labeled fields in one pass over `text`:
+      state, district, patta_holder, ifr_number, land_area, status, date_label
+      (first match each, cleaned; None if absent) and villages (every match).
+    """
+    text = text or ""
+    found = {"villages": []}
+    pending = set(_VALUE_AT) - {"village"}
+    village_end = 0
+    lowered = text.lower()
+    if len(lowered) != len(text):  # lower() changed offsets (rare non-ASCII case folds)
+        lowered = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+    for sep in _SEPARATORS.finditer(lowered):
+        label = _label_before(lowered, sep.start())
+        if label is None:
+            continue
+        field, start = label
+        if field == "village" and start < village_end:
+            continue
+        if field != "village" and field not in pending:
+            continue
+        m = _VALUE_AT[field].match(text, start)
+        if m is None:
+            continue
+        if field == "village":
+            found["villages"].append(_clean_val(m.group(1)))
+            village_end = m.end()
+        else:
+            found[field] = _clean_val(m.group(1))
+            pending.discard(field)
+    for field in pending:
+        found[field] = None
+
+    m = P_IFR.search(text)
+    found["ifr_number"] = _clean_val(m.group(1)) if m else None
+    return found
+
+
+def labeled_fields_in(text: str) -> set:
+    """Names of FIELD_PATTERNS with a non-empty match in `text` (regex only, no spaCy)."""
+    fields = scan_fields(text)
+    found = {name for name in FIELD_PATTERNS if name != "village" and fields[name]}
+    if fields["villages"] and fields["villages"][0]:
+        found.add("village")
+    return found
+
+
+def _fast_path_ok(fields: dict) -> bool:
+    if not NER_FAST_PATH:
+        return False
+    for name in NER_FAST_PATH_FIELDS:
+        value = fields["villages"][0] if name == "village" and fields["villages"] else fields.get(name)
+        if not value:
+            return False
+    return True
+
+
+def _record_path(path: str, docs: int, seconds: float) -> None:
+    with _path_lock:
+        _path_stats[path] += docs
+        _path_stats[path + "_seconds"] += seconds
+
+
+def path_stats() -> dict:
+    """
+    Documents per NER path since process start. spacy_seconds_saved estimates
+    the CPU the fast path avoided (mean spaCy time per document x regex docs).
+    """
+    with _path_lock:
+        out = dict(_path_stats)
+    out["fast_path"] = NER_FAST_PATH
+    per_doc = out["spacy_seconds"] / out["spacy"] if out["spacy"] else None
+    out["spacy_seconds_saved"] = round(per_doc * out["regex"], 3) if per_doc is not None else None
+    out["regex_seconds"] = round(out["regex_seconds"], 3)
+    out["spacy_seconds"] = round(out["spacy_seconds"], 3)
+    return out
+
+
 def extract_entities(text: str):
     """
     Extract entities from OCR text using spaCy + robust regex.
-    Returns a dict aligned with the Claim schema.
+    Returns a dict aligned with the Claim schema; "ner_path" says whether
+    spaCy ran ("spacy") or the regex fast path was enough ("regex").
+    """
+    started = time.perf_counter()
+    fields = scan_fields(text)
+    if _fast_path_ok(fields):
+        out = _entities_from_doc(text, None, fields)
+        _record_path("regex", 1, time.perf_counter() - started)
+        return out
+    out = _entities_from_doc(text, get_nlp()(text or ""), fields)
+    _record_path("spacy", 1, time.perf_counter() - started)
+    return out
+
+
+def extract_entities_batch(texts, batch_size: int | None = None, n_process: int | None = None) -> list:
+    """
+    extract_entities for many documents, streaming them through nlp.pipe.
+    Returns one dict per text, in order, identical to extract_entities(text).
     """
+    texts = list(texts)
+    if not texts:
+        return []
+    started = time.perf_counter()
+    out: list = [None] * len(texts)
+    slow = []  # indexes that need spaCy
+    for i, text in enumerate(texts):
+        fields = scan_fields(text)
+        if _fast_path_ok(fields):
+            out[i] = _entities_from_doc(text, None, fields)
+        else:
+            slow.append((i, fields))
+    regex_done = time.perf_counter()
+    if len(slow) < len(texts):
+        _record_path("regex", len(texts) - len(slow), regex_done - started)
+
+    if slow:
+        docs = get_nlp().pipe(
+            (texts[i] or "" for i, _ in slow),
+            batch_size=batch_size or NER_BATCH_SIZE,
+            n_process=n_process or NER_N_PROCESS,
+        )
+        for (i, fields), doc in zip(slow, docs):
+            out[i] = _entities_from_doc(texts[i], doc, fields)
+        _record_path("spacy", len(slow), time.perf_counter() - regex_done)
+    elapsed = time.perf_counter() - started
+    with _batch_lock:
+        _batch_stats["batches"] += 1
+        _batch_stats["docs"] += len(out)
+        _batch_stats["seconds"] += elapsed
+    return out
+
+
+def batch_stats() -> dict:
+    """extract_entities_batch totals since process start, with docs/sec."""
+    with _batch_lock:
+        out = dict(_batch_stats)
+    out["docs_per_sec"] = round(out["docs"] / out["seconds"], 1) if out["seconds"] else None
+    out["seconds"] = round(out["seconds"], 3)
+    return out
+
+
+def _gazetteer_places(text: str, state, district):
+    """(state, district, villages) from gazetteer matches, scoped to the labeled state / district."""
+    matches = get_gazetteer().find(text or "")
+    want_state = gaz_normalize(state)
+    if not want_state and matches:
+        # an explicit state name wins over the state of the first district / village
+        kinds = [entry[0] for _, entry in matches]
+        _, (_, state, _, _) = matches[kinds.index("state") if "state" in kinds else 0]
+        want_state = gaz_normalize(state)
+    want_district = gaz_normalize(district)
+    if not want_district:
+        for _, (kind, m_state, m_district, name) in matches:
+            if kind == "district" and gaz_normalize(m_state) == want_state:
+                want_district, district = gaz_normalize(name), name
+                break
+    villages = _dedupe([
+        name for _, (kind, m_state, m_district, name) in matches
+        if kind == "village"
+        and (not want_state or gaz_normalize(m_state) == want_state)
+        and (not want_district or gaz_normalize(m_district) == want_district)
+    ])
+    return state, district, villages
+
+
+def _entities_from_doc(text: str, doc, fields: dict | None = None):
+    """Merge spaCy entities (`doc`, None on the fast path) with the labeled `fields`."""
     # ---------- spaCy pass ----------
-    doc = nlp(text or "")
     villages_spacy = []
     names_spacy = []
     dates_spacy = []
-    for ent in doc.ents:
-        if ent.label_ == "GPE":
+    for ent in (doc.ents if doc is not None else ()):
+        if ent.label_ == "GPE" and not NER_GAZETTEER:
             villages_spacy.append(_clean_val(ent.text))
         elif ent.label_ == "PERSON":
             names_spacy.append(_clean_val(ent.text))
@@ -86,17 +429,22 @@ def extract_entities(text: str):
             dates_spacy.append(_clean_val(ent.text))
 
     # ---------- Regex pass (line-anchored) ----------
-    state       = _clean_val((P_STATE.search(text) or (None,))[1] if P_STATE.search(text) else None)
-    district    = _clean_val((P_DISTRICT.search(text) or (None,))[1] if P_DISTRICT.search(text) else None)
-    villages_rx = [ _clean_val(m.group(1)) for m in P_VILLAGE.finditer(text) ]
-    patta_lbl   = _clean_val((P_PATTA.search(text) or (None,))[1] if P_PATTA.search(text) else None)
+    if fields is None:
+        fields  = scan_fields(text)
+    state       = fields["state"]
+    district    = fields["district"]
+    villages_rx = fields["villages"]
+    patta_lbl   = fields["patta_holder"]
+
+    ifr         = fields["ifr_number"]
+    area        = fields["land_area"]
+    status      = fields["status"]
 
-    ifr         = _clean_val((P_IFR.search(text) or (None,))[1] if P_IFR.search(text) else None)
-    area        = _clean_val((P_AREA.search(text) or (None,))[1] if P_AREA.search(text) else None)
-    status      = _clean_val((P_STATUS.search(text) or (None,))[1] if P_STATUS.search(text) else None)
+    if NER_GAZETTEER:
+        state, district, villages_spacy = _gazetteer_places(text, state, district)
 
     # Dates: prefer labeled ones, then pick free-form tokens as fallback
-    date_lbl    = _clean_val((P_DATE_LBL.search(text) or (None,))[1] if P_DATE_LBL.search(text) else None)
+    date_lbl    = fields["date_label"]
     dates_free  = [ _clean_val(m.group(0)) for m in P_DATE_FREE.finditer(text) ]
 
     # Optional coords
@@ -133,6 +481,7 @@ def extract_entities(text: str):
             "dates": dates_spacy + dates_free + ([date_lbl] if date_lbl else []),
             "coords": coords,
         },
+        "ner_path": "spacy" if doc is not None else "regex",
     }
 
     # If coordinates were found, you could optionally choose the first one here
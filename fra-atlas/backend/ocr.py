@@ -1,20 +1,35 @@
 # backend/ocr.py
 import os
-import pdfplumber
+import re
+import sys
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
 import pytesseract
-from pdf2image import convert_from_path
 from pathlib import Path
+from typing import Callable
 from PIL import Image, ImageFilter, ImageOps
 
+from backend import form_templates
+from backend.ocr_preprocess import preprocess_numpy, settings as numpy_preprocess_settings
+from backend.pdf_engines import engine_name as pdf_engine_name, open_document
+
+try:  # POSIX only; used for the per-document peak RSS figure
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+try:  # optional: in-process Tesseract API (pip install tesserocr)
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
 
 # ---- Config (edit if needed) ----------------------------------------------
 
-# Force pdf2image to use your Poppler binaries (Windows-safe).
-# If you set the POPPLER_PATH env var, that value will be used instead.
-POPPLER_PATH = os.getenv(
-    "POPPLER_PATH",
-    r"C:\poppler\poppler-25.07.0\Library\bin"  # <-- update if your path differs
-)
+# PDF text layer + rendering backend (PDF_ENGINE=auto|pdfium|poppler) and
+# POPPLER_PATH are configured in backend/pdf_engines.py.
 
 # OCR languages (install Tesseract language packs first if you add more)
 # Example: "eng+hin" for English + Hindi
@@ -23,10 +38,129 @@ TESS_LANG = os.getenv("TESS_LANG", "eng")
 # DPI for rasterizing scanned PDFs (higher = sharper OCR but slower & more RAM)
 PDF_DPI = int(os.getenv("PDF_DPI", "300"))
 
+# OCR engine for scanned pages:
+#   "serial" -> rasterize + OCR every page in the calling thread (default)
+#   "pool"   -> fan pages out to a bounded process pool, reassemble in page order
+#               (early-exit mode, OCR_EARLY_EXIT / OCR_PAGE_BUDGET, OCRs
+#               OCR_WORKERS pages per round; see extract_text_incremental)
+OCR_ENGINE = os.getenv("OCR_ENGINE", "serial").strip().lower()
+
+# Process-pool size (defaults to the number of CPUs)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 2)))
+
+# Page preprocessing before Tesseract:
+#   "pil"   -> grayscale -> autocontrast -> UnsharpMask (default)
+#   "numpy" -> vectorized grayscale -> stretch -> adaptive binarization (backend/ocr_preprocess.py)
+OCR_PREPROCESS = os.getenv("OCR_PREPROCESS", "pil").strip().lower()
+
+# Tesseract backend:
+#   "pytesseract" -> one `tesseract` subprocess per page (default)
+#   "tesserocr"   -> a long-lived, initialized Tesseract API per worker thread/process
+#                    (language data loaded once); falls back to pytesseract if missing
+OCR_BACKEND = os.getenv("OCR_BACKEND", "pytesseract").strip().lower()
+
+# Seconds a single page may spend in Tesseract before it is abandoned (0 = no limit)
+OCR_PAGE_TIMEOUT = float(os.getenv("OCR_PAGE_TIMEOUT", "120"))
+
+# Pages rasterized at a time by the streaming (serial) pipeline. Peak image
+# memory is bounded by this window, not by the length of the document.
+OCR_PAGE_WINDOW = max(1, int(os.getenv("OCR_PAGE_WINDOW", "1")))
+
+# A page whose text layer has fewer characters than this is treated as
+# scanned and sent to OCR (hybrid per-page routing).
+OCR_MIN_TEXT_CHARS = int(os.getenv("OCR_MIN_TEXT_CHARS", "20"))
+
+# DPI strategy for scanned pages:
+#   "fixed"    -> every page at PDF_DPI (default)
+#   "adaptive" -> OCR at the lowest of OCR_DPI_TIERS first and re-render at the
+#                 next tier only while mean word confidence < OCR_MIN_CONFIDENCE
+OCR_DPI_MODE = os.getenv("OCR_DPI_MODE", "fixed").strip().lower()
+OCR_DPI_TIERS = sorted(int(x) for x in os.getenv("OCR_DPI_TIERS", "150,300").split(",") if x.strip())
+OCR_MIN_CONFIDENCE = float(os.getenv("OCR_MIN_CONFIDENCE", "75"))
+
+# Zonal OCR for known form layouts (backend/form_templates.py): when a scanned
+# page matches a registered template, only its labeled field zones are OCR'd
+# (each with the template's page-segmentation mode); other pages, and zone
+# results missing too many labels, fall back to full-page OCR.
+OCR_TEMPLATES = os.getenv("OCR_TEMPLATES", "0") == "1"
+
+
+def settings_fingerprint() -> dict:
+    """OCR settings that change the extracted text (used in cache keys)."""
+    fp = {"tess_lang": TESS_LANG, "pdf_dpi": PDF_DPI, "min_text_chars": OCR_MIN_TEXT_CHARS}
+    if pdf_engine_name() != "poppler":
+        fp["pdf_engine"] = pdf_engine_name()
+    if OCR_DPI_MODE == "adaptive":
+        fp.update(dpi_mode="adaptive", dpi_tiers=OCR_DPI_TIERS, min_confidence=OCR_MIN_CONFIDENCE)
+    if OCR_PREPROCESS == "numpy":
+        fp["preprocess"] = {"mode": "numpy", **numpy_preprocess_settings()}
+    if OCR_TEMPLATES:
+        fp["form_templates"] = form_templates.settings()
+    if _use_tesserocr():
+        fp["ocr_backend"] = f"tesserocr-{tesserocr.tesseract_version().splitlines()[0]}"
+    return fp
+
+
+# ---- Tesseract backends ----------------------------------------------------
+
+_tess_local = threading.local()
+
+
+def _use_tesserocr() -> bool:
+    return OCR_BACKEND == "tesserocr" and tesserocr is not None
+
+
+if OCR_BACKEND == "tesserocr" and tesserocr is None:
+    print("[OCR] OCR_BACKEND=tesserocr but tesserocr is not installed; using pytesseract")
+
+
+def _tess_api():
+    """Per-thread PyTessBaseAPI, initialized once (the API is not thread-safe)."""
+    api = getattr(_tess_local, "api", None)
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(lang=TESS_LANG)
+        _tess_local.api = api
+    return api
+
+
+def _tesserocr_recognize(pre: Image.Image, timeout: float = 0, psm: int | None = None):
+    api = _tess_api()
+    api.SetPageSegMode(tesserocr.PSM.AUTO if psm is None else psm)
+    api.SetImage(pre)
+    if not api.Recognize(int(timeout * 1000) if timeout else 0):
+        raise RuntimeError("Tesseract process timeout" if timeout else "Tesseract recognition failed")
+    return api
+
+
+def _pytesseract_text(pre: Image.Image, timeout: float = 0, psm: int | None = None) -> str:
+    # NOTE: add `config="--oem 1 --psm 6"` if layout is simple paragraphs
+    config = f"--psm {psm}" if psm is not None else ""
+    return pytesseract.image_to_string(pre, lang=TESS_LANG, config=config, timeout=timeout)
+
+
+def _tesserocr_text(pre: Image.Image, timeout: float = 0, psm: int | None = None) -> str:
+    return _tesserocr_recognize(pre, timeout, psm).GetUTF8Text()
+
+
+def _tesseract_text(pre: Image.Image, timeout: float = 0, psm: int | None = None) -> str:
+    if _use_tesserocr():
+        return _tesserocr_text(pre, timeout, psm)
+    return _pytesseract_text(pre, timeout, psm)
+
 
 # ---- Helpers ---------------------------------------------------------------
 
 def _preprocess_for_ocr(img: Image.Image) -> Image.Image:
+    """Apply the configured preprocessing stage (OCR_PREPROCESS)."""
+    if OCR_PREPROCESS == "numpy":
+        try:
+            return preprocess_numpy(img)
+        except Exception as e:
+            print(f"[OCR] numpy preprocessing failed, using PIL chain: {e}")
+    return _preprocess_pil(img)
+
+
+def _preprocess_pil(img: Image.Image) -> Image.Image:
     """
     Light preprocessing to help Tesseract on faint/low-contrast scans.
     You can tune/remove this if your scans are already clean.
@@ -41,45 +175,555 @@ def _preprocess_for_ocr(img: Image.Image) -> Image.Image:
         return img
 
 
+def _ocr_image(img: Image.Image, timeout: float = 0) -> str:
+    """OCR a single (already rasterized) page image."""
+    return _tesseract_text(_preprocess_for_ocr(img), timeout)
+
+
+def _ocr_image_with_confidence(img: Image.Image, timeout: float = 0) -> tuple[str, float]:
+    """
+    OCR via image_to_data: returns (text, mean word confidence 0-100).
+    Text is rebuilt from Tesseract's block/paragraph/line structure.
+    """
+    pre = _preprocess_for_ocr(img)
+    if _use_tesserocr():
+        api = _tesserocr_recognize(pre, timeout)
+        confs = [c for c in api.AllWordConfidences() if c >= 0]
+        return api.GetUTF8Text(), (sum(confs) / len(confs) if confs else 0.0)
+
+    data = pytesseract.image_to_data(
+        pre, lang=TESS_LANG, output_type=pytesseract.Output.DICT, timeout=timeout
+    )
+    lines: dict[tuple, list[str]] = {}
+    confs = []
+    for i, word in enumerate(data["text"]):
+        word = (word or "").strip()
+        conf = float(data["conf"][i])
+        if not word or conf < 0:
+            continue
+        confs.append(conf)
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(key, []).append(word)
+
+    out, prev_block = [], None
+    for (block, par, line), words in lines.items():
+        if prev_block is not None and block != prev_block:
+            out.append("")  # blank line between blocks, like image_to_string
+        out.append(" ".join(words))
+        prev_block = block
+    return "\n".join(out), (sum(confs) / len(confs) if confs else 0.0)
+
+
+def _ocr_zones(img: Image.Image, timeout: float = 0) -> dict | None:
+    """
+    Zonal OCR against the form-template registry. Returns
+    {"text", "template", "pixels"} or None when the page matches no template
+    or too few zones came back with their field label.
+    """
+    match = form_templates.match_template(img)
+    if match is None:
+        return None
+    tpl, shift, _ = match
+    lines, labeled, pixels = [], 0, 0
+    for field, box in form_templates.zone_boxes(tpl, img, shift).items():
+        zone = tpl["fields"][field]
+        crop = img.crop(box)
+        pixels += crop.width * crop.height
+        text = " ".join(_tesseract_text(_preprocess_for_ocr(crop), timeout, zone.get("psm")).split())
+        if text:
+            lines.append(text)
+            if re.search(zone["label"], text, re.I):
+                labeled += 1
+    if labeled < tpl["min_fields"]:
+        print(f"[OCR] template {tpl['name']}: only {labeled} labeled zone(s), using full-page OCR")
+        return None
+    return {"text": "\n".join(lines), "template": tpl["name"], "pixels": pixels}
+
+
+def _ocr_page(file_path: str, page_no: int, img: Image.Image | None = None, timeout: float = 0) -> dict:
+    """
+    OCR one page. `img` is the page already rendered at the first DPI tier
+    (PDF_DPI in fixed mode); it is rendered here when omitted.
+    Returns {"text", "dpi", "confidence", "nbytes", "tier_seconds": {dpi: s},
+    "template", "ocr_pixels"} ("template" is None for full-page OCR).
+    """
+    tiers = OCR_DPI_TIERS if OCR_DPI_MODE == "adaptive" and OCR_DPI_TIERS else [PDF_DPI]
+    result = {"text": "", "dpi": None, "confidence": None, "nbytes": 0, "tier_seconds": {},
+              "template": None, "ocr_pixels": 0}
+
+    for i, dpi in enumerate(tiers):
+        if img is None or i > 0:
+            img = _render_page(file_path, page_no, dpi)
+        result["nbytes"] = max(result["nbytes"], _image_nbytes(img))
+
+        if OCR_TEMPLATES and i == 0:
+            started = time.perf_counter()
+            zonal = _ocr_zones(img, timeout=timeout)
+            if zonal is not None:
+                result.update(text=zonal["text"], dpi=dpi, template=zonal["template"],
+                              ocr_pixels=zonal["pixels"])
+                result["tier_seconds"][dpi] = round(time.perf_counter() - started, 3)
+                break
+        result["ocr_pixels"] += img.width * img.height
+
+        started = time.perf_counter()
+        if len(tiers) == 1:
+            result["text"] = _ocr_image(img, timeout=timeout)
+        else:
+            result["text"], result["confidence"] = _ocr_image_with_confidence(img, timeout=timeout)
+        result["tier_seconds"][dpi] = round(time.perf_counter() - started, 3)
+        result["dpi"] = dpi
+
+        if result["confidence"] is None or result["confidence"] >= OCR_MIN_CONFIDENCE:
+            break
+    return result
+
+
+def _count_pages(file_path: str) -> int:
+    with open_document(file_path) as doc:
+        return doc.page_count
+
+
+def _render_page(file_path: str, page_no: int, dpi: int) -> Image.Image:
+    with open_document(file_path) as doc:
+        return doc.render(page_no, page_no, dpi)[0]
+
+
+def _image_nbytes(img: Image.Image) -> int:
+    # decoded pixel buffer size (what PIL actually holds in RAM)
+    return img.width * img.height * len(img.getbands())
+
+
+def _rss_peak_mb() -> float | None:
+    """Process high-water RSS in MB (None where `resource` is unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _page_windows(pages: list[int], window: int):
+    """Split sorted page numbers into contiguous runs of at most `window` pages."""
+    run: list[int] = []
+    for n in pages:
+        if run and (n != run[-1] + 1 or len(run) >= window):
+            yield run[0], run[-1]
+            run = []
+        run.append(n)
+    if run:
+        yield run[0], run[-1]
+
+
+def iter_page_images(
+    file_path: str,
+    pages: list[int],
+    window: int = OCR_PAGE_WINDOW,
+    stats: dict | None = None,
+    dpi: int | None = None,
+):
+    """
+    Stream rasterized pages (1-based numbers in `pages`) as (page_no, image),
+    rendering at most `window` contiguous pages at a time (at `dpi`, default PDF_DPI).
+    Each window is released before the next one is rendered, so at most
+    `window` full-resolution images are alive at once. When `stats` is
+    given, "peak_image_bytes" records the largest window held.
+    """
+    with open_document(file_path) as doc:
+        for first, last in _page_windows(sorted(pages), max(1, window)):
+            images = doc.render(first, last, dpi or PDF_DPI)
+            if stats is not None:
+                held = sum(_image_nbytes(img) for img in images)
+                stats["peak_image_bytes"] = max(stats.get("peak_image_bytes", 0), held)
+
+            page_no = first
+            while images:
+                # pop so the list doesn't keep already-OCR'd pages alive
+                img = images.pop(0)
+                yield page_no, img
+                del img
+                page_no += 1
+
+
+# ---- Process-pool engine ---------------------------------------------------
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max(1, OCR_WORKERS), initializer=_init_pool_worker)
+        return _pool
+
+
+def _init_pool_worker() -> None:
+    # load Tesseract language data once per worker, not once per page
+    if _use_tesserocr():
+        _tess_api()
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def shutdown_ocr_pool() -> None:
+    """Stop the OCR worker processes (call on app shutdown)."""
+    _reset_pool()
+
+
+def _ocr_page_worker(file_path: str, page_no: int) -> dict:
+    """
+    Runs inside a pool worker: rasterize ONE page (1-based) and OCR it.
+    Workers rasterize for themselves so full-resolution images never cross
+    the process boundary. Returns the _ocr_page result dict.
+    """
+    return _ocr_page(file_path, page_no, timeout=OCR_PAGE_TIMEOUT)
+
+
+def _record_page(stats: dict | None, result: dict) -> None:
+    """Fold one page's memory and per-DPI-tier timings into document stats."""
+    if stats is None:
+        return
+    stats["peak_image_bytes"] = max(stats.get("peak_image_bytes", 0), result["nbytes"])
+    tiers = stats.setdefault("dpi_tiers", {})
+    for dpi, secs in result["tier_seconds"].items():
+        t = tiers.setdefault(str(dpi), {"pages": 0, "seconds": 0.0})
+        t["pages"] += 1
+        t["seconds"] = round(t["seconds"] + secs, 3)
+    if len(result["tier_seconds"]) > 1:
+        stats["escalated_pages"] = stats.get("escalated_pages", 0) + 1
+    stats["ocr_pixels"] = stats.get("ocr_pixels", 0) + result.get("ocr_pixels", 0)
+    if result.get("template"):
+        templates = stats.setdefault("templates", {})
+        templates[result["template"]] = templates.get(result["template"], 0) + 1
+
+
+def _ocr_pages_pool(file_path: str, pages: list[int], stats: dict | None = None) -> dict[int, str]:
+    """
+    OCR the given pages on the process pool. Returns {page_no: text}; a page
+    that fails or exceeds OCR_PAGE_TIMEOUT contributes "".
+    """
+    pool = _get_pool()
+    futures = [(n, pool.submit(_ocr_page_worker, file_path, n)) for n in pages]
+
+    # allow some headroom over the Tesseract limit for rasterization
+    wait_for = OCR_PAGE_TIMEOUT * 2 if OCR_PAGE_TIMEOUT > 0 else None
+
+    texts: dict[int, str] = {}
+    for page_no, fut in futures:
+        try:
+            result = fut.result(timeout=wait_for)
+            texts[page_no] = result["text"]
+            # each worker holds one page at a time, so its peak is the page's
+            _record_page(stats, result)
+        except FutureTimeout:
+            fut.cancel()
+            print(f"[OCR] page {page_no} timed out after {wait_for}s")
+            texts[page_no] = ""
+        except BrokenProcessPool as e:
+            # a worker died (e.g. OOM); drop the pool so the next call starts fresh
+            print(f"[OCR] OCR pool broken on page {page_no}: {e}")
+            _reset_pool()
+            raise
+        except Exception as e:
+            print(f"[OCR] page {page_no} failed: {e}")
+            texts[page_no] = ""
+    return texts
+
+
+def _ocr_pages_serial(file_path: str, pages: list[int], stats: dict | None = None) -> dict[int, str]:
+    """Streaming rasterize -> preprocess -> OCR, OCR_PAGE_WINDOW pages at a time."""
+    first_dpi = OCR_DPI_TIERS[0] if OCR_DPI_MODE == "adaptive" and OCR_DPI_TIERS else PDF_DPI
+    texts: dict[int, str] = {}
+    for n, img in iter_page_images(file_path, pages, stats=stats, dpi=first_dpi):
+        result = _ocr_page(file_path, n, img)
+        _record_page(stats, result)
+        texts[n] = result["text"]
+    return texts
+
+
+# ---- Routing totals (since process start) -----------------------------------
+
+_totals_lock = threading.Lock()
+_totals = {
+    "documents": 0, "pages": 0, "text_layer_pages": 0, "ocr_pages": 0,
+    "mixed_documents": 0, "ocr_seconds": 0.0, "ocr_seconds_saved": 0.0,
+    "escalated_pages": 0, "dpi_tiers": {}, "pages_skipped": 0,
+    "ocr_pixels": 0, "templates": {},
+}
+
+
+def _record_totals(stats: dict) -> None:
+    with _totals_lock:
+        _totals["documents"] += 1
+        _totals["pages"] += stats["pages"]
+        _totals["text_layer_pages"] += stats["text_layer_pages"]
+        _totals["ocr_pages"] += stats["ocr_pages"]
+        if stats["ocr_pages"] and stats["text_layer_pages"]:
+            _totals["mixed_documents"] += 1
+        _totals["ocr_seconds"] += stats["ocr_seconds"]
+        _totals["ocr_seconds_saved"] += stats["ocr_seconds_saved"] or 0.0
+        _totals["escalated_pages"] += stats["escalated_pages"]
+        _totals["pages_skipped"] += stats.get("pages_skipped", 0)
+        _totals["ocr_pixels"] += stats.get("ocr_pixels", 0)
+        for name, n in stats.get("templates", {}).items():
+            _totals["templates"][name] = _totals["templates"].get(name, 0) + n
+        for dpi, t in stats["dpi_tiers"].items():
+            tot = _totals["dpi_tiers"].setdefault(dpi, {"pages": 0, "seconds": 0.0})
+            tot["pages"] += t["pages"]
+            tot["seconds"] = round(tot["seconds"] + t["seconds"], 3)
+
+
+def ocr_stats() -> dict:
+    """Per-page routing totals across all documents handled by this process."""
+    with _totals_lock:
+        out = dict(_totals)
+        out["dpi_tiers"] = {k: dict(v) for k, v in _totals["dpi_tiers"].items()}
+        out["templates"] = dict(_totals["templates"])
+    out["ocr_seconds"] = round(out["ocr_seconds"], 3)
+    out["ocr_seconds_saved"] = round(out["ocr_seconds_saved"], 3)
+    return out
+
+
 # ---- Main API --------------------------------------------------------------
 
 def extract_text(file_path: str) -> str:
     """
-    Extract text from a PDF:
-      1) Try pdfplumber (works for text-based PDFs).
-      2) If empty, convert pages to images (via Poppler) and OCR with Tesseract.
+    Extract text from a PDF, routing each page separately:
+      1) Pages with a usable text layer (PDF engine, see backend/pdf_engines.py) use it as-is.
+      2) Pages without one are rasterized by the same engine and OCR'd with Tesseract,
+         either serially or on the process pool (see OCR_ENGINE).
+    Page texts are joined in page order.
     Returns a single string (may be "NO_TEXT_EXTRACTED" if nothing found).
     """
-    text_content = ""
+    text, _ = extract_text_with_stats(file_path)
+    return text
 
-    # 1) Try extracting with pdfplumber (fast path for selectable PDFs)
+
+def extract_text_with_stats(file_path: str) -> tuple[str, dict]:
+    """
+    Same as extract_text, plus a per-document stats dict:
+      pages, text_layer_pages, ocr_pages, routing (per page: "text" | "ocr"),
+      engine, pdf_engine ("pdfium" | "poppler"), seconds, ocr_seconds,
+      dpi_tiers ({dpi: {pages, seconds}} spent per DPI tier), escalated_pages,
+      ocr_pixels (pixels sent to Tesseract), templates ({template: pages} zonal OCR),
+      ocr_seconds_saved (estimate: mean OCR time per page x text-layer pages),
+      peak_image_bytes (largest set of page images held at once),
+      rss_peak_mb (process high-water RSS, POSIX only).
+    """
+    started = time.perf_counter()
+    stats = {
+        "pages": 0, "text_layer_pages": 0, "ocr_pages": 0, "routing": [],
+        "engine": None, "pdf_engine": None, "ocr_seconds": 0.0, "peak_image_bytes": 0,
+        "dpi_mode": OCR_DPI_MODE, "dpi_tiers": {}, "escalated_pages": 0,
+        "pages_skipped": 0, "ocr_pixels": 0, "templates": {},
+    }
+    page_texts: dict[int, str] = {}
+    thin_layer: dict[int, str] = {}  # too-short text layers, kept as OCR fallback
+    need_ocr: list[int] = []
+    page_count = 0
+
+    # 1) Text layer per page - fast path for selectable pages
     try:
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content += page_text + "\n"
+        with open_document(file_path) as doc:
+            page_count = doc.page_count
+            stats["pdf_engine"] = doc.engine
+            for page_no in range(1, page_count + 1):
+                page_text = doc.text(page_no)
+                if len(page_text.strip()) >= OCR_MIN_TEXT_CHARS:
+                    page_texts[page_no] = page_text
+                elif page_text.strip():
+                    thin_layer[page_no] = page_text
     except Exception as e:
-        print(f"[OCR] pdfplumber failed: {e}")
+        print(f"[OCR] text layer extraction failed: {e}")
 
-    # 2) Fallback OCR if no text found
-    if not text_content.strip():
-        try:
-            # convert PDF pages to images using Poppler
-            images = convert_from_path(
-                file_path,
-                dpi=PDF_DPI,
-                poppler_path=POPPLER_PATH if POPPLER_PATH else None
-            )
-
-            for img in images:
-                pre = _preprocess_for_ocr(img)
-                # NOTE: add `config="--oem 1 --psm 6"` if layout is simple paragraphs
-                text_content += pytesseract.image_to_string(pre, lang=TESS_LANG) + "\n"
+    # 2) OCR only the pages that had no usable text layer
+    try:
+        if not page_count:
+            page_count = _count_pages(file_path)
+        need_ocr = [n for n in range(1, page_count + 1) if n not in page_texts]
+        stats["ocr_pages"] = len(need_ocr)
+        if need_ocr:
+            ocr_started = time.perf_counter()
+            ocr_texts = None
+            if OCR_ENGINE == "pool":
+                try:
+                    stats["engine"] = "pool"
+                    ocr_texts = _ocr_pages_pool(file_path, need_ocr, stats)
+                except BrokenProcessPool:
+                    ocr_texts = None  # fall through to serial OCR
+            if ocr_texts is None:
+                stats["engine"] = "serial"
+                ocr_texts = _ocr_pages_serial(file_path, need_ocr, stats)
+            stats["ocr_seconds"] = round(time.perf_counter() - ocr_started, 3)
+            for n in need_ocr:
+                page_texts[n] = ocr_texts.get(n, "")
+    except Exception as e:
+        print(f"[OCR] Tesseract OCR failed: {e}")
+    for n, t in thin_layer.items():
+        if not page_texts.get(n, "").strip():
+            page_texts[n] = t
 
-        except Exception as e:
-            print(f"[OCR] Tesseract OCR failed: {e}")
+    # 3) Reassemble in page order + routing stats
+    stats["pages"] = page_count
+    stats["text_layer_pages"] = page_count - stats["ocr_pages"]
+    ocr_set = set(need_ocr)
+    stats["routing"] = ["ocr" if n in ocr_set else "text" for n in range(1, page_count + 1)]
+    text_content = "".join(page_texts[n] + "\n" for n in sorted(page_texts) if page_texts[n])
 
-    # 3) Final return
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    if stats["ocr_pages"]:
+        per_page = stats["ocr_seconds"] / stats["ocr_pages"]
+        stats["ocr_seconds_saved"] = round(per_page * stats["text_layer_pages"], 3)
+    else:
+        stats["ocr_seconds_saved"] = None  # no OCR timing to extrapolate from
+    stats["rss_peak_mb"] = _rss_peak_mb()
+    _record_totals(stats)
+    if stats["ocr_pages"]:
+        print(
+            f"[OCR] {Path(file_path).name}: {stats['ocr_pages']}/{page_count} page(s) OCR'd via "
+            f"{stats['engine']} in {stats['ocr_seconds']}s ({stats['text_layer_pages']} from text layer), "
+            f"peak image memory {stats['peak_image_bytes'] / 1e6:.1f} MB"
+        )
     text_content = (text_content or "").strip()
-    return text_content if text_content else "NO_TEXT_EXTRACTED"
+    return (text_content if text_content else "NO_TEXT_EXTRACTED"), stats
+
+
+def extract_text_incremental(
+    file_path: str,
+    page_done: Callable[[str], bool] | None = None,
+    max_pages: int = 0,
+) -> tuple[str, dict]:
+    """
+    Page-at-a-time variant of extract_text_with_stats for early exit.
+
+    Pages are routed as usual (text layer or OCR) and checked strictly in page
+    order; after each page `page_done(page_text)` is called and processing
+    stops as soon as it returns True, or after `max_pages` pages (0 = no
+    budget). With OCR_ENGINE=pool, pages are taken OCR_WORKERS at a time and
+    the scanned ones in each window are OCR'd on the process pool, so at most
+    OCR_WORKERS - 1 pages past the stopping page are OCR'd for nothing; the
+    window never crosses `max_pages`. Extra stats keys:
+      pages_processed, pages_skipped, stop_reason ("fields_complete" | "page_budget" | "end"),
+      ocr_pages_discarded (OCR'd in the last window, after the stopping page).
+    """
+    started = time.perf_counter()
+    use_pool = OCR_ENGINE == "pool"
+    window = max(1, OCR_WORKERS) if use_pool else 1
+    stats = {
+        "pages": 0, "text_layer_pages": 0, "ocr_pages": 0, "routing": [],
+        "engine": "incremental-pool" if use_pool else "incremental", "pdf_engine": None,
+        "ocr_seconds": 0.0, "peak_image_bytes": 0,
+        "dpi_mode": OCR_DPI_MODE, "dpi_tiers": {}, "escalated_pages": 0,
+        "pages_processed": 0, "pages_skipped": 0, "stop_reason": "end",
+        "ocr_pages_discarded": 0, "ocr_pixels": 0, "templates": {},
+    }
+    texts: list[str] = []
+
+    def _ocr_serial(pages: list[int]) -> dict[int, str]:
+        out: dict[int, str] = {}
+        for page_no in pages:
+            try:
+                result = _ocr_page(file_path, page_no, timeout=OCR_PAGE_TIMEOUT)
+                _record_page(stats, result)
+                out[page_no] = result["text"]
+            except Exception as e:
+                print(f"[OCR] Tesseract OCR failed on page {page_no}: {e}")
+                out[page_no] = ""
+        return out
+
+    def _ocr_window(pages: list[int]) -> dict[int, str]:
+        nonlocal use_pool
+        ocr_started = time.perf_counter()
+        out = None
+        if use_pool:
+            try:
+                out = _ocr_pages_pool(file_path, pages, stats)
+            except BrokenProcessPool:
+                use_pool = False  # serial for the rest of the document
+                stats["engine"] = "incremental"
+        if out is None:
+            out = _ocr_serial(pages)
+        stats["ocr_seconds"] = round(stats["ocr_seconds"] + time.perf_counter() - ocr_started, 3)
+        return out
+
+    def _pages():
+        # (page_no, text layer) pairs; the text layer is "" when it can't be read
+        with open_document(file_path) as doc:
+            stats["pages"] = doc.page_count
+            stats["pdf_engine"] = doc.engine
+            for page_no in range(1, doc.page_count + 1):
+                try:
+                    layer_text = doc.text(page_no)
+                except Exception as e:
+                    print(f"[OCR] text layer failed on page {page_no}: {e}")
+                    layer_text = ""
+                yield page_no, layer_text
+
+    def _windows():
+        batch: list[tuple[int, str]] = []
+        for page_no, layer_text in _pages():
+            batch.append((page_no, layer_text))
+            if len(batch) >= window or (max_pages and page_no >= max_pages):
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    try:
+        stop = False
+        for batch in _windows():
+            need_ocr = [n for n, layer_text in batch if len(layer_text.strip()) < OCR_MIN_TEXT_CHARS]
+            ocr_texts = _ocr_window(need_ocr) if need_ocr else {}
+            for page_no, layer_text in batch:
+                if page_no in ocr_texts:
+                    stats["routing"].append("ocr")
+                    stats["ocr_pages"] += 1
+                    ocr_text = ocr_texts[page_no]
+                    page_text = ocr_text if ocr_text.strip() else layer_text  # thin text layer as fallback
+                else:
+                    stats["routing"].append("text")
+                    page_text = layer_text
+                stats["pages_processed"] = page_no
+                if page_text:
+                    texts.append(page_text + "\n")
+                if page_no == stats["pages"]:
+                    stop = True
+                elif page_done is not None and page_done(page_text):
+                    stats["stop_reason"] = "fields_complete"
+                    stop = True
+                elif max_pages and page_no >= max_pages:
+                    stats["stop_reason"] = "page_budget"
+                    stop = True
+                if stop:
+                    stats["ocr_pages_discarded"] = sum(1 for n in ocr_texts if n > page_no)
+                    break
+            if stop:
+                break
+    except Exception as e:
+        print(f"[OCR] incremental extraction failed: {e}")
+
+    stats["pages_skipped"] = max(0, stats["pages"] - stats["pages_processed"])
+    stats["text_layer_pages"] = stats["pages_processed"] - stats["ocr_pages"]
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    if stats["ocr_pages"]:
+        per_page = stats["ocr_seconds"] / stats["ocr_pages"]
+        stats["ocr_seconds_saved"] = round(per_page * (stats["text_layer_pages"] + stats["pages_skipped"]), 3)
+    else:
+        stats["ocr_seconds_saved"] = None
+    stats["rss_peak_mb"] = _rss_peak_mb()
+    _record_totals({**stats, "pages": stats["pages_processed"]})
+    if stats["pages_skipped"]:
+        print(
+            f"[OCR] {Path(file_path).name}: stopped after {stats['pages_processed']}/{stats['pages']} page(s) "
+            f"({stats['stop_reason']}), {stats['pages_skipped']} skipped"
+        )
+    text_content = "".join(texts).strip()
+    return (text_content if text_content else "NO_TEXT_EXTRACTED"), stats
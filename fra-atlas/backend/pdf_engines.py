@@ -0,0 +1,169 @@
+# backend/pdf_engines.py
+"""
+PDF backends used by backend/ocr.py for the per-page text layer and for
+rasterizing scanned pages.
+
+  "pdfium"  -> pypdfium2: text and rendering in-process, pages rendered straight
+               into memory buffers (no subprocess, no temp files)
+  "poppler" -> pdfplumber for text + pdf2image (Poppler's pdftoppm) for rendering;
+               the original behavior, kept as the fallback
+
+PDF_ENGINE=auto (default) uses pdfium when pypdfium2 is installed. A document
+pdfium cannot open is retried with poppler.
+
+Both engines expose the same document interface (see PdfDocument):
+    with open_document(path) as doc:
+        doc.page_count
+        doc.text(page_no)                 # 1-based; "" when there is no text layer
+        doc.render(first, last, dpi)      # list of PIL images, pages first..last
+"""
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pdfplumber
+from pdf2image import convert_from_path, pdfinfo_from_path
+from PIL import Image
+
+try:  # optional: in-process PDFium (pip install pypdfium2)
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+
+# ---- Config ----------------------------------------------------------------
+
+PDF_ENGINE = os.getenv("PDF_ENGINE", "auto").strip().lower()
+
+# Poppler binaries for pdf2image. Unset -> pdftoppm/pdfinfo are looked up on PATH.
+# On Windows the bundled install location below is used when it exists.
+_WINDOWS_POPPLER = r"C:\poppler\poppler-25.07.0\Library\bin"
+POPPLER_PATH = os.getenv("POPPLER_PATH") or (
+    _WINDOWS_POPPLER if sys.platform == "win32" and Path(_WINDOWS_POPPLER).is_dir() else None
+)
+
+# PDFium is not thread-safe; every call into it goes through this lock.
+_pdfium_lock = threading.RLock()
+
+
+# ---- Interface -------------------------------------------------------------
+
+class PdfDocument:
+    """One open PDF. Subclasses implement page_count, text() and render()."""
+
+    engine = "base"
+    page_count = 0
+
+    def text(self, page_no: int) -> str:
+        raise NotImplementedError
+
+    def render(self, first: int, last: int, dpi: int) -> list[Image.Image]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PopplerDocument(PdfDocument):
+    """pdfplumber text layer + pdf2image rendering (pdftoppm subprocess)."""
+
+    engine = "poppler"
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._pdf = None
+        try:
+            self._pdf = pdfplumber.open(file_path)
+            self.page_count = len(self._pdf.pages)
+        except Exception as e:
+            print(f"[PDF] pdfplumber failed: {e}")
+            info = pdfinfo_from_path(file_path, poppler_path=POPPLER_PATH)
+            self.page_count = int(info.get("Pages", 0))
+
+    def text(self, page_no: int) -> str:
+        if self._pdf is None:
+            return ""
+        return self._pdf.pages[page_no - 1].extract_text() or ""
+
+    def render(self, first: int, last: int, dpi: int) -> list[Image.Image]:
+        return convert_from_path(
+            self.file_path, dpi=dpi, first_page=first, last_page=last, poppler_path=POPPLER_PATH
+        )
+
+    def close(self) -> None:
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+
+class PdfiumDocument(PdfDocument):
+    """pypdfium2 text layer + in-memory rendering."""
+
+    engine = "pdfium"
+
+    def __init__(self, file_path: str):
+        with _pdfium_lock:
+            self._pdf = pdfium.PdfDocument(file_path)
+            self.page_count = len(self._pdf)
+
+    def text(self, page_no: int) -> str:
+        with _pdfium_lock:
+            page = self._pdf[page_no - 1]
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+        # PDFium separates lines with CRLF; the NER regexes expect "\n"
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def render(self, first: int, last: int, dpi: int) -> list[Image.Image]:
+        images = []
+        with _pdfium_lock:
+            for n in range(first, last + 1):
+                page = self._pdf[n - 1]
+                try:
+                    # rev_byteorder -> RGB buffer, wrapped by PIL without a copy
+                    bitmap = page.render(scale=dpi / 72, rev_byteorder=True)
+                    images.append(bitmap.to_pil())
+                finally:
+                    page.close()
+        return images
+
+    def close(self) -> None:
+        if self._pdf is not None:
+            with _pdfium_lock:
+                self._pdf.close()
+            self._pdf = None
+
+
+ENGINES = {"poppler": PopplerDocument, "pdfium": PdfiumDocument}
+
+
+# ---- Selection -------------------------------------------------------------
+
+def engine_name(name: str | None = None) -> str:
+    """Resolve "auto" (or an unavailable engine) to the engine actually used."""
+    name = (name or PDF_ENGINE).strip().lower()
+    if name in ("auto", "pdfium"):
+        return "pdfium" if pdfium is not None else "poppler"
+    return "poppler"
+
+
+def open_document(file_path: str, engine: str | None = None) -> PdfDocument:
+    """Open `file_path` with the configured engine, falling back to poppler."""
+    name = engine_name(engine)
+    if name == "pdfium":
+        try:
+            return PdfiumDocument(file_path)
+        except Exception as e:
+            print(f"[PDF] pdfium could not open {Path(file_path).name}, using poppler: {e}")
+    return PopplerDocument(file_path)
@@ -0,0 +1,284 @@
+# backend/pipeline.py
+"""
+Document pipeline shared by the upload / parse / commit endpoints:
+file -> OCR (backend.ocr) -> NER (backend.ner), backed by the extraction cache.
+
+Async endpoints must go through `run_document_pipeline`, which runs the work on
+a dedicated, bounded thread pool so OCR/NER never blocks the event loop.
+"""
+import os
+import re
+import json
+import asyncio
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from backend import extraction_cache
+from backend.gazetteer import gazetteer_version
+from backend.village_index import correct_village
+from backend.ocr import extract_text_with_stats, extract_text_incremental, settings_fingerprint
+from backend.ner import (
+    extract_entities,
+    extract_entities_batch,
+    labeled_fields_in,
+    model_version,
+    REQUIRED_FIELDS,
+    NER_FAST_PATH,
+    NER_FAST_PATH_FIELDS,
+    NER_GAZETTEER,
+)
+
+# Bump when OCR/NER post-processing changes in a way that should invalidate
+# previously cached extractions.
+EXTRACTION_VERSION = 2
+
+# Documents processed concurrently, and how many more may wait for a slot.
+# Requests beyond workers + queue are rejected with PipelineBusy (HTTP 503).
+DOC_PIPELINE_WORKERS = max(1, int(os.getenv("DOC_PIPELINE_WORKERS", "2")))
+DOC_PIPELINE_MAX_QUEUE = max(0, int(os.getenv("DOC_PIPELINE_MAX_QUEUE", "8")))
+
+# Early exit: OCR page by page and stop once every NER_REQUIRED_FIELDS label
+# has matched (backend.ner.FIELD_PATTERNS), or after OCR_PAGE_BUDGET pages
+# (0 = no budget). Later pages are never rasterized or OCR'd. With
+# OCR_ENGINE=pool the pages go through the pool OCR_WORKERS at a time, so up
+# to OCR_WORKERS - 1 pages past the stopping page may still be OCR'd.
+OCR_EARLY_EXIT = os.getenv("OCR_EARLY_EXIT", "0") == "1"
+OCR_PAGE_BUDGET = max(0, int(os.getenv("OCR_PAGE_BUDGET", "0")))
+
+
+def extraction_settings() -> Dict[str, Any]:
+    out = {
+        **settings_fingerprint(),
+        "ner_model": model_version(),
+        "extraction_version": EXTRACTION_VERSION,
+    }
+    if OCR_EARLY_EXIT or OCR_PAGE_BUDGET:
+        # a truncated extraction must not be served for a full one (or vice versa)
+        out["early_exit"] = {"fields": sorted(REQUIRED_FIELDS) if OCR_EARLY_EXIT else [],
+                             "page_budget": OCR_PAGE_BUDGET}
+    if NER_FAST_PATH:
+        # fast-path entities lack spaCy candidates, so keep them apart in the cache
+        out["ner_fast_path"] = sorted(NER_FAST_PATH_FIELDS)
+    if NER_GAZETTEER:
+        # entities depend on the known names, which grow with every import
+        out["ner_gazetteer"] = gazetteer_version()
+    return out
+
+
+def _extract_text(file_path: str) -> tuple[str, Dict[str, Any]]:
+    """Full extraction, or the incremental early-exit mode when enabled."""
+    if not (OCR_EARLY_EXIT or OCR_PAGE_BUDGET):
+        return extract_text_with_stats(file_path)
+
+    found: set = set()
+    required = set(REQUIRED_FIELDS)
+
+    def page_done(page_text: str) -> bool:
+        if not OCR_EARLY_EXIT or not required:
+            return False
+        found.update(labeled_fields_in(page_text))
+        return required <= found
+
+    return extract_text_incremental(file_path, page_done, max_pages=OCR_PAGE_BUDGET)
+
+
+def process_document(file_path: str) -> Dict[str, Any]:
+    """
+    Run OCR + NER for one document, reusing a cached result when the same
+    bytes were already processed with the same settings.
+    Returns {"text", "entities", "sha256", "cache": "hit" | "miss", "ocr_stats",
+    "pages_skipped"} ("ocr_stats" and "pages_skipped" are None on a cache hit).
+    """
+    file_hash = extraction_cache.file_sha256(file_path)
+    key = extraction_cache.make_key(file_hash, extraction_settings())
+
+    cached = extraction_cache.get(key)
+    if cached is not None:
+        return {**cached, "sha256": file_hash, "cache": "hit", "ocr_stats": None, "pages_skipped": None}
+
+    text, ocr_stats = _extract_text(file_path)
+    entities = extract_entities(text)
+    extraction_cache.put(key, file_hash, text, entities)
+    return {
+        "text": text, "entities": entities, "sha256": file_hash, "cache": "miss",
+        "ocr_stats": ocr_stats, "pages_skipped": ocr_stats.get("pages_skipped", 0),
+    }
+
+
+def process_documents(file_paths: List[str]) -> List[Dict[str, Any]]:
+    """
+    Batch form of process_document: OCR each uncached file, then run NER for
+    all of them in one extract_entities_batch call. Returns one result per
+    path, in order; a file that fails gets {"error": str} instead of raising.
+    """
+    settings = extraction_settings()
+    results: List[Dict[str, Any]] = []
+    pending = []  # (index, key, text)
+    for file_path in file_paths:
+        try:
+            file_hash = extraction_cache.file_sha256(file_path)
+            key = extraction_cache.make_key(file_hash, settings)
+            cached = extraction_cache.get(key)
+            if cached is not None:
+                results.append({**cached, "sha256": file_hash, "cache": "hit", "ocr_stats": None,
+                                "pages_skipped": None})
+                continue
+            text, ocr_stats = _extract_text(file_path)
+        except Exception as e:
+            results.append({"error": str(e)})
+            continue
+        results.append({"text": text, "sha256": file_hash, "cache": "miss", "ocr_stats": ocr_stats,
+                        "pages_skipped": ocr_stats.get("pages_skipped", 0)})
+        pending.append((len(results) - 1, key, text))
+
+    if pending:
+        entities_list = extract_entities_batch([text for _, _, text in pending])
+        for (i, key, text), entities in zip(pending, entities_list):
+            results[i]["entities"] = entities
+            extraction_cache.put(key, results[i]["sha256"], text, entities)
+    return results
+
+
+# ---- NER -> claim payload mapping (shared by upload-fra and job workers) ----
+
+def _first(x):
+    return (x or [None])[0] if isinstance(x, list) else x
+
+
+def _clean_line(s: str | None) -> str | None:
+    if not s:
+        return None
+    # keep only the first line and trim any leaked trailing labels
+    s = s.splitlines()[0].strip()
+    s = re.sub(r'\s*(?:state|district|village|patta\s*holder)\s*$', '', s, flags=re.I)
+    return ' '.join(s.split())
+
+
+def _title_if_name(s: str | None) -> str | None:
+    if not s:
+        return None
+    # avoid title-casing codes like IFR-123/2020
+    return s if re.search(r'[0-9\-\/]', s) else s.title()
+
+
+def _normalize_names(payload: dict) -> dict:
+    # expand these maps as you see more variants
+    state_map = {
+        "mp": "Madhya Pradesh",
+        "madhya pradesh": "Madhya Pradesh",
+    }
+    district_map = {
+        "sehore": "Sehore",
+    }
+    st = (payload.get("state") or "").strip().lower()
+    di = (payload.get("district") or "").strip().lower()
+
+    payload["state"] = state_map.get(st, payload.get("state"))
+    payload["district"] = district_map.get(di, payload.get("district"))
+
+    if payload.get("village"):
+        payload["village"] = _title_if_name(payload["village"].strip())
+    if payload.get("patta_holder"):
+        payload["patta_holder"] = _title_if_name(payload["patta_holder"].strip())
+    if payload.get("status"):
+        payload["status"] = _title_if_name(payload["status"].strip())
+    return payload
+
+
+def build_upload_payload(entities: Dict[str, Any], officer_id: Any) -> Dict[str, Any]:
+    """Map NER output to an insert_claim payload assigned to `officer_id`."""
+    payload = {
+        "state": _clean_line(entities.get("state")) or "Unknown",
+        "district": _clean_line(entities.get("district")) or "Unknown",
+        "block": None,
+        "village": _clean_line(_first(entities.get("villages"))),
+        "patta_holder": _clean_line(_first(entities.get("patta_holders"))),
+        "address": None,
+        "land_area": _clean_line(entities.get("land_area")),
+        "status": "Pending",
+        "lat": entities.get("lat"),
+        "lon": entities.get("lon"),
+        "source": "ocr",
+        "raw_ocr": json.dumps(entities),
+
+        # 🔐 CRITICAL PART
+        "assigned_officer_id": officer_id,
+        "assigned_date": datetime.date.today().isoformat(),
+    }
+    payload = _normalize_names(payload)
+    payload["village"] = correct_village(payload["state"], payload["district"], payload["village"])
+    return payload
+
+
+# ---- Bounded executor for async endpoints ----------------------------------
+
+class PipelineBusy(Exception):
+    """Raised when the document pipeline queue is full."""
+
+
+_executor = ThreadPoolExecutor(max_workers=DOC_PIPELINE_WORKERS, thread_name_prefix="doc-pipeline")
+_state_lock = threading.Lock()
+_state = {"queued": 0, "in_flight": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+
+def _run_tracked(fn, *args):
+    with _state_lock:
+        _state["queued"] -= 1
+        _state["in_flight"] += 1
+    try:
+        result = fn(*args)
+    except Exception:
+        with _state_lock:
+            _state["failed"] += 1
+        raise
+    else:
+        with _state_lock:
+            _state["completed"] += 1
+        return result
+    finally:
+        with _state_lock:
+            _state["in_flight"] -= 1
+
+
+async def run_in_pipeline(fn, *args):
+    """Await fn(*args) on the document pipeline executor (raises PipelineBusy when full)."""
+    with _state_lock:
+        if _state["queued"] + _state["in_flight"] >= DOC_PIPELINE_WORKERS + DOC_PIPELINE_MAX_QUEUE:
+            _state["rejected"] += 1
+            raise PipelineBusy(
+                f"document pipeline busy ({_state['in_flight']} running, {_state['queued']} queued)"
+            )
+        _state["queued"] += 1
+    try:
+        fut = _executor.submit(_run_tracked, fn, *args)
+    except RuntimeError:
+        # executor already shut down; undo the reservation
+        _release_queued()
+        raise
+    # a job cancelled before it started never reaches _run_tracked
+    fut.add_done_callback(lambda f: _release_queued() if f.cancelled() else None)
+    return await asyncio.wrap_future(fut)
+
+
+def _release_queued() -> None:
+    with _state_lock:
+        _state["queued"] -= 1
+
+
+async def run_document_pipeline(file_path: str) -> Dict[str, Any]:
+    """Async wrapper around process_document for request handlers."""
+    return await run_in_pipeline(process_document, file_path)
+
+
+def pipeline_stats() -> Dict[str, Any]:
+    with _state_lock:
+        out = dict(_state)
+    out["workers"] = DOC_PIPELINE_WORKERS
+    out["max_queue"] = DOC_PIPELINE_MAX_QUEUE
+    return out
+
+
+def shutdown_pipeline() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -3,11 +3,11 @@ from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel, EmailStr, constr
 from datetime import datetime, timedelta
 import os
-import sqlite3
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from typing import Optional
 from starlette.concurrency import run_in_threadpool
+from backend.sqlite_pool import connection
 from fastapi.security import HTTPBearer
 security = HTTPBearer()
 
@@ -19,7 +19,6 @@ router = APIRouter()
 JWT_SECRET = os.getenv("JWT_SECRET", "change_this_in_prod")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "120"))
-DATABASE_FILE = os.getenv("DATABASE_FILE", "backend/fra_atlas.db")
 
 # Robust password hashing/verification:
 # - verify existing raw bcrypt hashes ($2b$…)
@@ -45,22 +44,13 @@ class LoginIn(BaseModel):
 # -----------------------------
 # DB helpers
 # -----------------------------
-def get_db_conn():
-    conn = sqlite3.connect(DATABASE_FILE, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
-
 async def get_user_by_username(username: str):
     def _q():
-        conn = get_db_conn()
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT id, username, hashed_password, full_name, role FROM officers WHERE username = ?",
-            (username,),
-        )
-        row = cur.fetchone()
-        conn.close()
-        return row
+        with connection() as conn:
+            return conn.execute(
+                "SELECT id, username, hashed_password, full_name, role FROM officers WHERE username = ?",
+                (username,),
+            ).fetchone()
     row = await run_in_threadpool(_q)
     return row
 
@@ -15,29 +15,32 @@ from fastapi.responses import StreamingResponse
 from typing import Optional, Dict, Any, Tuple, List
 from pydantic import BaseModel
 from backend import db
-import sqlite3
+from backend.sqlite_pool import connection
 from starlette.concurrency import run_in_threadpool
-import pathlib
 import logging
 from sqlalchemy import text
+from sqlalchemy.exc import DataError, IntegrityError
 import asyncio
 import json
-from urllib.parse import urlencode
-from urllib.request import urlopen, Request as UrlRequest
 import io
 import pandas as pd
 from sqlalchemy.ext.asyncio import AsyncSession
-from backend.ocr import extract_text
-from backend.ner import extract_entities
+from backend.pipeline import run_document_pipeline, PipelineBusy
+from backend import gazetteer
+from backend import village_index
+from backend import spreadsheet
+from backend import import_journal
+from backend import villages
 from backend.db import get_db  # used as Depends(get_db) in some endpoints
 from pathlib import Path as PPath
 import uuid
+import time
+import hashlib
 import traceback
 import os
 
 # ✅ NEW (add these)
-from sqlalchemy import text as sa_text
-from backend.db import insert_claim
+from backend.db import insert_claim, get_claims_by_ids
 from backend.routes.auth import get_current_user
 import datetime 
 
@@ -91,30 +94,13 @@ async def _geocode_village_backend(state: str, district: str, village: str) -> O
     Geocode on the server using Nominatim with a polite delay.
     Uses stdlib urllib in a thread so we don't add dependencies.
     """
-    query = f"{village}, {district}, {state}, India"
-    url = "https://nominatim.openstreetmap.org/search?" + urlencode({"format": "json", "q": query})
-    headers = {
-        "User-Agent": "fra-atlas/1.0 (contact: you@example.com)"
-    }
-
-    def _do_req_sync() -> Optional[Tuple[float, float]]:
-        try:
-            req = UrlRequest(url, headers=headers)
-            with urlopen(req, timeout=10) as resp:
-                data = resp.read()
-            arr = json.loads(data.decode("utf-8"))
-            if not arr:
-                return None
-            lat = float(arr[0].get("lat"))
-            lon = float(arr[0].get("lon"))
-            return (lat, lon)
-        except Exception as e:
-            logger.warning("Geocoding failed for %s | %s", query, e)
-            return None
-
     # Nominatim polite rate limit
-    await asyncio.sleep(1.1)
-    return await run_in_threadpool(_do_req_sync)
+    await asyncio.sleep(villages.GEOCODE_DELAY_SECONDS)
+    try:
+        return await run_in_threadpool(villages.geocode, state, district, village)
+    except Exception as e:
+        logger.warning("Geocoding failed for %s, %s, %s | %s", village, district, state, e)
+        return None
 
 
 async def _upsert_village(
@@ -137,6 +123,8 @@ async def _upsert_village(
     state, district, village = _normalize_triplet(state, district, village)
     if not (state and district and village):
         return
+    # snap OCR misreads ("Chhoti Barl") to the known village before looking it up
+    village = village_index.correct_village(state, district, village)
 
     try:
         async with db.engine.begin() as conn:
@@ -190,6 +178,8 @@ async def _upsert_village(
                 ),
                 {"state": state, "district": district, "village": village, "lat": ins_lat, "lon": ins_lon},
             )
+        gazetteer.add_village(state, district, village)
+        village_index.add_village(state, district, village)
     except Exception as e:
         logger.warning("upsert_village failed for %s/%s/%s: %s", state, district, village, e)
 
@@ -262,24 +252,18 @@ async def get_my_assigned_claims(request: Request):
     user = await get_current_user(request)
     officer_id = user["id"]
 
-    db_path = _get_default_db_path()
-
     # 2️⃣ Fetch assigned claims
     def _fetch():
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT *
-            FROM claims
-            WHERE assigned_officer_id = ?
-            ORDER BY last_status_update DESC
-            """,
-            (officer_id,)
-        )
-        rows = cur.fetchall()
-        conn.close()
+        with connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT *
+                FROM claims
+                WHERE assigned_officer_id = ?
+                ORDER BY last_status_update DESC
+                """,
+                (officer_id,)
+            ).fetchall()
         return [dict(r) for r in rows]
 
     try:
@@ -308,39 +292,40 @@ class ClaimUpdate(BaseModel):
     lat: Optional[float] = None
     lon: Optional[float] = None
     date: Optional[str] = None
+    # optimistic concurrency, opt-in: the claim version the client edited; 409 if
+    # it changed since. Requests without it are applied unconditionally
+    # (last write wins), so clients that care about lost updates must send it.
+    version: Optional[int] = None
 
 
-async def _sqlite_get_claim_by_id(db_path: str, claim_id: int) -> Optional[Dict[str, Any]]:
+async def _sqlite_get_claim_by_id(claim_id: int) -> Optional[Dict[str, Any]]:
     def _fn():
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM claims WHERE id = ?", (claim_id,))
-        row = cur.fetchone()
-        conn.close()
+        with connection() as conn:
+            row = conn.execute("SELECT * FROM claims WHERE id = ?", (claim_id,)).fetchone()
         return dict(row) if row else None
     return await run_in_threadpool(_fn)
 
 
-async def _sqlite_update_claim(db_path: str, claim_id: int, updates: Dict[str, Any]) -> None:
+async def _sqlite_update_claim(
+    claim_id: int, updates: Dict[str, Any], expected_version: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    One UPDATE ... RETURNING *, bumping `version`. Returns the updated row, or
+    None when no row matched (missing id, or version != expected_version).
+    """
     def _fn():
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        if updates:
-            sets = ", ".join([f"{k} = ?" for k in updates.keys()])
-            params = list(updates.values()) + [claim_id]
-            cur.execute(f"UPDATE claims SET {sets} WHERE id = ?", params)
-            conn.commit()
-        conn.close()
+        sets = ", ".join([f"{k} = ?" for k in updates.keys()])
+        sql = f"UPDATE claims SET {sets}, version = version + 1 WHERE id = ?"
+        params = list(updates.values()) + [claim_id]
+        if expected_version is not None:
+            sql += " AND version = ?"
+            params.append(expected_version)
+        with connection() as conn:
+            rows = conn.execute(sql + " RETURNING *", params).fetchall()
+        return dict(rows[0]) if rows else None
     return await run_in_threadpool(_fn)
 
 
-def _get_default_db_path() -> str:
-    base = pathlib.Path(__file__).resolve().parents[1]
-    candidate = base / "fra_atlas.db"
-    return str(candidate)
-
-
 @router.put("/claims/{claim_id}", tags=["claims"])
 @router.put("/api/claims/{claim_id}", tags=["claims"])
 async def update_claim(
@@ -351,8 +336,12 @@ async def update_claim(
     """
     Update a claim by id. Accepts only the fields defined in ClaimUpdate.
     Also ensures the (state,district,village) exists in `villages` (with coords if available).
+
+    Conflict detection is opt-in: send the `version` of the claim being edited
+    (every claim row has one) and a concurrent change since then is rejected
+    with 409 and the current version. Without `version` the update is applied
+    as is, last write wins.
     """
-    db_path = _get_default_db_path()
     logger.info("update_claim called id=%s payload=%s", claim_id, payload.dict(exclude_unset=True))
 
     # -------------------------
@@ -361,16 +350,6 @@ async def update_claim(
     user = await get_current_user(request)
     officer_id = user["id"]
 
-    # fetch existing
-    try:
-        existing = await _sqlite_get_claim_by_id(db_path, claim_id)
-    except Exception:
-        logger.exception("failed to read claim before update id=%s", claim_id)
-        raise HTTPException(status_code=500, detail="Failed to read claim before update")
-
-    if not existing:
-        raise HTTPException(status_code=404, detail="Claim not found")
-
     # allowed columns
     updates = {k: v for k, v in payload.dict(exclude_unset=True).items() if k in {
         "state", "district", "block", "village", "patta_holder",
@@ -378,6 +357,9 @@ async def update_claim(
     }}
 
     if not updates:
+        existing = await _sqlite_get_claim_by_id(claim_id)
+        if not existing:
+            raise HTTPException(status_code=404, detail="Claim not found")
         return existing
 
     # -------------------------
@@ -391,22 +373,22 @@ async def update_claim(
     if payload.status and payload.status.lower() == "granted":
         updates["closed_date"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
-    # perform update
+    # perform update (no read-before-update: RETURNING gives the new row, the
+    # version check in the WHERE clause replaces the read for conflict detection)
     try:
-        await _sqlite_update_claim(db_path, claim_id, updates)
+        updated = await _sqlite_update_claim(claim_id, updates, payload.version)
     except Exception:
         logger.exception("failed to update claim id=%s updates=%s", claim_id, updates)
         raise HTTPException(status_code=500, detail="Failed to update claim")
 
-    # read back updated
-    try:
-        updated = await _sqlite_get_claim_by_id(db_path, claim_id)
-    except Exception:
-        logger.exception("failed to fetch updated claim id=%s", claim_id)
-        raise HTTPException(status_code=500, detail="Failed to fetch updated claim")
-
     if not updated:
-        raise HTTPException(status_code=500, detail="Claim updated but could not be retrieved")
+        current = await _sqlite_get_claim_by_id(claim_id)
+        if not current:
+            raise HTTPException(status_code=404, detail="Claim not found")
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Claim was modified by someone else", "version": current.get("version")},
+        )
 
     # ✅ ensure village exists/updated after claim update
     try:
@@ -581,20 +563,182 @@ async def export_claims_csv():
 # Excel/CSV import endpoint
 # -------------------------
 
-# --- helper to pick first matching column name ---
+IMPORT_PAYLOAD_FIELDS = ["state", "district", "village", "patta_holder", "land_area", "status", "date", "lat", "lon"]
+# streaming imports keep at most this many row errors for the final summary
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
+
+def _sheet_payloads(df: pd.DataFrame, officer_id, assigned_date: str):
+    """(payloads, 1-based row numbers, row errors) for a sheet or a chunk of one."""
+    # map expected fields to actual columns once, then normalize column-wise
+    frame, row_errors = spreadsheet.normalize_frame(df, spreadsheet.map_columns(df.columns))
+    valid = row_errors.eq("")
+    errors = [{"row": int(i) + 1, "error": msg} for i, msg in row_errors[~valid].items()]
+    payloads = spreadsheet.to_records(
+        frame.loc[valid, IMPORT_PAYLOAD_FIELDS],
+        address=None,
+        source="excel",
+        raw_ocr=None,
+        assigned_officer_id=officer_id,
+        assigned_date=assigned_date,
+    )
+    return payloads, [int(i) + 1 for i in frame.index[valid]], errors
+
 
-def pick_column(cols, *alts):
-    alt_l = [a.lower() for a in alts]
-    for c in cols:
-        if c and c.lower().strip() in alt_l:
-            return c
-    return None
+async def _upsert_imported_villages(run: Dict[str, Any]) -> None:
+    """
+    Upsert the distinct villages of the run's committed claims that the import
+    journal still holds as pending, in one batch (backend/villages.py), then
+    clear them. Errors propagate (the run fails, and resuming replays them).
+    Villages without plausible claim coordinates are queued for geocoding, not geocoded here.
+    """
+    claims = await import_journal.pending_villages(run["id"])
+    if not claims:
+        return
+    items: Dict[Tuple[str, str, str], Tuple[Optional[float], Optional[float]]] = {}
+    seen: Dict[Tuple[Any, Any, Any], Optional[Tuple[str, str, str]]] = {}
+    for claim in claims:
+        raw = (claim.get("state"), claim.get("district"), claim.get("village"))
+        if raw not in seen:
+            state, district, village = _normalize_triplet(*raw)
+            if state and district and village:
+                # snap OCR misreads ("Chhoti Barl") to the known village, once per distinct name
+                seen[raw] = (state, district, village_index.correct_village(state, district, village))
+            else:
+                seen[raw] = None
+        key = seen[raw]
+        if key is None:
+            continue
+        lat, lon = claim.get("lat"), claim.get("lon")
+        if items.get(key, (None, None))[0] is None and _coords_plausible(lat, lon):
+            items[key] = (float(lat), float(lon))
+        else:
+            items.setdefault(key, (None, None))
+    if items:
+        result = await run_in_threadpool(villages.upsert_villages, items)
+        logger.info("import %s village upsert: %s", run["id"], result)
+    await import_journal.clear_villages(run["id"], max(c["rowid"] for c in claims))
+
+
+async def _import_sheet_chunk(run: Dict[str, Any], df: pd.DataFrame, officer_id, assigned_date: str):
+    """
+    Normalize one chunk (df indexed by 0-based data row), insert it and
+    checkpoint the run past its last row in one transaction; returns (ids, errors).
+    """
+    payloads, row_numbers, errors = _sheet_payloads(df, officer_id, assigned_date)
+    next_row = int(df.index[-1]) + 1
+    result = await import_journal.commit_chunk(
+        run["id"], run["next_row"], next_row, payloads, row_numbers, errors, villages=True
+    )
+    run["next_row"] = next_row
+    await _upsert_imported_villages(run)
+    return result["ids"], result["errors"]
+
+
+async def _start_import(kind: str, file_hash: str, filename: Optional[str], officer_id,
+                        restart: bool) -> Dict[str, Any]:
+    """import_journal.start_run, with content that was already fully imported as a 409."""
+    try:
+        return await import_journal.start_run(kind, file_hash, filename, officer_id, restart=restart)
+    except import_journal.AlreadyImported as e:
+        raise HTTPException(status_code=409, detail={
+            "message": f"This content was already imported (import {e.run['id']}); "
+                       "pass restart=true to import it again",
+            "import_id": e.run["id"],
+            "status": e.run["status"],
+        })
+
+
+def _import_failed(run: Dict[str, Any], e: Exception) -> HTTPException:
+    detail = {"message": f"Import stopped: {e}", "import_id": run["id"], "next_row": run["next_row"]}
+    if isinstance(e, import_journal.ImportConflict):
+        return HTTPException(status_code=409, detail=detail)
+    return HTTPException(status_code=500, detail=detail)
+
+
+async def _spool_upload(file: UploadFile, suffix: str) -> Tuple[PPath, str]:
+    """Copy the upload to TEMP_UPLOAD_DIR in 1 MB blocks (never whole in memory); returns (path, sha256)."""
+    tmp_path = TEMP_UPLOAD_DIR / f"{uuid.uuid4().hex}{suffix}"
+    digest = hashlib.sha256()
+    with open(tmp_path, "wb") as out:
+        while True:
+            block = await file.read(1 << 20)
+            if not block:
+                break
+            digest.update(block)
+            out.write(block)
+    return tmp_path, digest.hexdigest()
+
+
+async def _stream_import(tmp_path: PPath, run: Dict[str, Any], officer_id):
+    """
+    NDJSON progress for a streaming import: one {"event": "progress"} line per
+    committed chunk, then {"event": "done"} (or {"event": "error"}; chunks
+    already reported stay committed and a retry resumes after them). A client
+    disconnect marks the run failed the same way.
+    """
+    started = time.perf_counter()
+    assigned_date = datetime.datetime.utcnow().isoformat()
+    resumed_from = run["next_row"]
+    chunks = spreadsheet.iter_chunks(str(tmp_path), start_row=resumed_from)
+    totals = {"import_id": run["id"], "resumed_from": resumed_from, "chunks": 0, "rows": 0, "count": 0, "rejected": 0}
+    errors: List[Dict[str, Any]] = []
+    try:
+        # villages a previous attempt committed claims for but never upserted
+        await _upsert_imported_villages(run)
+        while True:
+            df = await run_in_threadpool(next, chunks, None)
+            if df is None:
+                break
+            ids, chunk_errors = await _import_sheet_chunk(run, df, officer_id, assigned_date)
+
+            totals["chunks"] += 1
+            totals["rows"] += len(df)
+            totals["count"] += len(ids)
+            totals["rejected"] += len(chunk_errors)
+            errors.extend(chunk_errors[:max(0, IMPORT_MAX_ERRORS - len(errors))])
+            yield json.dumps({
+                "event": "progress", **totals,
+                "next_row": run["next_row"],
+                "elapsed": round(time.perf_counter() - started, 2),
+            }) + "\n"
+
+        await import_journal.finish_run(run["id"])
+        elapsed = time.perf_counter() - started
+        logger.info("streamed %s (import %s): %d/%d rows in %d chunks from row %d, %.1fs",
+                    tmp_path.name, run["id"], totals["count"], totals["rows"], totals["chunks"],
+                    resumed_from, elapsed)
+        yield json.dumps({
+            "event": "done", "success": True, **totals,
+            "errors": sorted(errors, key=lambda e: e["row"]),
+            "errors_truncated": totals["rejected"] > len(errors),
+            "elapsed": round(elapsed, 2),
+        }) + "\n"
+    except Exception as e:
+        logger.exception("streaming import of %s failed: %s", tmp_path.name, e)
+        if not isinstance(e, import_journal.ImportConflict):
+            await import_journal.finish_run(run["id"], error=str(e))
+        yield json.dumps({"event": "error", "detail": str(e), "next_row": run["next_row"], **totals}) + "\n"
+    except (GeneratorExit, asyncio.CancelledError):
+        # client went away mid-stream: don't leave the run 'running' until a re-upload.
+        # shielded, since the cancellation may be redelivered at the next await
+        logger.warning("streaming import %s: client disconnected at row %s", run["id"], run["next_row"])
+        try:
+            await asyncio.shield(import_journal.finish_run(run["id"], error="client disconnected"))
+        except asyncio.CancelledError:
+            pass
+        raise
+    finally:
+        chunks.close()
+        tmp_path.unlink(missing_ok=True)
 
 
 @router.post("/claims/import-excel", tags=["claims"])
 async def import_excel(
     request: Request,                 # ✅ ADD THIS
     file: UploadFile = File(...),
+    stream: bool = Query(False, description="spool to disk, import in committed chunks, stream NDJSON progress"),
+    restart: bool = Query(False, description="start a new import even if this file was imported before"),
     db_session = Depends(db.get_db)
 ):
     """
@@ -602,14 +746,36 @@ async def import_excel(
     Expected-ish columns (case-insensitive):
       state, district, village, patta_holder, ifr_number, land_area, status, date, lat, lon
     Missing columns are allowed; rows with no village will still be created with village=null.
+
+    Rows are committed IMPORT_CHUNK_ROWS at a time and checkpointed in the import
+    journal (backend/import_journal.py): uploading the same file again after a failed
+    import resumes after the last committed chunk instead of duplicating claims; a file
+    that was imported completely is refused with 409 (?restart=true imports it afresh).
+
+    ?stream=true is for very large .csv/.xlsx files: the upload is spooled to disk and
+    read one chunk at a time, and the response is NDJSON progress lines ending in a
+    summary (no claims echoed back).
     """
     name = (file.filename or "").lower()
+
+    if stream:
+        # ✅ identify logged-in officer before the response starts
+        user = await get_current_user(request)
+        suffix = PPath(name).suffix
+        if suffix not in (".csv", ".xlsx", ".xlsm"):
+            raise HTTPException(status_code=400, detail="Streaming import reads .csv and .xlsx files")
+        tmp_path, file_hash = await _spool_upload(file, suffix)
+        try:
+            run = await _start_import("excel", file_hash, file.filename, user["id"], restart)
+        except HTTPException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return StreamingResponse(_stream_import(tmp_path, run, user["id"]), media_type="application/x-ndjson")
+
     content = await file.read()
     try:
-        if name.endswith(".csv"):
-            df = pd.read_csv(io.BytesIO(content))
-        else:
-            df = pd.read_excel(io.BytesIO(content))
+        # same row index as the streaming reader, so either mode can resume the other's run
+        df = spreadsheet.read_frame(io.BytesIO(content), PPath(name).suffix)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Could not read spreadsheet: {e}")
 
@@ -620,85 +786,125 @@ async def import_excel(
     user = await get_current_user(request)
     officer_id = user["id"]
 
-
-    # normalize column names to original header list (keep original case to access rows)
-    cols = list(df.columns)
-    cols_l = [c.lower().strip() for c in cols]
-
-    # map expected fields to actual columns (choose first matching)
-    col_map = {
-        "state": pick_column(cols, "state", "st", "province"),
-        "district": pick_column(cols, "district", "dist"),
-        "village": pick_column(cols, "village", "village_name", "gram"),
-        "patta_holder": pick_column(cols, "patta_holder", "pattaholder", "name", "claimant"),
-        "ifr_number": pick_column(cols, "ifr_number", "ifrno", "claim_id"),
-        "land_area": pick_column(cols, "land_area", "area", "hectares", "ha"),
-        "status": pick_column(cols, "status", "claim_status"),
-        "date": pick_column(cols, "date", "claim_date", "application_date"),
-        "lat": pick_column(cols, "lat", "latitude"),
-        "lon": pick_column(cols, "lon", "lng", "longitude"),
+    run = await _start_import("excel", hashlib.sha256(content).hexdigest(), file.filename, officer_id, restart)
+    resumed_from = run["next_row"]
+    assigned_date = datetime.datetime.utcnow().isoformat()
+    ids: List[int] = []
+    errors: List[Dict[str, Any]] = []
+    try:
+        # villages a previous attempt committed claims for but never upserted
+        await _upsert_imported_villages(run)
+        todo = df[df.index >= resumed_from]  # index == data row position, as the journal's offsets
+        for start in range(0, len(todo), spreadsheet.IMPORT_CHUNK_ROWS):
+            # one executemany + one commit per chunk
+            chunk_ids, chunk_errors = await _import_sheet_chunk(
+                run, todo.iloc[start:start + spreadsheet.IMPORT_CHUNK_ROWS], officer_id, assigned_date
+            )
+            ids.extend(chunk_ids)
+            errors.extend(chunk_errors)
+    except Exception as e:
+        logger.exception("import-excel %s failed at row %s: %s", run["id"], run["next_row"], e)
+        if not isinstance(e, import_journal.ImportConflict):
+            await import_journal.finish_run(run["id"], error=str(e))
+        raise _import_failed(run, e)
+    await import_journal.finish_run(run["id"])
+
+    errors.sort(key=lambda e: e["row"])
+    created = await db.get_claims_by_ids(ids)
+
+    return {"success": True, "count": len(created), "claims": created, "errors": errors,
+            "import_id": run["id"], "resumed_from": resumed_from}
+
+
+def _json_payload(r: Dict[str, Any], officer_id, now_iso: str) -> Dict[str, Any]:
+    # normalize keys (allow variants)
+    state = r.get("state") or r.get("State") or "Unknown"
+    district = r.get("district") or r.get("District") or "Unknown"
+    village = r.get("village") or r.get("Village") or None
+    patta_holder = r.get("patta_holder") or r.get("Patta Holder") or r.get("patta holder") or None
+    land_area = r.get("land_area") or r.get("area") or r.get("Land Area") or None
+    status = (r.get("status") or "Pending")
+    date = r.get("date") or None
+
+    lat = r.get("lat")
+    lon = r.get("lon")
+    try:
+        lat_val = float(lat) if lat not in (None, "", "nan") else None
+    except Exception:
+        lat_val = None
+    try:
+        lon_val = float(lon) if lon not in (None, "", "nan") else None
+    except Exception:
+        lon_val = None
+
+    payload = {
+        "state": state,
+        "district": district,
+        "village": village,
+        "patta_holder": patta_holder,
+        "land_area": land_area,
+        "status": status if status in ("Pending", "Granted") else "Pending",
+        "date": date,
+        "lat": lat_val,
+        "lon": lon_val,
+        "source": "import-json",
+        "raw_ocr": json.dumps({"source": "import-json", "row": r}),
+
+        # ✅ OFFICER ACCOUNTABILITY FIELDS (FIX)
+        "assigned_officer_id": officer_id,
+        "assigned_date": now_iso,
+        "last_status_update": now_iso,
     }
 
-    created: List[Dict[str, Any]] = []
-    errors = []
+    if payload["status"] == "Granted":
+      payload["closed_date"] = now_iso
+    return payload
 
-    for i, row in df.iterrows():
-        try:
-            def getcell(key):
-                c = col_map.get(key)
-                return None if c is None or pd.isna(row.get(c)) else row.get(c)
-
-            payload = {
-                "state": str(getcell("state")).strip() if getcell("state") is not None else None,
-                "district": str(getcell("district")).strip() if getcell("district") is not None else None,
-                "village": str(getcell("village")).strip() if getcell("village") is not None else None,
-                "patta_holder": str(getcell("patta_holder")).strip() if getcell("patta_holder") is not None else None,
-                "address": None,
-                "land_area": str(getcell("land_area")).strip() if getcell("land_area") is not None else None,
-                "status": str(getcell("status")).strip() if getcell("status") is not None else None,
-                "date": str(getcell("date")).strip() if getcell("date") is not None else None,
-                "lat": float(getcell("lat")) if getcell("lat") is not None else None,
-                "lon": float(getcell("lon")) if getcell("lon") is not None else None,
-                "source": "excel",
-                "raw_ocr": None,
-
-                "assigned_officer_id": officer_id,
-                "assigned_date": datetime.datetime.utcnow().isoformat(),
-
-            }
-
-            # Insert claim using existing db helper
-            created_claim = await db.insert_claim(payload)
-            created.append(created_claim)
-
-            # Optionally upsert village immediately (recommended) — keep this if you want villages table populated from imports
-            try:
-                await _upsert_village(
-                    state=payload.get("state"),
-                    district=payload.get("district"),
-                    village=payload.get("village"),
-                    claimed_lat=payload.get("lat"),
-                    claimed_lon=payload.get("lon"),
-                )
-            except Exception as e:
-                logger.warning("upsert village after import row %s failed: %s", i + 1, e)
 
-        except Exception as e:
-            errors.append({"row": int(i) + 1, "error": str(e)})
+# errors caused by a row's data (constraint / type violations): the row is
+# rejected and the import goes on. Anything else (e.g. "database is locked")
+# stops the run as failed, so a retry resumes at the row it stopped on.
+_ROW_DATA_ERRORS = (IntegrityError, DataError)
 
-    return {"success": True, "count": len(created), "claims": created, "errors": errors}
+
+async def _commit_json_rows_singly(run: Dict[str, Any], start: int, end: int, payloads, row_numbers, errors):
+    """After a chunk hit a data error: commit rows start..end-1 one per transaction so one bad row can't sink the rest."""
+    by_row = dict(zip(row_numbers, payloads))
+    errors_by_row = {e["row"]: e for e in errors}
+    ids: List[int] = []
+    out_errors: List[Dict[str, Any]] = []
+    for pos in range(start, end):
+        row_no = pos + 1
+        try:
+            if row_no in by_row:
+                result = await import_journal.commit_chunk(run["id"], pos, row_no, [by_row[row_no]], [row_no], [])
+            else:
+                result = await import_journal.commit_chunk(run["id"], pos, row_no, [], [], [errors_by_row[row_no]])
+        except _ROW_DATA_ERRORS as e_insert:
+            # journal the row as rejected so the import can move past it
+            failed = {"row": row_no, "error": f"insert failed: {str(e_insert)}", "trace": traceback.format_exc()}
+            result = await import_journal.commit_chunk(run["id"], pos, row_no, [], [], [failed])
+        run["next_row"] = row_no
+        ids.extend(result["ids"])
+        out_errors.extend(result["errors"])
+    return ids, out_errors
 
 
 @router.post("/claims/import-json", tags=["claims"])
 async def import_json_verbose(
     body: dict = Body(...),
-    db: AsyncSession = Depends(get_db),
+    restart: bool = Query(False, description="start a new import even if these rows were imported before"),
     current_user: dict = Depends(get_current_user)
 
 ):
     """
-    Robust import-json: shows per-row errors and falls back to direct SQL insert if insert_claim fails.
-    Returns: { success, count, errors, claims }
+    Robust import-json: rows go in IMPORT_CHUNK_ROWS at a time with one bulk insert
+    (one transaction) per chunk, checkpointed in the import journal so re-posting the
+    same rows after a failure resumes instead of duplicating (rows imported completely
+    before get a 409; ?restart=true imports them again). Shows per-row errors and falls back to
+    one row per transaction if a chunk hits a data (integrity) error; other database
+    errors stop the import, to be resumed by posting the rows again.
+    Returns: { success, count, errors, claims, import_id, resumed_from }
     """
 
     # ✅ identify logged-in officer ONCE
@@ -709,151 +915,70 @@ async def import_json_verbose(
     if not rows or not isinstance(rows, list):
         raise HTTPException(status_code=400, detail="Missing 'rows' array")
 
-    created = []
+    run = await _start_import("json", import_journal.hash_rows(rows), None, officer_id, restart)
+    resumed_from = run["next_row"]
+    ids: List[int] = []
     errors = []
-
-    for i, r in enumerate(rows):
-        try:
-            # normalize keys (allow variants)
-            state = r.get("state") or r.get("State") or "Unknown"
-            district = r.get("district") or r.get("District") or "Unknown"
-            village = r.get("village") or r.get("Village") or None
-            patta_holder = r.get("patta_holder") or r.get("Patta Holder") or r.get("patta holder") or None
-            land_area = r.get("land_area") or r.get("area") or r.get("Land Area") or None
-            status = (r.get("status") or "Pending")
-            date = r.get("date") or None
-
-            lat = r.get("lat")
-            lon = r.get("lon")
-            try:
-                lat_val = float(lat) if lat not in (None, "", "nan") else None
-            except Exception:
-                lat_val = None
-            try:
-                lon_val = float(lon) if lon not in (None, "", "nan") else None
-            except Exception:
-                lon_val = None
-
-            payload = {
-                "state": state,
-                "district": district,
-                "village": village,
-                "patta_holder": patta_holder,
-                "land_area": land_area,
-                "status": status if status in ("Pending", "Granted") else "Pending",
-                "date": date,
-                "lat": lat_val,
-                "lon": lon_val,
-                "source": "import-json",
-                "raw_ocr": json.dumps({"source": "import-json", "row": r}),
-
-                # ✅ OFFICER ACCOUNTABILITY FIELDS (FIX)
-                "assigned_officer_id": officer_id,
-                "assigned_date": now_iso,
-                "last_status_update": now_iso,
-            }
-
-            if payload["status"] == "Granted":
-              payload["closed_date"] = now_iso
-
-
-            # --- Try helper insert first ---
-            try:
-                created_claim = await insert_claim(payload)
-                if created_claim:
-                    created.append(created_claim)
-                    continue
-            except Exception as e_insert:
-                errors.append({
-                    "row": i + 1,
-                    "error": f"insert_claim failed: {str(e_insert)}",
-                    "trace": traceback.format_exc()
-                })
-
-            # --- Fallback direct SQL insert (WITH officer fields) ---
+    try:
+        for start in range(resumed_from, len(rows), spreadsheet.IMPORT_CHUNK_ROWS):
+            end = min(start + spreadsheet.IMPORT_CHUNK_ROWS, len(rows))
+            payloads: List[Dict[str, Any]] = []
+            row_numbers: List[int] = []
+            chunk_errors = []
+            for i in range(start, end):
+                try:
+                    payloads.append(_json_payload(rows[i], officer_id, now_iso))
+                    row_numbers.append(i + 1)
+                except Exception as outer:
+                    chunk_errors.append({
+                        "row": i + 1,
+                        "error": str(outer),
+                        "trace": traceback.format_exc()
+                    })
+
+            # --- One bulk insert + checkpoint per chunk ---
             try:
-                async with db.begin():
-                    q = sa_text("""
-    INSERT INTO claims (
-     state, district, block, village,
-     patta_holder, address, land_area, status, date,
-     lat, lon, source, raw_ocr,
-     assigned_officer_id, assigned_date, last_status_update,
-     closed_date,
-     created_at
-     )
-    VALUES (
-        :state, :district, NULL, :village,
-        :patta_holder, NULL, :land_area, :status, :date,
-        :lat, :lon, :source, :raw_ocr,
-        :assigned_officer_id, :assigned_date, :last_status_update,
-        :closed_date,
-        datetime('now')
-    )
-""")
-                    params = {
-                        "state": payload["state"],
-                        "district": payload["district"],
-                        "village": payload["village"],
-                        "patta_holder": payload["patta_holder"],
-                        "land_area": payload["land_area"],
-                        "status": payload["status"],
-                        "date": payload["date"],
-                        "lat": payload["lat"],
-                        "lon": payload["lon"],
-                        "source": payload["source"],
-                        "raw_ocr": payload["raw_ocr"],
-                        "assigned_officer_id": officer_id,
-                        "assigned_date": now_iso,
-                        "last_status_update": now_iso,
-                        "closed_date": payload.get("closed_date"),
-                    }
-
-                    await db.execute(q, params)
-
-                    # fetch last inserted row
-                    res = await db.execute(sa_text("SELECT last_insert_rowid() AS id"))
-                    row = res.fetchone()
-                    new_id = row[0] if row else None
-
-                    if new_id:
-                        res2 = await db.execute(sa_text(
-                            """
-                            SELECT id,state,district,block,village,patta_holder,address,
-                                   land_area,status,date,lat,lon,source,raw_ocr,
-                                   assigned_officer_id,assigned_date,last_status_update,
-                                   created_at
-                            FROM claims WHERE id=:id
-                            """
-                        ), {"id": new_id})
-                        new_row = res2.fetchone()
-                        if new_row:
-                            try:
-                                created.append(dict(new_row))
-                            except Exception:
-                                created.append({"id": new_id})
-
-            except Exception as e_sql:
-                errors.append({
-                    "row": i + 1,
-                    "error": f"direct insert failed: {str(e_sql)}",
-                    "trace": traceback.format_exc()
-                })
-
-        except Exception as outer:
-            errors.append({
-                "row": i + 1,
-                "error": str(outer),
-                "trace": traceback.format_exc()
-            })
+                result = await import_journal.commit_chunk(run["id"], start, end, payloads, row_numbers, chunk_errors)
+                run["next_row"] = end
+                chunk_ids, chunk_errors = result["ids"], result["errors"]
+            except _ROW_DATA_ERRORS as e_bulk:
+                # chunk rolled back: retry row by row
+                logger.warning("import-json %s chunk at row %d failed, retrying per row: %s", run["id"], start, e_bulk)
+                chunk_ids, chunk_errors = await _commit_json_rows_singly(
+                    run, start, end, payloads, row_numbers, chunk_errors
+                )
+            ids.extend(chunk_ids)
+            errors.extend(chunk_errors)
+    except Exception as e:
+        logger.exception("import-json %s failed at row %s: %s", run["id"], run["next_row"], e)
+        if not isinstance(e, import_journal.ImportConflict):
+            await import_journal.finish_run(run["id"], error=str(e))
+        raise _import_failed(run, e)
+    await import_journal.finish_run(run["id"])
+    errors.sort(key=lambda e: e["row"])
+    created = await get_claims_by_ids(ids)
 
     return {
         "success": True,
         "count": len(created),
         "errors": errors,
-        "claims": created
+        "claims": created,
+        "import_id": run["id"],
+        "resumed_from": resumed_from,
     }
 
+
+@router.get("/claims/imports/{import_id}", tags=["claims"])
+async def get_import(import_id: int = Path(..., ge=1), current_user: dict = Depends(get_current_user)):
+    """
+    Journal of an import-excel/import-json run: status, next_row (rows committed), counts and rejected rows.
+    Only the officer who ran the import (or an admin) can read it.
+    """
+    run = await import_journal.get_run(import_id)
+    if run is None or (current_user.get("role") != "admin" and run["officer_id"] != current_user["id"]):
+        raise HTTPException(status_code=404, detail="Import not found")
+    return run
+
 # -------------------------
 # Parse Excel (preview-only) endpoint (added)
 # -------------------------
@@ -877,33 +1002,12 @@ async def parse_excel(file: UploadFile = File(...)):
         else:
             df = pd.read_excel(tmp_path, engine="openpyxl")
 
-        # Normalize expected columns (lowercase keys)
+        # Normalize expected columns (same header mapping as import-excel), "" for missing cells
         expected = ["state","district","village","patta_holder","land_area","status","date","lat","lon"]
-        rows = []
-        errors = []
-        for idx, r in df.fillna("").iterrows():
-            try:
-                row = {}
-                for col in expected:
-                    # best-effort mapping: try exact first, then lower-case matching
-                    if col in df.columns:
-                        val = r[col]
-                    else:
-                        # try to find by lower-case column
-                        matched = None
-                        for cc in df.columns:
-                            if cc.strip().lower() == col:
-                                matched = cc; break
-                            if cc.strip().lower().replace(" ","_") == col:
-                                matched = cc; break
-                        val = r[matched] if matched else ""
-                    # final cast to string / numeric
-                    if pd.isna(val):
-                        val = ""
-                    row[col] = val
-                rows.append(row)
-            except Exception as e:
-                errors.append({"row": int(idx), "error": str(e)})
+        frame, row_errors = spreadsheet.normalize_frame(df, spreadsheet.map_columns(df.columns))
+        preview = frame[expected].astype(object)
+        rows = preview.where(preview.notna(), "").to_dict("records")
+        errors = [{"row": int(idx), "error": msg} for idx, msg in row_errors[row_errors.ne("")].items()]
         return {"filename": tmp_name, "rows": rows, "errors": errors}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -928,10 +1032,17 @@ async def parse_fra(file: UploadFile = File(...)):
         with open(tmp_path, "wb") as f:
             f.write(await file.read())
 
-        text = extract_text(str(tmp_path))
-        entities = extract_entities(text)
+        extracted = await run_document_pipeline(str(tmp_path))
+        text, entities = extracted["text"], extracted["entities"]
 
-        return {"filename": tmp_name, "extracted_text": text, "entities": entities}
+        return {
+            "filename": tmp_name,
+            "extracted_text": text,
+            "entities": entities,
+            "pages_skipped": extracted["pages_skipped"],
+        }
+    except PipelineBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "10"})
     except Exception as e:
         logger.exception("parse_fra failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -979,7 +1090,8 @@ async def commit_parsed(
     Client calls this after user reviews/edits fields and confirms. It will:
       - open uploads/temp/<tmp_filename>, extract text/entities (again or use provided edits),
       - create claim and return the created claim.
-    NOTE: For simplicity this function re-runs extract_text/ner; you can adapt it to accept edited JSON from client instead)
+    NOTE: OCR/NER results are served from the extraction cache populated by parse-fra, so nothing is re-run
+    for an unchanged file; you can adapt it to accept edited JSON from client instead)
     """
     try:
         tmp_path = TEMP_UPLOAD_DIR / tmp_filename
@@ -990,9 +1102,9 @@ async def commit_parsed(
         user = await get_current_user(request)
         officer_id = user["id"]
 
-        # run OCR+NER again (or you could accept edited JSON from client instead)
-        text = extract_text(str(tmp_path))
-        entities = extract_entities(text)
+        # OCR+NER (cache hit when parse-fra already processed this file)
+        extracted = await run_document_pipeline(str(tmp_path))
+        text, entities = extracted["text"], extracted["entities"]
 
         # map fields conservatively (mirrors earlier mapping intent)
         state = _clean_line(entities.get("state") or _first(entities.get("states")))
@@ -1026,6 +1138,9 @@ async def commit_parsed(
         }
 
         claim_payload = _normalize_names(claim_payload)
+        claim_payload["village"] = village_index.correct_village(
+            claim_payload.get("state"), claim_payload.get("district"), claim_payload.get("village")
+        )
 
         # Use your existing db helper to insert
         created = await db.insert_claim(claim_payload)
@@ -1051,6 +1166,8 @@ async def commit_parsed(
         return {"claim": created}
     except HTTPException:
         raise
+    except PipelineBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "10"})
     except Exception as e:
         logger.exception("commit_parsed failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
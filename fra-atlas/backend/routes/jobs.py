@@ -0,0 +1,50 @@
+# backend/routes/jobs.py
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import HTTPBearer
+from starlette.concurrency import run_in_threadpool
+
+from backend import jobs
+from backend.routes.auth import get_current_user
+
+router = APIRouter(tags=["jobs"])
+bearer_scheme = HTTPBearer()
+
+# internal bookkeeping that stays server-side (spool paths, worker ids)
+_PRIVATE_JOB_FIELDS = ("file_path", "lease_owner", "lease_expires_at")
+
+
+def _public_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """The job without server paths/worker ids, and only the message line of its error (no traceback)."""
+    out = {k: v for k, v in job.items() if k not in _PRIVATE_JOB_FIELDS}
+    if out.get("error"):
+        out["error"] = out["error"].strip().splitlines()[0]
+    return out
+
+
+def _visible_to(job: Dict[str, Any], user: Dict[str, Any]) -> bool:
+    """Officers see their own jobs; admins see all."""
+    return user.get("role") == "admin" or job.get("officer_id") == user.get("id")
+
+
+@router.get("/jobs/{job_id}", dependencies=[Depends(bearer_scheme)])
+async def get_job_status(job_id: int, current_user=Depends(get_current_user)):
+    """
+    Status of an ingestion job queued via /api/upload-fra?async=true.
+    status: queued | running | done | failed; stage shows progress within a run.
+    """
+    job = await run_in_threadpool(jobs.get_job, job_id)
+    if not job or not _visible_to(job, current_user):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _public_job(job)
+
+
+@router.get("/jobs/batch/{batch_id}", dependencies=[Depends(bearer_scheme)])
+async def get_batch_status(batch_id: str, current_user=Depends(get_current_user)):
+    """Per-status counts, overall progress and the jobs of a batch upload."""
+    batch = await run_in_threadpool(jobs.get_batch, batch_id)
+    if not batch["total"] or not all(_visible_to(j, current_user) for j in batch["jobs"]):
+        raise HTTPException(status_code=404, detail="Batch not found")
+    batch["jobs"] = [_public_job(j) for j in batch["jobs"]]
+    return batch
@@ -7,8 +7,7 @@ from backend.utils.password import hash_password
 from fastapi import Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 security = HTTPBearer()
-import sqlite3
-from backend.db import get_db_path
+from backend.sqlite_pool import connection
 
 class OfficerCreate(BaseModel):
     username: EmailStr
@@ -34,68 +33,49 @@ async def create_officer(
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    import sqlite3
-    from backend.db import get_db_path
-
-    db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-
     hashed_pwd = hash_password(payload.password)
 
-    cur.execute("""
-        INSERT INTO officers (
-            username,
-            hashed_password,
-            full_name,
-            age,
-            gender,
-            district,
-            role,
-            is_active
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, 1)
-    """, (
-        payload.username,
-        hashed_pwd,
-        payload.full_name,
-        payload.age,
-        payload.gender,
-        payload.district,
-        payload.role
-    ))
-
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        conn.execute("""
+            INSERT INTO officers (
+                username,
+                hashed_password,
+                full_name,
+                age,
+                gender,
+                district,
+                role,
+                is_active
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+        """, (
+            payload.username,
+            hashed_pwd,
+            payload.full_name,
+            payload.age,
+            payload.gender,
+            payload.district,
+            payload.role
+        ))
 
     return {"message": "Officer created successfully"}
 
 @router.get("/officers")
 def list_officers():
-    import sqlite3
-    from backend.db import get_db_path  # or use your db helper
-
-    db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-
-    cur.execute("""
-        SELECT
-            id,
-            username,
-            full_name,
-            age,
-            gender,
-            district,
-            is_active,
-            role,
-            created_at
-        FROM officers
-    """)
-
-    rows = cur.fetchall()
-    conn.close()
+    with connection() as conn:
+        rows = conn.execute("""
+            SELECT
+                id,
+                username,
+                full_name,
+                age,
+                gender,
+                district,
+                is_active,
+                role,
+                created_at
+            FROM officers
+        """).fetchall()
 
     officers = [dict(r) for r in rows]
     return officers
@@ -155,23 +135,14 @@ def officer_case_breakdown(officer_id: int):
 
 @router.get("/officers/{officer_id}/timeline")
 def officer_timeline(officer_id: int):
-    import sqlite3
-    from backend.db import DATABASE_URL
-
-    db_path = DATABASE_URL.split("///")[-1]
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-
-    cur.execute("""
-        SELECT DATE(assigned_date) as day, COUNT(*)
-        FROM claims
-        WHERE assigned_officer_id = ?
-        GROUP BY day
-        ORDER BY day
-    """, (officer_id,))
-
-    rows = cur.fetchall()
-    conn.close()
+    with connection() as conn:
+        rows = conn.execute("""
+            SELECT DATE(assigned_date) as day, COUNT(*)
+            FROM claims
+            WHERE assigned_officer_id = ?
+            GROUP BY day
+            ORDER BY day
+        """, (officer_id,)).fetchall()
 
     return [{"date": r[0], "count": r[1]} for r in rows]
 
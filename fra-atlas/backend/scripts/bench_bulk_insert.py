@@ -0,0 +1,100 @@
+# backend/scripts/bench_bulk_insert.py
+"""
+Benchmark: row-by-row db.insert_claim (one transaction per claim, the old import
+path) vs db.insert_claims_bulk (one executemany in one transaction), on a
+throwaway SQLite database so the real fra_atlas.db is never touched.
+
+The per-row path is timed on a sample (--per-row-sample) and extrapolated,
+since 100k single-row commits take minutes.
+
+Run from the fra-atlas directory:
+    python -m backend.scripts.bench_bulk_insert
+    python -m backend.scripts.bench_bulk_insert --sizes 10000 100000 --per-row-sample 5000
+"""
+import os
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+STATES = {"Madhya Pradesh": ["Sehore", "Betul", "Mandla"], "Odisha": ["Koraput", "Mayurbhanj"],
+          "Telangana": ["Adilabad", "Warangal"], "Tripura": ["Dhalai", "Gomati"]}
+
+
+def synthetic_rows(rng: random.Random, n: int, bad_every: int = 0) -> list:
+    rows = []
+    for i in range(n):
+        state = rng.choice(list(STATES))
+        rows.append({
+            "state": state,
+            "district": rng.choice(STATES[state]),
+            "village": f"Village {rng.randint(1, 400)}",
+            "patta_holder": f"Holder {i}",
+            "land_area": f"{rng.uniform(0.1, 5):.2f}",
+            "status": rng.choice(["Pending", "Granted"]),
+            "date": "2021-03-15",
+            "lat": round(rng.uniform(18, 26), 5),
+            "lon": "not-a-number" if bad_every and i % bad_every == 0 else round(rng.uniform(76, 92), 5),
+            "source": "bench",
+            "assigned_officer_id": 1,
+            "assigned_date": "2021-03-15T00:00:00",
+        })
+    return rows
+
+
+async def _prepare(db) -> None:
+    from sqlalchemy import text
+
+    await db.init_claims_table()
+    async with db.engine.begin() as conn:
+        # officer columns live in the deployed DB, not in init_claims_table
+        for col in ("assigned_officer_id INTEGER", "assigned_date TEXT", "closed_date TEXT", "last_status_update TEXT"):
+            try:
+                await conn.execute(text(f"ALTER TABLE claims ADD COLUMN {col}"))
+            except Exception:
+                pass
+
+
+async def _run(args) -> None:
+    from backend import db  # after DATABASE_URL points at the temp file
+    db.engine.echo = False
+    await _prepare(db)
+    rng = random.Random(args.seed)
+
+    sample = synthetic_rows(rng, args.per_row_sample)
+    started = time.perf_counter()
+    for row in sample:
+        await db.insert_claim(row)
+    per_row = (time.perf_counter() - started) / len(sample)
+    print(f"insert_claim       {per_row * 1e6:>8.1f} us/row  ({len(sample)} rows sampled)")
+
+    for n in args.sizes:
+        rows = synthetic_rows(rng, n, bad_every=args.bad_every)
+        started = time.perf_counter()
+        result = await db.insert_claims_bulk(rows)
+        elapsed = time.perf_counter() - started
+        print(f"insert_claims_bulk {elapsed / n * 1e6:>8.1f} us/row  {n} rows in {elapsed:.2f}s "
+              f"({len(result['ids'])} inserted, {len(result['errors'])} rejected); "
+              f"row-by-row would take ~{per_row * n:.1f}s, speedup {per_row * n / elapsed:.1f}x")
+
+    await db.engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--per-row-sample", type=int, default=2000, help="rows timed through insert_claim")
+    parser.add_argument("--bad-every", type=int, default=1000, help="every Nth row has an invalid lon (0 = none)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path.as_posix()}"
+        asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
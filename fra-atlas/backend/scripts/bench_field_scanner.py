@@ -0,0 +1,92 @@
+# backend/scripts/bench_field_scanner.py
+"""
+Micro-benchmark: the single-pass field scanner (backend.ner.scan_fields) vs the
+previous per-field regex searches, on long synthetic multi-page OCR texts.
+Also checks that both return the same fields for every text.
+
+Run from the fra-atlas directory:
+    python -m backend.scripts.bench_field_scanner
+    python -m backend.scripts.bench_field_scanner --pages 200 --docs 50
+"""
+import random
+import timeit
+import argparse
+
+from backend.ner import (
+    P_STATE, P_DISTRICT, P_VILLAGE, P_PATTA, P_IFR, P_AREA, P_STATUS, P_DATE_LBL,
+    _clean_val, scan_fields,
+)
+
+FORM_LINES = [
+    "State: Madhya Pradesh", "District: Sehore", "Village: Rampur", "Patta Holder: Ram Singh",
+    "IFR Number: IFR-12345", "Area: 10 acres", "Claim Status: Granted", "Date: 01-Jan-2020",
+    "Vill. - Chhoti Bari", "Claimant: Sita Devi", "Claim ID 98765", "Land Area: 1.25 ha",
+    "Status:", "Approved", "  name : Gond Community", "Submitted on: 15 Mar 2021",
+]
+# labels inside the previous village value (which may start on a later line)
+EDGE_CASES = [
+    "Vill.:\t\n  vill. - Rampur",
+    "Village:\nVillage: Rampur\nVill. - Bari",
+    "Vill. :\n  \n  vill.\t-area vill.",
+]
+NOISE_WORDS = (
+    "the of forest rights act claim document community resource verified gram sabha "
+    "survey number boundary notes attached statement areas dated statewide names "
+    "ifrs districts village-level 2020 12/05/2019 23.1984, 77.0951"
+).split()
+
+
+def legacy_fields(text: str) -> dict:
+    """The per-field .search() chain extract_entities used before scan_fields."""
+    return {
+        "state": _clean_val((P_STATE.search(text) or (None,))[1] if P_STATE.search(text) else None),
+        "district": _clean_val((P_DISTRICT.search(text) or (None,))[1] if P_DISTRICT.search(text) else None),
+        "villages": [_clean_val(m.group(1)) for m in P_VILLAGE.finditer(text)],
+        "patta_holder": _clean_val((P_PATTA.search(text) or (None,))[1] if P_PATTA.search(text) else None),
+        "ifr_number": _clean_val((P_IFR.search(text) or (None,))[1] if P_IFR.search(text) else None),
+        "land_area": _clean_val((P_AREA.search(text) or (None,))[1] if P_AREA.search(text) else None),
+        "status": _clean_val((P_STATUS.search(text) or (None,))[1] if P_STATUS.search(text) else None),
+        "date_label": _clean_val((P_DATE_LBL.search(text) or (None,))[1] if P_DATE_LBL.search(text) else None),
+    }
+
+
+def synthetic_text(rng: random.Random, pages: int, lines_per_page: int = 45) -> str:
+    """OCR-like text: mostly noise lines, a few labeled lines, some fields missing."""
+    form = rng.sample(FORM_LINES, rng.randint(0, len(FORM_LINES)))
+    out = []
+    for _ in range(pages * lines_per_page):
+        if form and rng.random() < 0.02:
+            out.append(form.pop())
+        else:
+            out.append(" ".join(rng.choice(NOISE_WORDS) for _ in range(rng.randint(3, 12))))
+    out.extend(form)
+    return "\n".join(out)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=50, help="pages of OCR text per document")
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [synthetic_text(rng, args.pages) for _ in range(args.docs)]
+
+    mismatches = sum(1 for t in texts + EDGE_CASES if legacy_fields(t) != scan_fields(t))
+    kb = sum(len(t) for t in texts) / len(texts) / 1024
+
+    timings = {}
+    for name, fn in (("legacy", legacy_fields), ("scanner", scan_fields)):
+        best = min(timeit.repeat(lambda: [fn(t) for t in texts], number=1, repeat=args.repeat))
+        timings[name] = best / len(texts)
+
+    print(f"{args.docs} docs x {args.pages} pages (~{kb:.0f} KB each), best of {args.repeat}")
+    for name, secs in timings.items():
+        print(f"{name:<8} {secs * 1000:>8.2f} ms/doc")
+    print(f"speedup {timings['legacy'] / timings['scanner']:.2f}x, documents with differing fields: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# backend/scripts/bench_gazetteer.py
+"""
+Gazetteer (backend/gazetteer.py) cost vs the number of known names: automaton
+build time, full-text scan time, and the cost of adding villages one at a
+time (delta automaton) on synthetic village names. Scan time should stay flat
+as the gazetteer grows.
+
+Run from the fra-atlas directory:
+    python -m backend.scripts.bench_gazetteer
+    python -m backend.scripts.bench_gazetteer --sizes 1000,10000,50000 --text-kb 64
+"""
+import random
+import string
+import time
+import argparse
+
+from backend import gazetteer
+
+
+def _name(rng: random.Random) -> str:
+    words = rng.randint(1, 3)
+    return " ".join("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9))) for _ in range(words))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,50000", help="village counts to build")
+    parser.add_argument("--text-kb", type=int, default=32, help="size of the scanned text")
+    parser.add_argument("--adds", type=int, default=200, help="villages added after the build")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'villages':>9} {'nodes':>9} {'build s':>8} {'scan ms':>8} {'matches':>8} {'add+scan ms':>12}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        rng = random.Random(args.seed)
+        names = [_name(rng) for _ in range(size)]
+        text = []
+        while sum(len(w) + 1 for w in text) < args.text_kb * 1024:
+            text.append(rng.choice(names) if rng.random() < 0.01 else _name(rng))
+        text = " ".join(text)
+
+        g = gazetteer.Gazetteer()
+        started = time.perf_counter()
+        for i, name in enumerate(names):
+            g._add_record("State", f"District {i % 50}", name)
+        g._rebuild_main()
+        g._loaded = True
+        build = time.perf_counter() - started
+
+        started = time.perf_counter()
+        matches = g.find(text)
+        scan = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(args.adds):
+            g.add_village("State", "District 0", _name(rng))
+            g.find("short text")
+        add = (time.perf_counter() - started) / args.adds
+        print(f"{size:>9} {g.stats()['nodes']:>9} {build:>8.2f} {scan * 1000:>8.1f} {len(matches):>8} {add * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# backend/scripts/bench_ner_load.py
+"""
+spaCy cost in backend.ner: import time of backend.ner and of spaCy, model
+load time, and per-document extract_entities latency, for the full pipeline vs
+the trimmed one (SPACY_COMPONENTS). Each configuration runs in a fresh
+interpreter so load times are cold. Before lazy loading, importing backend.ner
+paid spacy ms + full load ms.
+
+Run from the fra-atlas directory:
+    python -m backend.scripts.bench_ner_load
+    python -m backend.scripts.bench_ner_load --text-file some_ocr_output.txt --repeat 200
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+SAMPLE_TEXT = """Forest Rights Act (FRA) Claim Document
+Village: Rampur
+District: Sehore
+State: Madhya Pradesh
+Patta Holder: Ram Singh
+IFR Number: IFR-12345
+Area: 10 acres
+Claim Status: Granted
+Community Rights (CR) Involved: Yes
+Community Forest Resource (CFR) Area: 5 hectares
+Additional Notes:
+- Verified on 01-Jan-2020
+- Supporting documents attached
+"""
+
+_CHILD = r"""
+import json, sys, time
+started = time.perf_counter()
+from backend import ner
+imported = time.perf_counter()
+import spacy
+spacy_imported = time.perf_counter()
+nlp = ner.get_nlp()
+loaded = time.perf_counter()
+text, repeat = sys.argv[1], int(sys.argv[2])
+ner.extract_entities(text)  # warm-up
+t0 = time.perf_counter()
+for _ in range(repeat):
+    ner.extract_entities(text)
+per_doc = (time.perf_counter() - t0) / repeat
+print(json.dumps({
+    "pipes": nlp.pipe_names,
+    "import_ms": (imported - started) * 1000,
+    "spacy_import_ms": (spacy_imported - imported) * 1000,
+    "load_ms": (loaded - spacy_imported) * 1000,
+    "per_doc_ms": per_doc * 1000,
+}))
+"""
+
+
+def _run(components: str, text: str, repeat: int) -> dict:
+    env = {**os.environ, "SPACY_COMPONENTS": components}
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, text, str(repeat)],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--text-file", help="OCR text to parse (default: a mock FRA form)")
+    parser.add_argument("--repeat", type=int, default=100, help="extract_entities calls to average")
+    args = parser.parse_args()
+
+    text = open(args.text_file, encoding="utf-8").read() if args.text_file else SAMPLE_TEXT
+
+    from backend.ner import _model_meta
+    all_pipes = ",".join(_model_meta().get("pipeline", []))
+    configs = {"full": all_pipes, "trimmed": os.getenv("SPACY_COMPONENTS", "ner")}
+
+    results = {name: _run(components, text, args.repeat) for name, components in configs.items()}
+    print(f"{'pipeline':<9} {'import ms':>10} {'spacy ms':>9} {'load ms':>9} {'ms/doc':>8}  components")
+    for name, r in results.items():
+        print(f"{name:<9} {r['import_ms']:>10.1f} {r['spacy_import_ms']:>9.1f} {r['load_ms']:>9.1f} "
+              f"{r['per_doc_ms']:>8.2f}  {','.join(r['pipes'])}")
+    full, trimmed = results["full"], results["trimmed"]
+    print(f"trimmed: load {full['load_ms'] / trimmed['load_ms']:.2f}x faster, "
+          f"per document {full['per_doc_ms'] / trimmed['per_doc_ms']:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# backend/scripts/bench_ocr_backends.py
+"""
+Per-page OCR latency: pytesseract (subprocess per page) vs tesserocr
+(persistent in-process API), on the same preprocessed page images.
+Also checks that both backends produce the same text.
+
+Run from the fra-atlas directory:
+    python -m backend.scripts.bench_ocr_backends
+    python -m backend.scripts.bench_ocr_backends backend/mock_data/FRA_Rampur.pdf --repeat 3
+"""
+import glob
+import time
+import argparse
+import statistics
+
+from backend import ocr
+
+
+def _norm(s: str) -> str:
+    return " ".join((s or "").split())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdfs", nargs="*", default=sorted(glob.glob("backend/mock_data/*.pdf")))
+    parser.add_argument("--repeat", type=int, default=3, help="OCR passes per page and backend")
+    args = parser.parse_args()
+
+    if ocr.tesserocr is None:
+        print("tesserocr is not installed (pip install tesserocr); only pytesseract will be timed")
+
+    backends = {"pytesseract": ocr._pytesseract_text}
+    if ocr.tesserocr is not None:
+        backends["tesserocr"] = ocr._tesserocr_text
+        ocr._tess_api()  # one-time init, excluded from per-page numbers
+
+    timings = {name: [] for name in backends}
+    mismatches = 0
+    pages = 0
+
+    for pdf in args.pdfs:
+        n_pages = ocr._count_pages(pdf)
+        for page_no, img in ocr.iter_page_images(pdf, list(range(1, n_pages + 1))):
+            pre = ocr._preprocess_for_ocr(img)
+            outputs = {}
+            for name, fn in backends.items():
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    outputs[name] = fn(pre)
+                    timings[name].append(time.perf_counter() - started)
+            pages += 1
+            if len({_norm(t) for t in outputs.values()}) > 1:
+                mismatches += 1
+                print(f"  text differs: {pdf} page {page_no}")
+
+    print(f"\n{pages} page(s) from {len(args.pdfs)} PDF(s) at {ocr.PDF_DPI} DPI, {args.repeat} pass(es) each")
+    print(f"{'backend':<12} {'mean ms/page':>13} {'median':>9} {'min':>9}")
+    for name, ts in timings.items():
+        if ts:
+            print(f"{name:<12} {statistics.mean(ts) * 1000:>13.1f} "
+                  f"{statistics.median(ts) * 1000:>9.1f} {min(ts) * 1000:>9.1f}")
+    if len(backends) > 1:
+        speedup = statistics.mean(timings["pytesseract"]) / statistics.mean(timings["tesserocr"])
+        print(f"tesserocr speedup: {speedup:.2f}x, pages with differing text: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
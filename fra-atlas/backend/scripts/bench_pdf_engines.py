@@ -0,0 +1,86 @@
+# backend/scripts/bench_pdf_engines.py
+"""
+Compare the PDF engines in backend/pdf_engines.py: time to open + read the
+text layer of every page, and time to render every page at PDF_DPI.
+Also reports how closely the text layers of the engines agree.
+
+Run from the fra-atlas directory:
+    python -m backend.scripts.bench_pdf_engines
+    python -m backend.scripts.bench_pdf_engines backend/mock_data/FRA_Rampur.pdf --dpi 200 --repeat 5
+"""
+import glob
+import time
+import argparse
+import difflib
+import statistics
+
+from backend import pdf_engines
+from backend.ocr import PDF_DPI
+
+
+def _norm(s: str) -> str:
+    return " ".join((s or "").split())
+
+
+def _time_text(engine: str, pdf: str) -> tuple[float, list[str]]:
+    started = time.perf_counter()
+    with pdf_engines.ENGINES[engine](pdf) as doc:
+        texts = [doc.text(n) for n in range(1, doc.page_count + 1)]
+    return time.perf_counter() - started, texts
+
+
+def _time_render(engine: str, pdf: str, dpi: int) -> tuple[float, int]:
+    started = time.perf_counter()
+    with pdf_engines.ENGINES[engine](pdf) as doc:
+        for n in range(1, doc.page_count + 1):
+            doc.render(n, n, dpi)
+        pages = doc.page_count
+    return time.perf_counter() - started, pages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdfs", nargs="*", default=sorted(glob.glob("backend/mock_data/*.pdf")))
+    parser.add_argument("--dpi", type=int, default=PDF_DPI)
+    parser.add_argument("--repeat", type=int, default=3, help="passes per document and engine")
+    args = parser.parse_args()
+
+    engines = ["poppler"]
+    if pdf_engines.pdfium is not None:
+        engines.append("pdfium")
+    else:
+        print("pypdfium2 is not installed (pip install pypdfium2); only poppler will be timed")
+
+    text_ms = {e: [] for e in engines}
+    render_ms = {e: [] for e in engines}
+    similarity = []
+
+    for pdf in args.pdfs:
+        texts = {}
+        for engine in engines:
+            for _ in range(args.repeat):
+                secs, texts[engine] = _time_text(engine, pdf)
+                text_ms[engine].append(secs * 1000 / max(1, len(texts[engine])))
+                secs, pages = _time_render(engine, pdf, args.dpi)
+                render_ms[engine].append(secs * 1000 / max(1, pages))
+        if len(engines) > 1:
+            a, b = (_norm("\n".join(texts[e])) for e in engines)
+            ratio = difflib.SequenceMatcher(None, a, b).ratio() if a or b else 1.0
+            similarity.append(ratio)
+            print(f"{pdf}: text layer similarity {ratio:.3f}")
+
+    print(f"\n{len(args.pdfs)} PDF(s), render at {args.dpi} DPI, {args.repeat} pass(es) each")
+    print(f"{'engine':<8} {'text ms/page':>13} {'render ms/page':>15}")
+    for engine in engines:
+        if text_ms[engine]:
+            print(f"{engine:<8} {statistics.mean(text_ms[engine]):>13.1f} {statistics.mean(render_ms[engine]):>15.1f}")
+    if len(engines) > 1 and text_ms["pdfium"]:
+        print(f"pdfium speedup: text {statistics.mean(text_ms['poppler']) / statistics.mean(text_ms['pdfium']):.2f}x, "
+              f"render {statistics.mean(render_ms['poppler']) / statistics.mean(render_ms['pdfium']):.2f}x")
+    if similarity:
+        print(f"text layer similarity (poppler vs pdfium): mean {statistics.mean(similarity):.3f}, "
+              f"min {min(similarity):.3f}")
+
+
+if __name__ == "__main__":
+    main()
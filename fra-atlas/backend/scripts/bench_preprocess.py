@@ -0,0 +1,64 @@
+# backend/scripts/bench_preprocess.py
+"""
+Compare the PIL preprocessing chain with the NumPy stage (backend/ocr_preprocess.py):
+time per page for each, and how closely the OCR text of both matches.
+
+Run from the fra-atlas directory:
+    python -m backend.scripts.bench_preprocess
+    python -m backend.scripts.bench_preprocess --no-ocr     # timing only
+"""
+import glob
+import time
+import argparse
+import difflib
+import statistics
+
+from backend import ocr
+from backend.ocr_preprocess import preprocess_numpy
+
+
+def _norm(s: str) -> str:
+    return " ".join((s or "").split())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdfs", nargs="*", default=sorted(glob.glob("backend/mock_data/*.pdf")))
+    parser.add_argument("--repeat", type=int, default=5, help="preprocessing passes per page")
+    parser.add_argument("--no-ocr", action="store_true", help="skip the OCR equivalence check")
+    args = parser.parse_args()
+
+    stages = {"pil": ocr._preprocess_pil, "numpy": preprocess_numpy}
+    timings = {name: [] for name in stages}
+    similarity = []
+
+    for pdf in args.pdfs:
+        n_pages = ocr._count_pages(pdf)
+        for page_no, img in ocr.iter_page_images(pdf, list(range(1, n_pages + 1))):
+            outputs = {}
+            for name, fn in stages.items():
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    outputs[name] = fn(img)
+                    timings[name].append(time.perf_counter() - started)
+
+            if not args.no_ocr:
+                texts = {name: _norm(ocr._tesseract_text(pre)) for name, pre in outputs.items()}
+                ratio = difflib.SequenceMatcher(None, texts["pil"], texts["numpy"]).ratio()
+                similarity.append(ratio)
+                flag = "" if texts["pil"] == texts["numpy"] else "  (differs)"
+                print(f"{pdf} page {page_no}: text similarity {ratio:.3f}{flag}")
+
+    print(f"\n{'stage':<8} {'mean ms/page':>13} {'median':>9}")
+    for name, ts in timings.items():
+        if ts:
+            print(f"{name:<8} {statistics.mean(ts) * 1000:>13.1f} {statistics.median(ts) * 1000:>9.1f}")
+    if timings["pil"] and timings["numpy"]:
+        print(f"numpy speedup: {statistics.mean(timings['pil']) / statistics.mean(timings['numpy']):.2f}x")
+    if similarity:
+        print(f"OCR text similarity (pil vs numpy): mean {statistics.mean(similarity):.3f}, "
+              f"min {min(similarity):.3f}, identical pages {sum(r == 1.0 for r in similarity)}/{len(similarity)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# backend/scripts/bench_village_index.py
+"""
+Village name correction (backend/village_index.py) latency: synthetic villages
+spread over districts, queried with OCR-style typos (one or two substituted,
+dropped or doubled characters). Reports ms per lookup and how many typos were
+snapped back to the right village.
+
+Run from the fra-atlas directory:
+    python -m backend.scripts.bench_village_index
+    python -m backend.scripts.bench_village_index --villages 30000 --districts 1   # worst case
+"""
+import random
+import string
+import time
+import argparse
+
+from backend.village_index import VillageIndex
+
+OCR_SWAPS = {"i": "l", "l": "i", "o": "0", "e": "c", "n": "m", "m": "n", "h": "b", "u": "v"}
+
+
+def _name(rng: random.Random) -> str:
+    words = rng.randint(1, 2)
+    return " ".join(
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 8))).title() for _ in range(words)
+    )
+
+
+def _typo(rng: random.Random, name: str) -> str:
+    chars = list(name)
+    for _ in range(1 if len(name) < 10 else 2):
+        i = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.6:
+            chars[i] = OCR_SWAPS.get(chars[i].lower(), rng.choice(string.ascii_lowercase))
+        elif op < 0.8 and len(chars) > 4:
+            del chars[i]
+        else:
+            chars.insert(i, chars[i])
+    return "".join(chars)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--villages", type=int, default=30000)
+    parser.add_argument("--districts", type=int, default=30)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = VillageIndex()
+    villages = []
+    started = time.perf_counter()
+    for _ in range(args.villages):
+        district = f"District {rng.randrange(args.districts)}"
+        village = _name(rng)
+        villages.append((district, village))
+        index._add("State", district, village)
+    index._loaded = True
+    print(f"{args.villages} villages in {args.districts} districts, built in {time.perf_counter() - started:.2f}s")
+
+    right = 0
+    for district, village in rng.sample(villages, min(args.queries, len(villages))):
+        right += index.correct("State", district, _typo(rng, village)) == village
+    stats = index.stats()
+    print(f"{stats['lookups']} lookups, {stats['lookup_ms_avg']} ms/lookup; corrected to the right village: {right}; "
+          f"corrected {stats['corrected']}, exact {stats['exact']}, no match {stats['no_match']}, ambiguous {stats['ambiguous']}")
+
+
+if __name__ == "__main__":
+    main()
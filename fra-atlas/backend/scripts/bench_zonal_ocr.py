@@ -0,0 +1,53 @@
+# backend/scripts/bench_zonal_ocr.py
+"""
+Full-page OCR vs zonal OCR (backend/form_templates.py) on the same rendered
+pages: which template matched, Tesseract pixels and time per page for each,
+and whether both texts yield the same labeled fields.
+
+Run from the fra-atlas directory:
+    python -m backend.scripts.bench_zonal_ocr
+    python -m backend.scripts.bench_zonal_ocr backend/mock_data/FRA_Rampur.pdf
+"""
+import glob
+import time
+import argparse
+import statistics
+
+from backend import ocr
+from backend.ner import labeled_fields_in
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdfs", nargs="*", default=sorted(glob.glob("backend/mock_data/*.pdf")))
+    args = parser.parse_args()
+
+    full_s, zonal_s, pixel_ratio = [], [], []
+    for pdf in args.pdfs:
+        n_pages = ocr._count_pages(pdf)
+        for page_no, img in ocr.iter_page_images(pdf, list(range(1, n_pages + 1))):
+            started = time.perf_counter()
+            full_text = ocr._ocr_image(img)
+            full_s.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            zonal = ocr._ocr_zones(img)
+            elapsed = time.perf_counter() - started
+            if zonal is None:
+                print(f"{pdf} page {page_no}: no template match ({elapsed * 1000:.0f} ms to decide)")
+                continue
+            zonal_s.append(elapsed)
+            ratio = img.width * img.height / max(1, zonal["pixels"])
+            pixel_ratio.append(ratio)
+            missing = labeled_fields_in(full_text) - labeled_fields_in(zonal["text"])
+            print(f"{pdf} page {page_no}: {zonal['template']}, {ratio:.1f}x fewer pixels, "
+                  f"full {full_s[-1] * 1000:.0f} ms vs zonal {elapsed * 1000:.0f} ms"
+                  + (f", fields missing from zones: {sorted(missing)}" if missing else ""))
+
+    if zonal_s:
+        print(f"\nzonal pages: {len(zonal_s)}/{len(full_s)}, mean pixel reduction {statistics.mean(pixel_ratio):.1f}x, "
+              f"mean time full {statistics.mean(full_s) * 1000:.0f} ms vs zonal {statistics.mean(zonal_s) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
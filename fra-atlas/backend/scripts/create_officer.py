@@ -1,35 +1,34 @@
 # backend/scripts/create_officer.py
+# Run from the fra-atlas directory:
+#     python -m backend.scripts.create_officer --username admin@example.com --password ...
 import sqlite3
-import os
 import argparse
 from passlib.context import CryptContext
 
+from backend.sqlite_pool import connection
+
 pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
-DB = os.getenv("DATABASE_FILE", "backend/fra_atlas.db")
 
 def create_officer(username, password, full_name="Admin User", role="admin"):
     hashed = pwd_ctx.hash(password)
-    conn = sqlite3.connect(DB)
-    cur = conn.cursor()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS officers (
-          id INTEGER PRIMARY KEY AUTOINCREMENT,
-          username TEXT UNIQUE NOT NULL,
-          hashed_password TEXT NOT NULL,
-          full_name TEXT,
-          role TEXT,
-          created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        );
-    """)
-    try:
-        cur.execute("INSERT INTO officers (username, hashed_password, full_name, role) VALUES (?, ?, ?, ?)",
-                    (username, hashed, full_name, role))
-        conn.commit()
-        print("Inserted officer:", username)
-    except sqlite3.IntegrityError:
-        print("User already exists:", username)
-    finally:
-        conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS officers (
+              id INTEGER PRIMARY KEY AUTOINCREMENT,
+              username TEXT UNIQUE NOT NULL,
+              hashed_password TEXT NOT NULL,
+              full_name TEXT,
+              role TEXT,
+              created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        try:
+            cur.execute("INSERT INTO officers (username, hashed_password, full_name, role) VALUES (?, ?, ?, ?)",
+                        (username, hashed, full_name, role))
+            print("Inserted officer:", username)
+        except sqlite3.IntegrityError:
+            print("User already exists:", username)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
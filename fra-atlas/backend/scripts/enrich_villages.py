@@ -0,0 +1,57 @@
+# backend/scripts/enrich_villages.py
+"""
+Geocode the villages that imports queued without coordinates
+(village_geocode_queue, see backend/villages.py), one Nominatim request every
+GEOCODE_DELAY_SECONDS. Villages Nominatim can't place are retried with
+backoff, up to VILLAGE_GEOCODE_MAX_ATTEMPTS times.
+
+Run one instance per deployment (Nominatim's rate limit is per client), from
+the fra-atlas directory:
+    python -m backend.scripts.enrich_villages              # work through what is due, then exit
+    python -m backend.scripts.enrich_villages --watch      # keep polling for newly queued villages
+"""
+import time
+import argparse
+
+from backend import villages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--watch", action="store_true", help="keep running and poll for queued villages")
+    parser.add_argument("--poll", type=float, default=30.0, help="seconds between polls when idle (--watch)")
+    parser.add_argument("--limit", type=int, default=0, help="stop after this many lookups (0 = no limit)")
+    args = parser.parse_args()
+
+    villages.init_geocode_queue()
+    placed = failed = 0
+    while True:
+        due = villages.due_villages(50)
+        if not due:
+            if not args.watch:
+                break
+            time.sleep(args.poll)
+            continue
+        for item in due:
+            name = f"{item['village']}, {item['district']}, {item['state']}"
+            try:
+                coords, error = villages.geocode(item["state"], item["district"], item["village"]), None
+            except Exception as e:
+                coords, error = None, str(e)
+            villages.record_geocode(item["village_id"], coords, error)
+            if coords:
+                placed += 1
+                print(f"[GEOCODE] {name} -> {coords[0]:.5f}, {coords[1]:.5f}")
+            else:
+                failed += 1
+                print(f"[GEOCODE] {name}: {error or 'no match'} (attempt {item['attempts'] + 1})")
+            time.sleep(villages.GEOCODE_DELAY_SECONDS)
+            if args.limit and placed + failed >= args.limit:
+                print(f"{placed} placed, {failed} not placed")
+                return
+
+    print(f"{placed} placed, {failed} not placed; queue: {villages.geocode_queue_stats()}")
+
+
+if __name__ == "__main__":
+    main()
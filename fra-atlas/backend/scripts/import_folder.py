@@ -0,0 +1,66 @@
+# backend/scripts/import_folder.py
+"""
+Bulk-import a folder of scanned FRA claim PDFs: OCR each file, run NER for a
+batch of files at once (extract_entities_batch), and insert one claim per file.
+
+Run from the fra-atlas directory:
+    python -m backend.scripts.import_folder path/to/scans --officer-id 3
+    python -m backend.scripts.import_folder path/to/scans --officer-id 3 --batch-size 32 --dry-run
+"""
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+from backend.db import insert_claim
+from backend.ner import batch_stats, path_stats
+from backend.pipeline import process_documents, build_upload_payload
+
+
+async def _import(files: list, officer_id, batch_size: int, dry_run: bool) -> None:
+    created = failed = 0
+    started = time.perf_counter()
+    for i in range(0, len(files), batch_size):
+        chunk = files[i:i + batch_size]
+        results = await asyncio.to_thread(process_documents, [str(f) for f in chunk])
+        for path, extracted in zip(chunk, results):
+            if "error" in extracted:
+                failed += 1
+                print(f"  {path.name}: failed ({extracted['error']})")
+                continue
+            payload = build_upload_payload(extracted["entities"], officer_id)
+            if dry_run:
+                print(f"  {path.name}: {payload['state']} / {payload['district']} / {payload['village']}")
+            else:
+                await insert_claim(payload)
+            created += 1
+        elapsed = time.perf_counter() - started
+        print(f"{min(i + batch_size, len(files))}/{len(files)} files, {created / elapsed:.2f} docs/sec overall")
+
+    ner = batch_stats()
+    print(f"\n{created} claim(s) {'parsed' if dry_run else 'created'}, {failed} failed, "
+          f"{time.perf_counter() - started:.1f}s total; NER {ner['docs']} docs at {ner['docs_per_sec']} docs/sec")
+    paths = path_stats()
+    if paths["fast_path"]:
+        saved = paths["spacy_seconds_saved"]
+        print(f"NER paths: {paths['regex']} regex-only, {paths['spacy']} spaCy"
+              + (f", ~{saved:.1f}s of spaCy time saved" if saved is not None else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("folder")
+    parser.add_argument("--officer-id", type=int, default=None, help="officer the claims are assigned to")
+    parser.add_argument("--batch-size", type=int, default=16, help="files per NER batch")
+    parser.add_argument("--dry-run", action="store_true", help="extract only, do not insert claims")
+    args = parser.parse_args()
+
+    files = sorted(p for p in Path(args.folder).rglob("*") if p.suffix.lower() == ".pdf")
+    if not files:
+        print(f"no PDFs under {args.folder}")
+        return
+    asyncio.run(_import(files, args.officer_id, max(1, args.batch_size), args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# backend/scripts/reprocess_raw_ocr.py
+"""
+Re-run NER over the OCR text stored in claims.raw_ocr (claims committed through
+/claims/commit-parsed keep {"entities", "extracted_text"}) and refresh the
+stored entities, e.g. after a spaCy model or regex change. Documents go through
+extract_entities_batch in batches; throughput is reported in docs/sec.
+
+Run from the fra-atlas directory:
+    python -m backend.scripts.reprocess_raw_ocr              # report only
+    python -m backend.scripts.reprocess_raw_ocr --write      # store refreshed entities
+"""
+import json
+import time
+import argparse
+
+from backend.sqlite_pool import connection
+from backend.ner import extract_entities_batch
+
+
+def _stored_text(raw: str):
+    try:
+        data = json.loads(raw)
+    except (TypeError, ValueError):
+        return None, None
+    if isinstance(data, dict) and isinstance(data.get("extracted_text"), str):
+        return data, data["extracted_text"]
+    return None, None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=64, help="documents per nlp.pipe batch")
+    parser.add_argument("--n-process", type=int, default=None, help="spaCy worker processes (NER_N_PROCESS)")
+    parser.add_argument("--write", action="store_true", help="update claims.raw_ocr with the new entities")
+    args = parser.parse_args()
+
+    with connection() as conn:
+        rows = conn.execute("SELECT id, raw_ocr FROM claims WHERE raw_ocr LIKE '%extracted_text%'").fetchall()
+        docs = []
+        for claim_id, raw in rows:
+            data, text = _stored_text(raw)
+            if data is not None:
+                docs.append((claim_id, data, text))
+        print(f"{len(docs)} claim(s) with stored OCR text")
+
+        changed = 0
+        started = time.perf_counter()
+        for i in range(0, len(docs), max(1, args.batch_size)):
+            chunk = docs[i:i + args.batch_size]
+            entities = extract_entities_batch([text for _, _, text in chunk], args.batch_size, args.n_process)
+            updates = []
+            for (claim_id, data, _), ents in zip(chunk, entities):
+                if json.loads(json.dumps(ents, default=str)) != data.get("entities"):
+                    changed += 1
+                    updates.append((json.dumps({**data, "entities": ents}, default=str), claim_id))
+            if args.write and updates:
+                conn.executemany("UPDATE claims SET raw_ocr = ? WHERE id = ?", updates)
+                conn.commit()
+        elapsed = time.perf_counter() - started
+
+    rate = len(docs) / elapsed if elapsed else 0
+    print(f"NER: {len(docs)} docs in {elapsed:.2f}s ({rate:.1f} docs/sec), "
+          f"{changed} with different entities{' (updated)' if args.write else ''}")
+
+
+if __name__ == "__main__":
+    main()
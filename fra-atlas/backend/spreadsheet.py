@@ -0,0 +1,199 @@
+# backend/spreadsheet.py
+"""
+Column mapping and normalization for spreadsheet claim imports
+(/claims/import-excel, /claims/parse-excel).
+
+Work is done column-wise on the DataFrame: headers are mapped to claim fields
+once, text columns are stripped with .str ops, lat/lon go through
+pd.to_numeric, and unusable cells become a per-row error message. Records are
+then emitted in a single pass instead of a Python loop over df.iterrows().
+
+iter_chunks() reads a spooled .csv/.xlsx file as bounded DataFrames for the
+streaming import mode, so memory stays flat however large the sheet is.
+read_frame() reads a whole upload for the in-memory mode with the same row
+index, so an import journaled in one mode resumes at the same row in the other.
+"""
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+# ---- Config ----------------------------------------------------------------
+
+# rows per chunk (and per commit) in streaming imports
+IMPORT_CHUNK_ROWS = max(1, int(os.getenv("IMPORT_CHUNK_ROWS", "5000")))
+
+# claim field -> accepted headers (case-insensitive; spaces count as underscores)
+FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "state": ("state", "st", "province"),
+    "district": ("district", "dist"),
+    "village": ("village", "village_name", "gram"),
+    "patta_holder": ("patta_holder", "pattaholder", "name", "claimant"),
+    "ifr_number": ("ifr_number", "ifrno", "claim_id"),
+    "land_area": ("land_area", "area", "hectares", "ha"),
+    "status": ("status", "claim_status"),
+    "date": ("date", "claim_date", "application_date"),
+    "lat": ("lat", "latitude"),
+    "lon": ("lon", "lng", "longitude"),
+}
+TEXT_FIELDS = ("state", "district", "village", "patta_holder", "ifr_number", "land_area", "status", "date")
+COORD_LIMITS = {"lat": 90.0, "lon": 180.0}
+
+
+def _header_key(col) -> str:
+    return str(col).strip().lower().replace(" ", "_")
+
+
+def map_columns(columns: Iterable) -> Dict[str, Optional[Any]]:
+    """Claim field -> the first column (in sheet order) matching one of its aliases, else None."""
+    position: Dict[str, Tuple[int, Any]] = {}
+    for i, col in enumerate(columns):
+        position.setdefault(_header_key(col), (i, col))
+    col_map: Dict[str, Optional[Any]] = {}
+    for field, aliases in FIELD_ALIASES.items():
+        hits = [position[a] for a in aliases if a in position]
+        col_map[field] = min(hits, key=lambda h: h[0])[1] if hits else None
+    return col_map
+
+
+def _coordinates(raw: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """(values as float, NaN when missing/unparsable; mask of non-blank cells)."""
+    if is_numeric_dtype(raw):
+        return raw.astype(float), raw.notna()
+    text = raw.astype(str).str.strip().where(raw.notna(), "")
+    given = text.ne("")
+    return pd.to_numeric(text.where(given), errors="coerce"), given
+
+
+def normalize_frame(df: pd.DataFrame, col_map: Dict[str, Optional[Any]]) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    (frame, errors): one column per claim field, indexed like `df` (text
+    stripped, None where missing; lat/lon as floats, NaN where missing), and
+    the reason each row can't be imported ("" for valid rows).
+    """
+    out = pd.DataFrame(index=df.index)
+    errors = pd.Series("", index=df.index, dtype=object)
+
+    for field in TEXT_FIELDS:
+        col = col_map.get(field)
+        if col is None:
+            out[field] = None
+            continue
+        raw = df[col]
+        out[field] = raw.astype(str).str.strip().where(raw.notna(), None)
+
+    for field, limit in COORD_LIMITS.items():
+        col = col_map.get(field)
+        if col is None:
+            out[field] = float("nan")
+            continue
+        raw = df[col]
+        num, given = _coordinates(raw)
+        not_number = given & num.isna()
+        out_of_range = num.notna() & ~num.between(-limit, limit)
+        # messages are built only for the (few) bad rows
+        for idx in not_number[not_number].index:
+            if not errors[idx]:
+                errors[idx] = f"{field} is not a number: {raw[idx]!r}"
+        for idx in out_of_range[out_of_range].index:
+            if not errors[idx]:
+                errors[idx] = f"{field} out of range: {num[idx]}"
+        out[field] = num.where(~(not_number | out_of_range))
+
+    return out, errors
+
+
+def to_records(frame: pd.DataFrame, **constants) -> List[Dict[str, Any]]:
+    """One dict per row (NaN -> None), each extended with `constants`."""
+    cols = list(frame.columns)
+    values = frame.astype(object)
+    values = values.where(values.notna(), None)
+    return [dict(zip(cols, row), **constants) for row in values.itertuples(index=False, name=None)]
+
+
+# ---- Chunked readers -------------------------------------------------------
+
+def _unique_headers(header) -> List[str]:
+    """Header row as unique column names (blank -> column_<n>, repeats -> name.1), like read_csv."""
+    seen: Dict[str, int] = {}
+    out = []
+    for i, h in enumerate(header):
+        name = str(h).strip() if h is not None and str(h).strip() else f"column_{i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        out.append(name)
+    return out
+
+
+def _xlsx_chunks(source, chunk_rows: int, start_row: int) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _unique_headers(header)
+        width = len(columns)
+        batch: List[tuple] = []
+        index: List[int] = []
+        for pos, row in enumerate(rows):
+            if pos < start_row or all(v is None for v in row):
+                continue  # blank (often trailing formatted) rows; keep numbering by sheet position
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+            batch.append(row)
+            index.append(pos)
+            if len(batch) >= chunk_rows:
+                yield pd.DataFrame(batch, columns=columns, index=index)
+                batch, index = [], []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns, index=index)
+    finally:
+        wb.close()
+
+
+def iter_chunks(path: str, chunk_rows: int = IMPORT_CHUNK_ROWS, start_row: int = 0) -> Iterator[pd.DataFrame]:
+    """
+    DataFrames of at most `chunk_rows` rows, read incrementally from a .csv
+    (pandas chunksize) or .xlsx (openpyxl read_only / iter_rows). The index is
+    the 0-based data row position in the file, continuing across chunks;
+    rows before `start_row` (already imported) are dropped.
+
+    CSV rows before `start_row` are still parsed: skipping them by line
+    (skiprows) would count raw lines, and blank lines or quoted cells spanning
+    several lines make those drift from data rows.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        with pd.read_csv(path, chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                if start_row and chunk.index[0] < start_row:
+                    chunk = chunk[chunk.index >= start_row]
+                    if chunk.empty:
+                        continue
+                yield chunk
+    elif suffix in (".xlsx", ".xlsm"):
+        yield from _xlsx_chunks(path, chunk_rows, start_row)
+    else:
+        raise ValueError(f"streaming import reads .csv and .xlsx files, not {suffix or 'files without an extension'}")
+
+
+def read_frame(source, suffix: str) -> pd.DataFrame:
+    """
+    A whole .csv/.xlsx (path or file object) as one DataFrame, indexed like
+    iter_chunks: 0-based data row position, .xlsx rows that are entirely blank
+    left out but still counted. Other formats (.xls) go through pd.read_excel.
+    """
+    suffix = suffix.lower()
+    if suffix == ".csv":
+        return pd.read_csv(source)
+    if suffix in (".xlsx", ".xlsm"):
+        chunks = list(_xlsx_chunks(source, IMPORT_CHUNK_ROWS, 0))
+        return pd.concat(chunks) if chunks else pd.DataFrame()
+    return pd.read_excel(source)
@@ -0,0 +1,215 @@
+# backend/sqlite_pool.py
+"""
+Shared sqlite3 connection pool for every module that talks to fra_atlas.db
+directly (claims_db, jobs, routes/claims, routes/auth, routes/officers,
+services/officer_metrics, ...), plus the single resolved database path that
+backend.db's async engine uses too.
+
+Connections are opened lazily up to SQLITE_POOL_SIZE and reused; each one is
+set to WAL journaling with the pragmas below, so readers never block the
+writer and a commit costs one WAL append instead of a rollback-journal fsync.
+
+    with sqlite_pool.connection() as conn:   # commit on success, rollback on error
+        rows = conn.execute("SELECT ...").fetchall()
+"""
+import os
+import time
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Optional
+
+# ---- Config ----------------------------------------------------------------
+
+SQLITE_POOL_SIZE = max(1, int(os.getenv("SQLITE_POOL_SIZE", "8")))
+# seconds to wait for a free connection before raising PoolTimeout
+SQLITE_POOL_TIMEOUT = float(os.getenv("SQLITE_POOL_TIMEOUT", "30"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_WAL = os.getenv("SQLITE_WAL", "1") != "0"
+# NORMAL is durable across application crashes in WAL mode; FULL also survives power loss
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_CACHE_MB = int(os.getenv("SQLITE_CACHE_MB", "32"))
+SQLITE_MMAP_MB = int(os.getenv("SQLITE_MMAP_MB", "256"))
+
+
+def resolve_db_path(url: Optional[str] = None) -> Optional[str]:
+    """
+    Absolute path of the SQLite file: DATABASE_URL (sqlite[+driver]:///path),
+    else DATABASE_FILE (older setting used by auth), else backend/fra_atlas.db.
+    None for a non-SQLite DATABASE_URL.
+    """
+    url = url if url is not None else os.getenv("DATABASE_URL")
+    if not url:
+        legacy = os.getenv("DATABASE_FILE")
+        return str(Path(legacy).resolve() if legacy else Path(__file__).resolve().parent / "fra_atlas.db")
+    if not url.startswith("sqlite") or ":///" not in url:
+        return None
+    # sqlite:///relative.db, sqlite:////abs/path.db, sqlite+aiosqlite:///C:/path.db
+    path = url.split(":///", 1)[1].split("?", 1)[0]
+    return str(Path(path).resolve())
+
+
+DB_PATH = resolve_db_path()
+
+
+def pragmas() -> list:
+    out = [
+        f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size = {-SQLITE_CACHE_MB * 1024}",
+        f"PRAGMA mmap_size = {SQLITE_MMAP_MB * 1024 * 1024}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if SQLITE_WAL:
+        out.insert(0, "PRAGMA journal_mode = WAL")
+    return out
+
+
+def apply_pragmas(conn) -> None:
+    """Configure a DBAPI connection (sqlite3 or the one under SQLAlchemy)."""
+    cur = conn.cursor()
+    try:
+        for stmt in pragmas():
+            cur.execute(stmt)
+    finally:
+        cur.close()
+
+
+# ---- Pool ------------------------------------------------------------------
+
+class PoolTimeout(Exception):
+    """No connection became free within SQLITE_POOL_TIMEOUT seconds."""
+
+
+class ConnectionPool:
+    def __init__(self, path: Optional[str], size: int = SQLITE_POOL_SIZE, timeout: float = SQLITE_POOL_TIMEOUT):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._open = 0
+        self._stats = {"acquired": 0, "waited": 0, "wait_seconds": 0.0, "max_wait_ms": 0.0,
+                       "timeouts": 0, "in_use": 0, "peak_in_use": 0, "opened": 0, "discarded": 0}
+
+    def _new_connection(self) -> sqlite3.Connection:
+        if self.path is None:
+            raise RuntimeError("sqlite_pool: DATABASE_URL is not a sqlite URL")
+        conn = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        apply_pragmas(conn)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            grow = self._open < self.size
+            if grow:
+                self._open += 1
+                self._stats["opened"] += 1
+        if grow:
+            try:
+                return self._new_connection()
+            except Exception:
+                with self._lock:
+                    self._open -= 1
+                raise
+
+        started = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise PoolTimeout(f"no free SQLite connection after {self.timeout:.0f}s (pool size {self.size})")
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._stats["waited"] += 1
+            self._stats["wait_seconds"] += waited
+            self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], waited * 1000)
+        return conn
+
+    def _release(self, conn: sqlite3.Connection, broken: bool) -> None:
+        if not broken:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                broken = True
+        if broken:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            with self._lock:
+                self._open -= 1
+                self._stats["discarded"] += 1
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """A pooled connection; commits on success, rolls back on error."""
+        conn = self._acquire()
+        with self._lock:
+            self._stats["acquired"] += 1
+            self._stats["in_use"] += 1
+            self._stats["peak_in_use"] = max(self._stats["peak_in_use"], self._stats["in_use"])
+        broken = False
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except sqlite3.ProgrammingError:
+            # e.g. a closed handle; never hand it out again
+            broken = True
+            raise
+        finally:
+            with self._lock:
+                self._stats["in_use"] -= 1
+            self._release(conn, broken)
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._lock:
+                self._open -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats)
+            out["open"] = self._open
+        out["idle"] = self._idle.qsize()
+        out["size"] = self.size
+        out["path"] = self.path
+        out["wait_seconds"] = round(out["wait_seconds"], 3)
+        out["max_wait_ms"] = round(out["max_wait_ms"], 2)
+        return out
+
+
+# ---- Module-level pool -----------------------------------------------------
+
+_pool = ConnectionPool(DB_PATH)
+
+
+def connection():
+    return _pool.connection()
+
+
+def pool_stats() -> dict:
+    out = _pool.stats()
+    out["pragmas"] = pragmas()
+    return out
+
+
+def close_pool() -> None:
+    _pool.close()
@@ -0,0 +1,228 @@
+# backend/village_index.py
+"""
+Edit-distance index over canonical village names, one per (state, district),
+used to snap OCR'd village names ("Chhoti Barl") to the known village
+("Chhoti Bari") before a near-duplicate row is inserted and geocoded.
+
+A name is corrected only when exactly one known village in its district is
+closest and within the allowed edits: min(VILLAGE_MAX_EDITS,
+len(name) // VILLAGE_CHARS_PER_EDIT), so short names need an exact match.
+"""
+import os
+import time
+import sqlite3
+import threading
+from collections import Counter
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+from backend import sqlite_pool
+from backend.gazetteer import normalize
+
+# ---- Config ----------------------------------------------------------------
+
+VILLAGE_CORRECTION = os.getenv("VILLAGE_CORRECTION", "1") != "0"
+VILLAGE_MAX_EDITS = max(0, int(os.getenv("VILLAGE_MAX_EDITS", "2")))
+VILLAGE_CHARS_PER_EDIT = max(1, int(os.getenv("VILLAGE_CHARS_PER_EDIT", "5")))
+
+
+def _peq(pattern: str) -> Dict[str, int]:
+    """Character -> bitmask of its positions in `pattern`."""
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq
+
+
+def _distance(peq: Dict[str, int], m: int, text: str) -> int:
+    """
+    Levenshtein distance between a pattern of length `m` (given as _peq) and
+    `text`, bit-parallel (Myers / Hyyro): one pass over `text`, a handful of
+    integer operations per character.
+    """
+    if m == 0:
+        return len(text)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for ch in text:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+# ---- Per-district index ----------------------------------------------------
+
+def _bigrams(key: str) -> set:
+    padded = f"\x02{key}\x03"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class NameIndex:
+    """
+    Village names of one district with a bigram inverted index. One edit
+    touches at most two bigrams, so a name within k edits of the query shares
+    at least len(query bigrams) - 2k of them; only names passing that count
+    (and the length) filter get the exact bit-parallel distance.
+    """
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.values: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: str, value: str) -> None:
+        if key in self._ids:
+            return
+        idx = self._ids[key] = len(self.keys)
+        self.keys.append(key)
+        self.values.append(value)
+        for gram in _bigrams(key):
+            self._postings.setdefault(gram, []).append(idx)
+
+    def search(self, key: str, tolerance: int):
+        """[(distance, key, value)] for every key within `tolerance`."""
+        idx = self._ids.get(key)
+        if idx is not None:
+            return [(0, key, self.values[idx])]
+        grams = _bigrams(key)
+        need = len(grams) - 2 * tolerance
+        if need > 0:
+            counts = Counter(chain.from_iterable(self._postings.get(g, ()) for g in grams))
+            candidates = [i for i, n in counts.items() if n >= need]
+        else:
+            candidates = range(len(self.keys))
+        peq, m = _peq(key), len(key)
+        out = []
+        for i in candidates:
+            other = self.keys[i]
+            if abs(len(other) - m) <= tolerance:
+                d = _distance(peq, m, other)
+                if d <= tolerance:
+                    out.append((d, other, self.values[i]))
+        return out
+
+
+# ---- Index -----------------------------------------------------------------
+
+class VillageIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scopes: Dict[Tuple[str, str], NameIndex] = {}
+        self._loaded = False
+        self._stats = {"lookups": 0, "exact": 0, "corrected": 0, "no_match": 0,
+                       "ambiguous": 0, "lookup_seconds": 0.0}
+        self._corrections: Counter = Counter()
+
+    def _add(self, state, district, village) -> None:
+        key = normalize(village)
+        if not key:
+            return
+        scope = (normalize(state), normalize(district))
+        index = self._scopes.get(scope)
+        if index is None:
+            index = self._scopes[scope] = NameIndex()
+        index.add(key, village)
+
+    def load(self) -> None:
+        """(Re)build from the villages table."""
+        try:
+            with sqlite_pool.connection() as conn:
+                rows = conn.execute("SELECT DISTINCT state, district, village FROM villages").fetchall()
+        except sqlite3.Error as e:
+            print(f"[VILLAGES] villages table not read ({sqlite_pool.DB_PATH}): {e}")
+            rows = []
+        with self._lock:
+            self._scopes = {}
+            for row in rows:
+                self._add(*row)
+            self._loaded = True
+        print(f"[VILLAGES] {len(rows)} villages indexed in {len(self._scopes)} districts")
+
+    def ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def add_village(self, state, district, village) -> None:
+        if not self._loaded:
+            return  # picked up by load()
+        with self._lock:
+            self._add(state, district, village)
+
+    def correct(self, state, district, village) -> str:
+        """The known village `village` most likely is, else `village` unchanged."""
+        if not (VILLAGE_CORRECTION and state and district and village):
+            return village
+        self.ensure_loaded()
+        started = time.perf_counter()
+        key = normalize(village)
+        tolerance = min(VILLAGE_MAX_EDITS, len(key) // VILLAGE_CHARS_PER_EDIT)
+        with self._lock:
+            index = self._scopes.get((normalize(state), normalize(district)))
+            hits = sorted(index.search(key, tolerance)) if index is not None else []
+
+        if hits and hits[0][0] == 0:
+            outcome, result = "exact", hits[0][2]
+        elif not hits:
+            outcome, result = "no_match", village
+        elif len(hits) > 1 and hits[1][0] == hits[0][0]:
+            outcome, result = "ambiguous", village
+        else:
+            outcome, result = "corrected", hits[0][2]
+
+        with self._lock:
+            self._stats["lookups"] += 1
+            self._stats[outcome] += 1
+            self._stats["lookup_seconds"] += time.perf_counter() - started
+            if outcome == "corrected":
+                self._corrections[(village, result)] += 1
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats)
+            out["villages"] = sum(len(t) for t in self._scopes.values())
+            out["districts"] = len(self._scopes)
+            out["top_corrections"] = [
+                {"from": src, "to": dst, "count": n} for (src, dst), n in self._corrections.most_common(20)
+            ]
+        out["enabled"] = VILLAGE_CORRECTION
+        out["lookup_ms_avg"] = round(out["lookup_seconds"] * 1000 / out["lookups"], 3) if out["lookups"] else None
+        out["lookup_seconds"] = round(out["lookup_seconds"], 3)
+        return out
+
+
+# ---- Module-level instance -------------------------------------------------
+
+_index = VillageIndex()
+
+
+def get_village_index() -> VillageIndex:
+    return _index
+
+
+def correct_village(state, district, village) -> str:
+    return _index.correct(state, district, village)
+
+
+def add_village(state, district, village) -> None:
+    _index.add_village(state, district, village)
+
+
+def correction_stats() -> dict:
+    return _index.stats()
@@ -0,0 +1,234 @@
+# backend/villages.py
+"""
+Batch village upsert for claim imports, and the queue of villages that still
+need coordinates.
+
+upsert_villages() resolves the distinct (state, district, village) triplets of
+an import chunk against `villages` in one transaction: one lookup per
+VILLAGE_LOOKUP_BATCH triplets, multi-row INSERT ... ON CONFLICT DO NOTHING
+for new villages, and one executemany UPDATE filling missing coordinates
+from the claims.
+Villages left without coordinates go into village_geocode_queue instead of
+being geocoded inline (Nominatim allows about one request a second), and
+backend/scripts/enrich_villages.py works through the queue:
+
+    python -m backend.scripts.enrich_villages --watch
+"""
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from urllib.request import urlopen, Request as UrlRequest
+
+from backend import gazetteer, village_index
+from backend.sqlite_pool import connection
+
+# ---- Config ----------------------------------------------------------------
+
+VILLAGE_GEOCODE_MAX_ATTEMPTS = int(os.getenv("VILLAGE_GEOCODE_MAX_ATTEMPTS", "5"))
+# seconds before retrying a village Nominatim couldn't place, doubled per attempt
+VILLAGE_GEOCODE_BACKOFF = float(os.getenv("VILLAGE_GEOCODE_BACKOFF", "3600"))
+# Nominatim usage policy: at most one request per second
+GEOCODE_DELAY_SECONDS = 1.1
+# triplets per lookup / rows per multi-row INSERT (SQLite bound-variable limit)
+VILLAGE_LOOKUP_BATCH = 300
+
+Triplet = Tuple[str, str, str]
+Coords = Tuple[Optional[float], Optional[float]]
+
+_stats_lock = threading.Lock()
+_stats = {"batches": 0, "triplets": 0, "existing": 0, "inserted": 0, "updated": 0,
+          "queued": 0, "seconds": 0.0}
+
+
+def init_geocode_queue() -> None:
+    with connection() as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS village_geocode_queue (
+                village_id INTEGER PRIMARY KEY,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error TEXT,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+
+
+# ---- Geocoding -------------------------------------------------------------
+
+def geocode(state: str, district: str, village: str) -> Optional[Tuple[float, float]]:
+    """
+    One Nominatim lookup (no rate limiting here; callers wait
+    GEOCODE_DELAY_SECONDS between requests). None when nothing matched;
+    network/HTTP errors are raised.
+    """
+    query = f"{village}, {district}, {state}, India"
+    url = "https://nominatim.openstreetmap.org/search?" + urlencode({"format": "json", "q": query})
+    req = UrlRequest(url, headers={"User-Agent": "fra-atlas/1.0 (contact: you@example.com)"})
+    with urlopen(req, timeout=10) as resp:
+        arr = json.loads(resp.read().decode("utf-8"))
+    if not arr:
+        return None
+    return float(arr[0].get("lat")), float(arr[0].get("lon"))
+
+
+# ---- Batch upsert ----------------------------------------------------------
+
+def _find_villages(conn, keys: List[Triplet]) -> Dict[Triplet, dict]:
+    """Existing rows for `keys`, one VALUES-CTE lookup per VILLAGE_LOOKUP_BATCH (lowest id wins)."""
+    found = {}
+    for i in range(0, len(keys), VILLAGE_LOOKUP_BATCH):
+        part = keys[i:i + VILLAGE_LOOKUP_BATCH]
+        rows = conn.execute(
+            f"""
+            WITH t(state, district, village) AS (VALUES {",".join(["(?, ?, ?)"] * len(part))})
+            SELECT v.id, v.state, v.district, v.village, v.lat, v.lon
+            FROM villages v JOIN t
+              ON v.state = t.state AND v.district = t.district AND v.village = t.village
+            ORDER BY v.id
+            """,
+            [x for key in part for x in key],
+        ).fetchall()
+        for r in rows:
+            found.setdefault((r["state"], r["district"], r["village"]), r)
+    return found
+
+
+def upsert_villages(items: Dict[Triplet, Coords]) -> Dict[str, int]:
+    """
+    Make sure every (state, district, village) in `items` exists in `villages`.
+    Keys are normalized names; values are plausible claim coordinates or
+    (None, None). Existing villages without coordinates get the claim's;
+    villages still without any are queued for geocoding. New villages go in
+    with INSERT ... ON CONFLICT DO NOTHING, so one inserted concurrently by
+    another writer is treated as existing rather than failing the batch.
+    """
+    started = time.perf_counter()
+    keys = list(items)
+    out = {"triplets": len(keys), "existing": 0, "inserted": 0, "updated": 0, "queued": 0}
+    if not keys:
+        return out
+
+    now = time.time()
+    new_keys: List[Triplet] = []
+    with connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        found = _find_villages(conn, keys)
+
+        unplaced = []
+        missing = [key for key in keys if key not in found]
+        for i in range(0, len(missing), VILLAGE_LOOKUP_BATCH):
+            part = missing[i:i + VILLAGE_LOOKUP_BATCH]
+            params = []
+            for key in part:
+                params.extend((*key, *items[key]))
+            rows = conn.execute(
+                f"""
+                INSERT INTO villages (state, district, village, lat, lon, created_at)
+                VALUES {",".join(["(?, ?, ?, ?, ?, datetime('now'))"] * len(part))}
+                ON CONFLICT DO NOTHING
+                RETURNING id, state, district, village, lat, lon
+                """,
+                params,
+            ).fetchall()
+            new_keys.extend((r["state"], r["district"], r["village"]) for r in rows)
+            unplaced.extend(r["id"] for r in rows if r["lat"] is None or r["lon"] is None)
+        inserted = set(new_keys)
+        # rows another writer inserted since the lookup
+        found.update(_find_villages(conn, [key for key in missing if key not in inserted]))
+
+        updates = []
+        for key, row in found.items():
+            if row["lat"] is not None and row["lon"] is not None:
+                continue
+            lat, lon = items[key]
+            if lat is not None and lon is not None:
+                updates.append((lat, lon, row["id"]))
+            else:
+                unplaced.append(row["id"])
+        if updates:
+            conn.executemany("UPDATE villages SET lat = ?, lon = ? WHERE id = ?", updates)
+            conn.executemany("DELETE FROM village_geocode_queue WHERE village_id = ?", [(u[2],) for u in updates])
+
+        if unplaced:
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO village_geocode_queue (village_id, attempts, next_attempt_at, created_at)
+                VALUES (?, 0, ?, ?)
+                """,
+                [(vid, now, now) for vid in unplaced],
+            )
+        conn.execute("COMMIT")
+
+    for state, district, village in new_keys:
+        gazetteer.add_village(state, district, village)
+        village_index.add_village(state, district, village)
+
+    out.update(existing=len(found), inserted=len(new_keys), updated=len(updates), queued=len(unplaced))
+    with _stats_lock:
+        _stats["batches"] += 1
+        for k, v in out.items():
+            _stats[k] += v
+        _stats["seconds"] += time.perf_counter() - started
+    return out
+
+
+# ---- Geocode queue ---------------------------------------------------------
+
+def due_villages(limit: int) -> List[dict]:
+    """Queued villages whose next attempt is due, oldest first."""
+    with connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT q.village_id, q.attempts, v.state, v.district, v.village
+            FROM village_geocode_queue q JOIN villages v ON v.id = q.village_id
+            WHERE q.attempts < ? AND q.next_attempt_at <= ?
+            ORDER BY q.next_attempt_at, q.village_id
+            LIMIT ?
+            """,
+            (VILLAGE_GEOCODE_MAX_ATTEMPTS, time.time(), max(1, limit)),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def record_geocode(village_id: int, coords: Optional[Tuple[float, float]], error: Optional[str] = None) -> None:
+    """Store found coordinates and dequeue, or count a failed attempt and back off."""
+    now = time.time()
+    with connection() as conn:
+        if coords is not None:
+            conn.execute(
+                "UPDATE villages SET lat = ?, lon = ? WHERE id = ? AND (lat IS NULL OR lon IS NULL)",
+                (coords[0], coords[1], village_id),
+            )
+            conn.execute("DELETE FROM village_geocode_queue WHERE village_id = ?", (village_id,))
+            return
+        conn.execute(
+            """
+            UPDATE village_geocode_queue
+            SET attempts = attempts + 1, last_error = ?,
+                next_attempt_at = ? + ? * (1 << attempts)
+            WHERE village_id = ?
+            """,
+            ((error or "no match")[:500], now, VILLAGE_GEOCODE_BACKOFF, village_id),
+        )
+
+
+def geocode_queue_stats() -> dict:
+    with connection() as conn:
+        row = conn.execute(
+            """
+            SELECT COUNT(*) AS queued,
+                   COALESCE(SUM(attempts >= ?), 0) AS gave_up,
+                   COALESCE(SUM(attempts < ? AND next_attempt_at <= ?), 0) AS due
+            FROM village_geocode_queue
+            """,
+            (VILLAGE_GEOCODE_MAX_ATTEMPTS, VILLAGE_GEOCODE_MAX_ATTEMPTS, time.time()),
+        ).fetchone()
+    with _stats_lock:
+        upserts = dict(_stats)
+    upserts["seconds"] = round(upserts["seconds"], 3)
+    return {**dict(row), "upserts": upserts}
@@ -0,0 +1,133 @@
+# backend/worker.py
+"""
+Ingestion worker: claims jobs from `ingest_jobs` (backend/jobs.py) in batches
+of WORKER_BATCH_SIZE and runs OCR -> batched NER -> insert claim for them.
+
+Run from the fra-atlas directory, next to the API:
+    python -m backend.worker                 # one worker process
+    python -m backend.worker --processes 4   # four worker processes
+
+Throughput scales with the number of worker processes; the API only enqueues.
+"""
+import os
+import time
+import socket
+import asyncio
+import argparse
+import traceback
+import multiprocessing
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from backend import jobs
+from backend.pipeline import process_documents, build_upload_payload
+
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+
+# Jobs claimed together: each file is OCR'd on its own, then NER runs once for
+# the whole batch (backend.ner.extract_entities_batch).
+WORKER_BATCH_SIZE = max(1, int(os.getenv("WORKER_BATCH_SIZE", "4")))
+
+
+async def _keep_lease(job_ids: list, worker_id: str, stage: dict) -> None:
+    """Renew the leases while a batch of jobs is being processed."""
+    interval = max(1.0, jobs.JOB_LEASE_SECONDS / 3)
+    while True:
+        await asyncio.sleep(interval)
+        for job_id in job_ids:
+            await asyncio.to_thread(jobs.heartbeat, job_id, worker_id, stage.get("name"))
+
+
+async def _fail(job: dict, worker_id: str, error: str) -> None:
+    status = await asyncio.to_thread(jobs.fail_job, job["id"], worker_id, error)
+    print(f"[worker {worker_id}] job {job['id']} failed ({status}): {error.splitlines()[0]}", flush=True)
+
+
+async def _run_jobs(batch: list, worker_id: str) -> None:
+    job_ids = [job["id"] for job in batch]
+    stage = {"name": "ocr"}
+    for job_id in job_ids:
+        await asyncio.to_thread(jobs.heartbeat, job_id, worker_id, "ocr")
+    lease_task = asyncio.create_task(_keep_lease(job_ids, worker_id, stage))
+    try:
+        started = time.perf_counter()
+        results = await asyncio.to_thread(process_documents, [job["file_path"] for job in batch])
+        elapsed = time.perf_counter() - started
+        regex_docs = sum(1 for r in results if r.get("entities", {}).get("ner_path") == "regex")
+        print(f"[worker {worker_id}] {len(batch)} document(s) extracted in {elapsed:.2f}s "
+              f"({len(batch) / elapsed if elapsed else 0:.2f} docs/sec, {regex_docs} via NER fast path)", flush=True)
+
+        stage["name"] = "insert"
+        for job, extracted in zip(batch, results):
+            if "error" in extracted:
+                await _fail(job, worker_id, extracted["error"])
+                continue
+            try:
+                if not await asyncio.to_thread(jobs.heartbeat, job["id"], worker_id, "insert"):
+                    print(f"[worker {worker_id}] job {job['id']}: lease lost, leaving it to its new owner", flush=True)
+                    continue
+                payload = build_upload_payload(extracted["entities"], job["officer_id"])
+                # inserts the claim and marks the job done in one transaction
+                claim_id = await asyncio.to_thread(jobs.complete_job, job["id"], worker_id, payload)
+            except Exception as e:
+                await _fail(job, worker_id, f"{e}\n{traceback.format_exc()}")
+                continue
+            if claim_id is None:
+                print(f"[worker {worker_id}] job {job['id']}: lease lost before insert, nothing written", flush=True)
+                continue
+            print(f"[worker {worker_id}] job {job['id']} done -> claim {claim_id}", flush=True)
+    finally:
+        lease_task.cancel()
+
+
+async def _worker_loop(worker_id: str, once: bool = False) -> None:
+    jobs.init_jobs_table()
+    print(f"[worker {worker_id}] started", flush=True)
+    while True:
+        batch = await asyncio.to_thread(jobs.claim_jobs, worker_id, WORKER_BATCH_SIZE)
+        if not batch:
+            if once:
+                return
+            await asyncio.sleep(JOB_POLL_SECONDS)
+            continue
+        try:
+            await _run_jobs(batch, worker_id)
+        except Exception as e:
+            # batch-level failure (e.g. NER): every job in it is retried
+            for job in batch:
+                await _fail(job, worker_id, f"{e}\n{traceback.format_exc()}")
+
+
+def run_worker(once: bool = False) -> None:
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        asyncio.run(_worker_loop(worker_id, once=once))
+    except KeyboardInterrupt:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="FRA Atlas ingestion worker")
+    parser.add_argument("--processes", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        run_worker(args.once)
+        return
+
+    procs = [multiprocessing.Process(target=run_worker, args=(args.once,)) for _ in range(args.processes)]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -376,6 +376,8 @@ export default function ClaimsTable({
                             date: c.date || "",
                             lat: c.lat != null ? Number(c.lat) : null,
                             lon: c.lon != null ? Number(c.lon) : null,
+                            // backend answers 409 if someone changed the claim since it was loaded
+                            version: c.version,
                           };
 
                           // send PUT to the backend (using authFetch)
@@ -211,7 +211,8 @@ export default function NewClaimForm({
         res = await authFetch(url, {
           method: "PUT",
           headers: { "Content-Type": "application/json" },
-          body: JSON.stringify(payload),
+          // version: backend answers 409 if someone changed the claim since it was loaded
+          body: JSON.stringify({ ...payload, version: editClaim.version }),
         });
 
         if (!res.ok) {